@@ -0,0 +1,60 @@
+"""
+Benchmark building a polymer from repeat units by rebuilding a `Formula` from
+merged dictionaries on every addition against incremental `+` and `+=`, which
+also returns a new formula.
+
+Run from the `py` directory with `python -m benchmarks.arithmetic`.
+"""
+import time
+
+from chemic.main import Formula, load_tables
+
+UNIT = "C2H3Cl"
+REPEATS = 5_000
+
+
+def rebuild():
+    unit = Formula(UNIT)
+    polymer = Formula(UNIT)
+    for _ in range(REPEATS - 1):
+        merged = dict(polymer.elements)
+        for symbol, count in unit.elements.items():
+            merged[symbol] = merged.get(symbol, 0) + count
+        polymer = Formula(merged)
+        polymer.mass, polymer.name
+    return polymer
+
+
+def pure():
+    unit = Formula(UNIT)
+    polymer = Formula(UNIT)
+    for _ in range(REPEATS - 1):
+        polymer = polymer + unit
+        polymer.mass
+    return polymer
+
+
+def in_place():
+    unit = Formula(UNIT)
+    polymer = Formula(UNIT)
+    for _ in range(REPEATS - 1):
+        polymer += unit
+        polymer.mass
+    return polymer
+
+
+def main():
+    load_tables()
+    results = []
+    for label, build in (("Rebuild", rebuild), ("a + b", pure), ("a += b", in_place)):
+        start = time.perf_counter()
+        polymer = build()
+        seconds = time.perf_counter() - start
+        results.append(polymer)
+        print(f"{label:<12}{seconds / REPEATS * 1e6:>10.2f} us/addition  mass={polymer.mass:.3f}")
+    assert all(polymer == results[0] for polymer in results)
+    print(Formula(UNIT) * REPEATS == results[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare load time and peak memory of the pandas and compact table backends,
+the latter with and without a table snapshot.
+
+Each backend is measured in a fresh interpreter so imports are included. Run
+from the `py` directory with `python -m benchmarks.backends`.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from chemic.snapshot import write_snapshot
+
+SCRIPT = """
+import resource, time
+start = time.perf_counter()
+from chemic import data
+data.set_backend({backend!r})
+from chemic.main import Formula
+Formula("C6H12O6").name
+seconds = time.perf_counter() - start
+print(seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    snapshot = write_snapshot(os.path.join(directory, "tables.snapshot"))
+    missing = os.path.join(directory, "missing.snapshot")
+    print(f"{'backend':<20}{'load ms':>10}{'peak RSS MB':>14}")
+    for label, backend, path in [
+        ("pandas", "pandas", missing),
+        ("compact", "compact", missing),
+        ("compact + snapshot", "compact", snapshot),
+    ]:
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(backend=backend)],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "CHEMIC_SNAPSHOT": path},
+        ).stdout
+        seconds, rss = output.split()
+        print(f"{label:<20}{float(seconds) * 1000:>10.1f}{int(rss) / 1024:>14.1f}")
+    os.remove(snapshot)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark `annotate_many` across worker counts.
+
+Uses random formulas so the per-process formula cache does not hide the work.
+Run from the `py` directory with `python -m benchmarks.batch [rows]`.
+"""
+import os
+import random
+import sys
+import time
+
+from chemic.batch import annotate_many
+
+ROWS = 100_000
+SEED = 0
+SYMBOLS = ["C", "H", "N", "O", "P", "S", "Cl", "Na", "K", "Fe"]
+
+
+def random_formulas(rows):
+    rng = random.Random(SEED)
+    for _ in range(rows):
+        symbols = rng.sample(SYMBOLS, rng.randint(1, 5))
+        yield "".join(f"{symbol}{rng.randint(1, 40)}" for symbol in symbols)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, cpus} | {n for n in (2, 4, 8) if n <= cpus})
+    baseline = None
+    print(f"{'workers':>8}{'seconds':>10}{'rows/s':>12}{'speedup':>9}")
+    for workers in counts:
+        start = time.perf_counter()
+        for _ in annotate_many(random_formulas(rows), chunksize=2000, workers=workers):
+            pass
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print(f"{workers:>8}{seconds:>10.2f}{rows / seconds:>12,.0f}{baseline / seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark deduplicating formulas by their canonical key.
+
+Run from the `py` directory with `python -m benchmarks.canonical [FILE]`, e.g.
+`../utils/fetch/species.txt` (the default). Compares the number of distinct
+formula strings with the number of distinct compositions, and the time to
+deduplicate by the packed key against sorted (symbol, count) tuples.
+"""
+import os
+import sys
+import time
+
+from chemic.main import formula_key, hill_formula, load_tables
+from chemic.search import read_formula_file
+from chemic.utils import parse_formula
+
+SPECIES = os.path.join(os.path.dirname(__file__), "..", "..", "utils", "fetch", "species.txt")
+
+
+def main():
+    load_tables()
+    formulas = [formula for formula, _ in read_formula_file(sys.argv[1] if len(sys.argv) > 1 else SPECIES)]
+    parsed = []
+    for formula in formulas:
+        elements = parse_formula(formula)
+        if elements:
+            try:
+                formula_key(elements)
+            except ValueError:
+                continue
+            parsed.append(elements)
+    print(f"{len(formulas):,} formulas, {len(parsed):,} parsed, {len(set(formulas)):,} distinct strings")
+
+    start = time.perf_counter()
+    keys = {formula_key(elements) for elements in parsed}
+    packed = time.perf_counter() - start
+    start = time.perf_counter()
+    tuples = {tuple(sorted(elements.items())) for elements in parsed}
+    sorted_pairs = time.perf_counter() - start
+    start = time.perf_counter()
+    hill = {hill_formula(elements) for elements in parsed}
+    strings = time.perf_counter() - start
+    assert len(keys) == len(tuples) == len(hill)
+    print(f"{len(keys):,} distinct compositions")
+    print(f"packed keys     {packed * 1e3:7.1f} ms  {sum(map(sys.getsizeof, keys)) / len(keys):5.0f} B/key")
+    print(f"sorted tuples   {sorted_pairs * 1e3:7.1f} ms  {sum(map(sys.getsizeof, tuples)) / len(tuples):5.0f} B/key (+ pairs)")
+    print(f"Hill strings    {strings * 1e3:7.1f} ms  {sum(map(sys.getsizeof, hill)) / len(hill):5.0f} B/key")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark CAS number validation: the original validator, the allocation-light
+`is_cas_number` and the vectorized `validate_cas_numbers`.
+
+Run from the `py` directory with `python -m benchmarks.cas`.
+"""
+import time
+
+from commoner import replace_all, reverse
+
+from chemic.data import load_table
+from chemic.utils import is_cas_number
+from chemic.vectorized import validate_cas_numbers
+
+REPEAT = 100
+
+
+def legacy_validate_cas_number(cas_num):
+    """The original `validate_cas_number(cas_num, verbose=False)`."""
+    if not isinstance(cas_num, str):
+        return False
+    if len(replace_all(cas_num, "-", "")) > 10:
+        return False
+    cas_num = {
+        "full": cas_num,
+        "clean": replace_all(cas_num, "-", ""),
+        "parts": cas_num.split("-"),
+    }
+    if len(cas_num["parts"]) != 3 or not cas_num["clean"].isdigit():
+        return False
+    check_sum = 0
+    check_sum_num = reverse(cas_num["parts"][0] + cas_num["parts"][1])
+    for i in range(0, len(check_sum_num)):
+        check_sum += int(check_sum_num[i]) * (i + 1)
+    return check_sum % 10 == int(cas_num["parts"][2])
+
+
+def timed(label, function, rows):
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    print(f"{label:<28}{rows / seconds:>14,.0f} CAS numbers/s")
+
+
+def main():
+    catalog = list(load_table("common_formulas", backend="compact")["CAS"]) * REPEAT
+    rows = len(catalog)
+    timed("Original validator", lambda: [legacy_validate_cas_number(c) for c in catalog], rows)
+    timed("is_cas_number", lambda: [is_cas_number(c) for c in catalog], rows)
+    timed("validate_cas_numbers", lambda: validate_cas_numbers(catalog), rows)
+
+
+if __name__ == "__main__":
+    main()
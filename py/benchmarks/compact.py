@@ -0,0 +1,42 @@
+"""
+Compare the memory used by `Formula` and `CompactFormula` and time set-based
+deduplication.
+
+Run from the `py` directory with `python -m benchmarks.compact`.
+"""
+import time
+import tracemalloc
+
+from chemic.compact import CompactFormula
+from chemic.main import Formula
+
+FORMULAS = ["H2O", "C6H12O6", "Ca(OH)2", "NaCl", "CuSO4·5H2O", "K4[Fe(CN)6]"]
+COPIES = 20_000
+
+
+def measure(factory):
+    tracemalloc.start()
+    start = time.perf_counter()
+    formulas = [factory(formula) for formula in FORMULAS for _ in range(COPIES)]
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    unique = len(set(formulas))
+    dedup_seconds = time.perf_counter() - start
+    return size / len(formulas), seconds, dedup_seconds, unique
+
+
+def main():
+    total = COPIES * len(FORMULAS)
+    print(f"{total:,} formulas, {len(FORMULAS)} unique")
+    for label, factory in (("Formula", Formula), ("CompactFormula", CompactFormula)):
+        per_formula, seconds, dedup_seconds, unique = measure(factory)
+        print(
+            f"{label:<16}{per_formula:>8.0f} B/formula"
+            f"{seconds:>10.3f} s build{dedup_seconds:>10.3f} s dedup ({unique} unique)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark composition queries by parsing every formula against the
+`CompositionIndex` bitsets.
+
+Run from the `py` directory with `python -m benchmarks.composition [FILE]`,
+e.g. `../utils/fetch/species.txt`. Defaults to the bundled formula table.
+"""
+import sys
+import time
+
+from chemic.main import ELEMENTS_BY_SYMBOL
+from chemic.search import CompositionIndex, _table_rows, read_formula_file
+from chemic.utils import parse_formula
+
+QUERIES = {
+    "Cl and at least 2 O": {"contains": ["Cl"], "counts": {"O": (2, None)}},
+    "Only C, H and O with 6 C": {"only": ["C", "H", "O"], "counts": {"C": 6}},
+    "N but no O": {"contains": ["N"], "excludes": ["O"]},
+}
+REPEATS = 100
+
+
+def scan(rows, contains=(), excludes=(), counts=None, only=None):
+    matches = 0
+    for formula, _ in rows:
+        elements = parse_formula(formula)
+        if not elements or any(symbol not in ELEMENTS_BY_SYMBOL for symbol in elements):
+            continue
+        if any(symbol not in elements for symbol in contains):
+            continue
+        if any(symbol in elements for symbol in excludes):
+            continue
+        if only is not None and any(symbol not in only for symbol in elements):
+            continue
+        in_range = True
+        for symbol, (low, high) in (
+            (symbol, bounds if isinstance(bounds, tuple) else (bounds, bounds))
+            for symbol, bounds in (counts or {}).items()
+        ):
+            count = elements.get(symbol, 0)
+            if (low is not None and count < low) or (high is not None and count > high):
+                in_range = False
+        matches += in_range
+    return matches
+
+
+def main():
+    rows = read_formula_file(sys.argv[1]) if len(sys.argv) > 1 else _table_rows()
+    start = time.perf_counter()
+    index = CompositionIndex((formula for formula, _ in rows), (name for _, name in rows))
+    print(f"Indexed {len(index):,} rows in {time.perf_counter() - start:.3f} s")
+    for label, query in QUERIES.items():
+        start = time.perf_counter()
+        scanned = scan(rows, **query)
+        scan_seconds = time.perf_counter() - start
+        index.count(**query)
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            counted = index.count(**query)
+        count_seconds = (time.perf_counter() - start) / REPEATS
+        assert counted == scanned, (label, counted, scanned)
+        print(
+            f"{label:<28}{counted:>7} matches  scan {scan_seconds * 1e3:>9.2f} ms"
+            f"  index {count_seconds * 1e6:>9.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
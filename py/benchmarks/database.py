@@ -0,0 +1,57 @@
+"""
+Benchmark lookups in the compound database against loading the species file
+into memory and scanning it.
+
+Run from the `py` directory with `python -m benchmarks.database`. The database
+is built from the formula table and `../utils/fetch/species.txt` in a
+temporary directory.
+"""
+import os
+import random
+import tempfile
+import time
+import timeit
+
+from chemic.database import CompoundDatabase, build_database, read_records, table_records
+
+SPECIES = os.path.join(os.path.dirname(__file__), "..", "..", "utils", "fetch", "species.txt")
+NUMBER = 200
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temporary:
+        path = os.path.join(temporary, "compounds.sqlite")
+        start = time.perf_counter()
+        build_database([("common_formulas", table_records()), ("species", read_records(SPECIES))], path)
+        print(f"Built the database in {time.perf_counter() - start:.2f} s ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+        start = time.perf_counter()
+        database = CompoundDatabase(path)
+        print(f"{len(database):,} compounds, opened in {(time.perf_counter() - start) * 1e3:.2f} ms")
+        start = time.perf_counter()
+        rows = read_records(SPECIES)
+        print(f"Loaded {len(rows):,} species rows into memory in {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+        sample = random.Random(0).sample(rows, NUMBER)
+        cas_numbers = [record["cas"] for record in sample if record["cas"] != "N/A"]
+        formulas = [record["formula"] for record in sample]
+        names = [record["names"][0] for record in sample]
+        lookups = {
+            "CAS number": (cas_numbers, database.by_cas, lambda cas: [row for row in rows if row["cas"] == cas]),
+            "formula": (formulas, database.by_formula, lambda formula: [row for row in rows if row["formula"] == formula]),
+            "name": (names, database.by_name, lambda name: [row for row in rows if row["names"][0].lower() == name.lower()]),
+            "mass": ([18.015, 78.114, 157.554], database.by_mass, None),
+        }
+        for label, (keys, lookup, scan) in lookups.items():
+            indexed = timeit.timeit(lambda: [lookup(key) for key in keys], number=3) / (3 * len(keys))
+            line = f"{label:<12}indexed {indexed * 1e6:8.1f} µs"
+            if scan is not None:
+                keys = keys[:20]
+                scanned = timeit.timeit(lambda: [scan(key) for key in keys], number=1) / len(keys)
+                line += f"  scan {scanned * 1e6:10.1f} µs  ({scanned / indexed:,.0f}x)"
+            print(line)
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark `Element` construction against the original per-call DataFrame scan.
+
+Run from the `py` directory with `python -m benchmarks.elements`.
+"""
+import timeit
+
+from chemic.main import PERIODIC_TABLE, Element, Formula, get_molar_mass
+
+ATTRIBUTES = ["H", "Fe", "oxygen", 79, "Uranium", "cl"]
+NUMBER = 2_000
+
+
+def dataframe_element(attribute):
+    """The lookup `Element.__init__` used to perform on every construction."""
+    if type(attribute) == str:
+        if attribute.isdigit():
+            attribute = int(attribute)
+        else:
+            attribute = attribute.capitalize()
+    for attr_type in ["Symbol", "Element", "AtomicNumber", "AtomicMass"]:
+        if attribute in PERIODIC_TABLE[attr_type].values:
+            return PERIODIC_TABLE[PERIODIC_TABLE[attr_type] == attribute].to_dict(
+                "records"
+            )[0]
+    return None
+
+
+def report(label, seconds, calls):
+    print(f"{label:<32}{seconds / calls * 1e6:>12.3f} us/call")
+
+
+def main():
+    calls = NUMBER * len(ATTRIBUTES)
+    before = timeit.timeit(
+        lambda: [dataframe_element(a) for a in ATTRIBUTES], number=NUMBER // 10
+    )
+    after = timeit.timeit(lambda: [Element(a) for a in ATTRIBUTES], number=NUMBER)
+    report("DataFrame scan", before, calls // 10)
+    report("Element registry", after, calls)
+    print(f"{'Speedup':<32}{(before / (calls // 10)) / (after / calls):>12.1f}x")
+
+    glucose = Formula("C6H12O6")
+    seconds = timeit.timeit(lambda: get_molar_mass(glucose), number=NUMBER)
+    report("get_molar_mass(C6H12O6)", seconds, NUMBER)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Benchmark `Formula` construction with a cold and a warm formula cache.
+
+Run from the `py` directory with `python -m benchmarks.formula_cache`.
+"""
+import timeit
+
+from chemic.main import FORMULA_CACHE, Formula
+
+FORMULAS = ["H2O", "C6H12O6", "Ca(OH)2", "NaCl", "CuSO4·5H2O", "K4[Fe(CN)6]"]
+NUMBER = 2_000
+
+
+def construct():
+    for formula in FORMULAS:
+        Formula(formula)
+
+
+def main():
+    calls = NUMBER * len(FORMULAS)
+
+    def cold():
+        FORMULA_CACHE.clear()
+        construct()
+
+    cold_seconds = timeit.timeit(cold, number=NUMBER)
+    FORMULA_CACHE.clear()
+    warm_seconds = timeit.timeit(construct, number=NUMBER)
+    print(f"{'Cold cache':<16}{cold_seconds / calls * 1e6:>10.2f} us/formula")
+    print(f"{'Warm cache':<16}{warm_seconds / calls * 1e6:>10.2f} us/formula")
+    print(FORMULA_CACHE.stats())
+
+
+if __name__ == "__main__":
+    main()
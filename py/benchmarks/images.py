@@ -0,0 +1,64 @@
+"""
+Benchmark reading structure images from a packed `ImageStore` against reading
+one file per image.
+
+Run from the `py` directory with `python -m benchmarks.images [DIRECTORY]`.
+Defaults to `../utils/lib/images`.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from chemic.images import ImageStore, image_directory_entries, write_image_store
+
+DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "..", "utils", "lib", "images")
+READS = 5000
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else DIRECTORY
+    entries = image_directory_entries(directory)
+    with tempfile.TemporaryDirectory() as temporary:
+        path = os.path.join(temporary, "images.pack")
+        start = time.perf_counter()
+        write_image_store(entries, path)
+        print(f"Packed {len(entries):,} images in {time.perf_counter() - start:.2f} s")
+        files = sum(os.path.getsize(source) for source, _, _ in entries)
+        print(f"{files / 1e6:.1f} MB in files, {os.path.getsize(path) / 1e6:.1f} MB packed")
+
+        start = time.perf_counter()
+        store = ImageStore(path)
+        print(f"Opened the store in {(time.perf_counter() - start) * 1e3:.2f} ms")
+        print(f"{len(store):,} distinct images ({len(entries) - len(store)} duplicates)")
+
+        sample = random.Random(0).choices(entries, k=READS)
+        start = time.perf_counter()
+        for source, _, _ in sample:
+            with open(source, "rb") as file:
+                file.read()
+        per_file = (time.perf_counter() - start) / READS
+        keys = [formula or cas for _, formula, cas in sample]
+        start = time.perf_counter()
+        for key in keys:
+            bytes(store.get(key))
+        copied = (time.perf_counter() - start) / READS
+        start = time.perf_counter()
+        for key in keys:
+            store.get(key).release()
+        viewed = (time.perf_counter() - start) / READS
+        print(f"files:             {per_file * 1e6:7.2f} µs per image")
+        print(f"store, copied:     {copied * 1e6:7.2f} µs per image ({per_file / copied:.1f}x)")
+        print(f"store, zero-copy:  {viewed * 1e6:7.2f} µs per image ({per_file / viewed:.1f}x)")
+        for source, formula, cas in random.Random(1).sample(entries, 200):
+            with open(source, "rb") as file:
+                data = file.read()
+            views = store.formula_images(formula) if formula else [store.get(cas)]
+            assert data in [bytes(view) for view in views], source
+            del views
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Measure `import chemic` with `python -X importtime` and guard against regressions.
+
+Exits with a non-zero status if importing any of the lightweight entry points
+pulls in pandas, numpy or nicegui, or if `import chemic.main` takes longer than
+the budget. Run from the `py` directory with `python -m benchmarks.import_time
+[budget_ms]`.
+"""
+import subprocess
+import sys
+
+ENTRY_POINTS = [
+    "import chemic",
+    "import chemic.main",
+    "from chemic.utils import parse_formula",
+]
+HEAVY_MODULES = ["pandas", "numpy", "nicegui"]
+BUDGET_MS = 100
+
+
+def import_times(statement):
+    """Run `statement` in a fresh interpreter and parse its import times."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    failed = False
+    for statement in ENTRY_POINTS:
+        times = import_times(statement)
+        chemic = max(t for module, t in times.items() if module.startswith("chemic"))
+        heavy = [module for module in HEAVY_MODULES if module in times]
+        print(f"{statement:<42}{chemic / 1000:>8.1f} ms  heavy imports: {heavy or 'none'}")
+        if heavy:
+            failed = True
+    total = max(import_times("import chemic.main").values()) / 1000
+    if total > budget:
+        print(f"import chemic.main took {total:.1f} ms, over the {budget:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
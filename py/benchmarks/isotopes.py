@@ -0,0 +1,34 @@
+"""
+Benchmark isotopic distributions of small and large formulas, and of a batch
+of formulas from the formula table.
+
+Run from the `py` directory with `python -m benchmarks.isotopes`.
+"""
+import time
+
+from chemic.isotopes import DISTRIBUTION_CACHE, isotopic_distribution, isotopic_distributions
+from chemic.main import FORMULA_TABLE, load_tables
+
+FORMULAS = ["H2O", "C6H12O6", "C254H377N65O75S6", "C1000H2000", "C10000H20000N2000O3000S200"]
+
+
+def main():
+    load_tables()
+    isotopic_distribution("H2O")
+    for formula in FORMULAS:
+        DISTRIBUTION_CACHE.clear()
+        start = time.perf_counter()
+        masses, probabilities = isotopic_distribution(formula)
+        seconds = time.perf_counter() - start
+        print(f"{formula:<30}{seconds * 1e3:>8.2f} ms{len(masses):>6} peaks")
+    formulas = list(FORMULA_TABLE["Formula"])
+    DISTRIBUTION_CACHE.clear()
+    start = time.perf_counter()
+    distributions = isotopic_distributions(formulas)
+    seconds = time.perf_counter() - start
+    valid = sum(distribution is not None for distribution in distributions)
+    print(f"{len(formulas):,} table formulas ({valid:,} valid) in {seconds:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark `Formula` construction followed by different attribute accesses,
+with a cold formula cache so every property is computed from scratch.
+
+Run from the `py` directory with `python -m benchmarks.lazy_formula`.
+"""
+import timeit
+
+from chemic.main import FORMULA_CACHE, Formula, load_tables
+
+FORMULAS = ["H2O", "C6H12O6", "Ca(OH)2", "NaCl", "CuSO4·5H2O", "K4[Fe(CN)6]"]
+NUMBER = 2_000
+
+PATTERNS = {
+    "Composition only": lambda formula: formula.elements,
+    "Equality": lambda formula: formula == formula,
+    "Mass": lambda formula: formula.mass,
+    "Count": lambda formula: formula.count,
+    "Name": lambda formula: formula.name,
+    "Everything": lambda formula: (formula.mass, formula.name, formula.count),
+}
+
+
+def main():
+    load_tables()
+    calls = NUMBER * len(FORMULAS)
+    for label, access in PATTERNS.items():
+
+        def run():
+            FORMULA_CACHE.clear()
+            for formula in FORMULAS:
+                access(Formula(formula))
+
+        seconds = timeit.timeit(run, number=NUMBER)
+        print(f"{label:<20}{seconds / calls * 1e6:>10.2f} us/formula")
+
+
+if __name__ == "__main__":
+    main()
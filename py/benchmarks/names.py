@@ -0,0 +1,33 @@
+"""
+Benchmark name completion and typo-tolerant search in a `NameIndex`.
+
+Run from the `py` directory with `python -m benchmarks.names [FILE]`, e.g.
+`../utils/fetch/species.txt`. Defaults to the synonyms in the formula table.
+"""
+import sys
+import time
+import timeit
+
+from chemic.names import NameIndex
+
+QUERIES = ["benzene", "bezene", "sodium chl", "sodium hydroxyde", "chloroform", "glucsoe", "a"]
+NUMBER = 50
+
+
+def main():
+    start = time.perf_counter()
+    index = NameIndex.from_file(sys.argv[1]) if len(sys.argv) > 1 else NameIndex.from_table()
+    index.complete("a")
+    print(f"Indexed {len(index):,} names in {time.perf_counter() - start:.3f} s")
+    for query in QUERIES:
+        complete = min(timeit.repeat(lambda: index.complete(query, limit=8), number=NUMBER, repeat=3))
+        search = min(timeit.repeat(lambda: index.search(query, limit=8), number=NUMBER, repeat=3))
+        best = index.search(query, limit=1)
+        print(
+            f"{query!r:<20}complete {complete / NUMBER * 1e3:>6.3f} ms"
+            f"  search {search / NUMBER * 1e3:>6.3f} ms  {best[0][0] if best else '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark `parse_formula` against the original recursive parser.
+
+The parser itself is tested in `tests/test_utils.py`. Run from the `py`
+directory with `python -m benchmarks.parse_formula`.
+"""
+import timeit
+
+from chemic.utils import parse_formula
+
+
+def legacy_parse_formula(formula):
+    """The recursive parser `parse_formula` replaced."""
+    element_dict = {}
+    looking_for_num = False
+    skip = False
+    element = ""
+    for i in range(len(formula)):
+        if skip:
+            skip = False
+            continue
+        elif formula[i] == "(":
+            if looking_for_num:
+                element_dict[element] = 1
+                looking_for_num = False
+            for j in range(i, len(formula)):
+                if formula[j] == ")":
+                    index = j
+                    break
+            result = legacy_parse_formula(formula[i + 1 : index])
+            multiplier = None
+            for k in range(index + 1, len(formula)):
+                if formula[k].isdigit():
+                    multiplier = int(formula[index + 1 : k + 1])
+                else:
+                    break
+            if multiplier == None:
+                multiplier = 1
+            for sub_element, sub_num_atoms in result.items():
+                if sub_element in element_dict:
+                    element_dict[sub_element] += sub_num_atoms * (multiplier)
+                else:
+                    element_dict[sub_element] = sub_num_atoms * (multiplier)
+            formula = formula.replace(formula[: index + (1 + len(str(multiplier)))], "")
+            sub_element_dict = legacy_parse_formula(formula)
+            for sub_element, sub_num_atoms in sub_element_dict.items():
+                if sub_element in element_dict:
+                    element_dict[sub_element] += sub_num_atoms
+                else:
+                    element_dict[sub_element] = sub_num_atoms
+            return element_dict
+        if formula[i].isupper():
+            if looking_for_num:
+                element_dict[element] = 1
+                looking_for_num = False
+            element = formula[i]
+            num_atoms = 1
+            looking_for_num = True
+        elif formula[i].islower():
+            if i == 0 or not formula[i - 1].isupper():
+                if formula[i - 1].islower():
+                    element_dict[element] = 1
+                element = formula[i].upper()
+                num_atoms = 1
+            else:
+                element += formula[i]
+            looking_for_num = True
+        elif formula[i].isdigit():
+            if i < len(formula) - 1 and formula[i + 1].isdigit():
+                num_atoms = int(formula[i : i + 2])
+                skip = True
+            else:
+                num_atoms = int(formula[i])
+            if element in element_dict:
+                element_dict[element] += num_atoms
+            else:
+                element_dict[element] = num_atoms
+            looking_for_num = False
+        else:
+            return
+    if looking_for_num:
+        element_dict[element] = num_atoms
+    new_dict = {}
+    for element, num_atoms in element_dict.items():
+        if element != "":
+            new_dict[element] = num_atoms
+    return new_dict
+
+
+def check_scaling():
+    """Time flat formulas (both parsers) and nested ones (new parser only)."""
+    print(f"{'repeats':>8}{'length':>8}{'legacy us':>12}{'flat us':>12}{'nested us':>12}")
+    for repeats in [1, 4, 16, 64, 256]:
+        flat = "C2H4O" * repeats
+        nested = "(CH2CH(OH)2)3" * repeats
+        number = max(1, 2000 // repeats)
+        timings = [
+            timeit.timeit(lambda: function(formula), number=number) / number * 1e6
+            for function, formula in [
+                (legacy_parse_formula, flat),
+                (parse_formula, flat),
+                (parse_formula, nested),
+            ]
+        ]
+        print(f"{repeats:>8}{len(flat):>8}" + "".join(f"{t:>12.1f}" for t in timings))
+
+
+if __name__ == "__main__":
+    check_scaling()
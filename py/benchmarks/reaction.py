@@ -0,0 +1,66 @@
+"""
+Benchmark balancing a suite of real reactions, checking every result.
+
+Run from the `py` directory with `python -m benchmarks.reaction`.
+"""
+import time
+
+from chemic.main import load_tables
+from chemic.reaction import Reaction, balance_many
+
+EQUATIONS = {
+    "Fe + O2 -> Fe2O3": (4, 3, 2),
+    "H2 + O2 -> H2O": (2, 1, 2),
+    "CH4 + O2 -> CO2 + H2O": (1, 2, 1, 2),
+    "C3H8 + O2 -> CO2 + H2O": (1, 5, 3, 4),
+    "C6H12O6 + O2 -> CO2 + H2O": (1, 6, 6, 6),
+    "C8H18 + O2 -> CO2 + H2O": (2, 25, 16, 18),
+    "N2 + H2 -> NH3": (1, 3, 2),
+    "NH3 + O2 -> NO + H2O": (4, 5, 4, 6),
+    "Al + O2 -> Al2O3": (4, 3, 2),
+    "Na + H2O -> NaOH + H2": (2, 2, 2, 1),
+    "CaCO3 -> CaO + CO2": (1, 1, 1),
+    "KClO3 -> KCl + O2": (2, 2, 3),
+    "Fe2O3 + CO -> Fe + CO2": (1, 3, 2, 3),
+    "Al + HCl -> AlCl3 + H2": (2, 6, 2, 3),
+    "Ca3(PO4)2 + H2SO4 -> CaSO4 + H3PO4": (1, 3, 3, 2),
+    "Cu + HNO3 -> Cu(NO3)2 + NO + H2O": (3, 8, 3, 2, 4),
+    "KMnO4 + HCl -> KCl + MnCl2 + H2O + Cl2": (2, 16, 2, 2, 8, 5),
+    "K2Cr2O7 + HCl -> KCl + CrCl3 + H2O + Cl2": (1, 14, 2, 2, 7, 3),
+    "FeS2 + O2 -> Fe2O3 + SO2": (4, 11, 2, 8),
+    "Pb(NO3)2 -> PbO + NO2 + O2": (2, 2, 4, 1),
+    "NaHCO3 -> Na2CO3 + H2O + CO2": (2, 1, 1, 1),
+    "C2H5OH + O2 -> CO2 + H2O": (1, 3, 2, 3),
+    "Mg + HNO3 -> Mg(NO3)2 + H2": (1, 2, 1, 1),
+    "P4 + O2 -> P4O10": (1, 5, 1),
+    "Zn + CuSO4 -> ZnSO4 + Cu": (1, 1, 1, 1),
+    "AgNO3 + NaCl -> AgCl + NaNO3": (1, 1, 1, 1),
+    "CuSO4·5H2O -> CuSO4 + H2O": (1, 1, 5),
+    "K4[Fe(CN)6] + KMnO4 + H2SO4 -> KHSO4 + Fe2(SO4)3 + MnSO4 + HNO3 + CO2 + H2O": (
+        10, 122, 299, 162, 5, 122, 60, 60, 188,
+    ),
+    "MnO4- + Fe 2+ + H+ -> Mn 2+ + Fe 3+ + H2O": (1, 5, 8, 1, 5, 4),
+    "Cr2O7 2- + H+ + e- -> Cr 3+ + H2O": (1, 14, 6, 2, 7),
+    "Cu + Ag+ -> Cu 2+ + Ag": (1, 2, 1, 2),
+    "H2O2 -> H2O + O2": (2, 2, 1),
+}
+REPEATS = 200
+
+
+def main():
+    load_tables()
+    for equation, expected in EQUATIONS.items():
+        reaction = Reaction(equation).balance()
+        assert reaction.coefficients == expected, (equation, reaction.coefficients)
+        assert reaction.is_balanced(), equation
+    equations = list(EQUATIONS) * REPEATS
+    start = time.perf_counter()
+    balanced = balance_many(equations)
+    seconds = time.perf_counter() - start
+    assert None not in balanced
+    print(f"{len(EQUATIONS)} reactions checked")
+    print(f"{len(equations) / seconds:,.0f} reactions/s ({seconds / len(equations) * 1e6:.1f} us each)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark finding candidate formulas for measured masses by constructing a
+`Formula` for every row against binary search in a `MassIndex`, and time
+enumerating CHNOPS compositions.
+
+Run from the `py` directory with `python -m benchmarks.search`.
+"""
+import time
+
+import numpy as np
+
+from chemic.main import FORMULA_TABLE, Formula, load_tables
+from chemic.search import MassIndex, enumerate_formulas
+
+QUERIES = 200
+TOLERANCE = 0.01
+
+
+def scan(mass):
+    matches = []
+    for formula in FORMULA_TABLE["Formula"]:
+        try:
+            molecule = Formula(formula)
+        except ValueError:
+            continue
+        if abs(molecule.mass - mass) <= TOLERANCE:
+            matches.append(formula)
+    return matches
+
+
+def main():
+    load_tables()
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    index = MassIndex.from_table()
+    print(f"{'Build index':<24}{(time.perf_counter() - start) * 1e3:>10.2f} ms ({len(index):,} formulas)")
+    masses = rng.choice(index.masses, QUERIES)
+
+    start = time.perf_counter()
+    scanned = [scan(mass) for mass in masses[:10]]
+    scan_seconds = (time.perf_counter() - start) / 10
+    start = time.perf_counter()
+    searched = [index.search(mass, TOLERANCE) for mass in masses]
+    search_seconds = (time.perf_counter() - start) / QUERIES
+    start = time.perf_counter()
+    index.search_many(masses, TOLERANCE)
+    many_seconds = (time.perf_counter() - start) / QUERIES
+    for matches, found in zip(scanned, searched):
+        assert sorted(matches) == sorted(formula for formula, _, _ in found)
+    print(f"{'Scan with Formula':<24}{scan_seconds * 1e3:>10.3f} ms/query")
+    print(f"{'MassIndex.search':<24}{search_seconds * 1e3:>10.3f} ms/query")
+    print(f"{'MassIndex.search_many':<24}{many_seconds * 1e3:>10.3f} ms/query")
+
+    for target, monoisotopic in ((180.156, False), (180.0634, True), (500.0, True)):
+        start = time.perf_counter()
+        results = enumerate_formulas(target, tolerance=0.002, monoisotopic=monoisotopic)
+        seconds = time.perf_counter() - start
+        print(f"Enumerate CHNOPS at {target:<10}{seconds * 1e3:>10.2f} ms{len(results):>6} results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark computing the yields of many experiments one row at a time against
+the vectorized variant.
+
+Run from the `py` directory with `python -m benchmarks.stoichiometry`.
+"""
+import time
+
+import numpy as np
+
+from chemic import stoichiometry, vectorized
+from chemic.main import load_tables
+
+REACTION = "C3H8 + O2 -> CO2 + H2O"
+ROWS = 20_000
+
+
+def main():
+    load_tables()
+    rng = np.random.default_rng(0)
+    masses = {"C3H8": rng.uniform(1, 100, ROWS), "O2": rng.uniform(1, 400, ROWS)}
+
+    start = time.perf_counter()
+    looped = [
+        stoichiometry.get_yields(REACTION, masses={"C3H8": propane, "O2": oxygen})
+        for propane, oxygen in zip(masses["C3H8"], masses["O2"])
+    ]
+    looped_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    yields = vectorized.get_yields(REACTION, masses=masses)
+    vectorized_seconds = time.perf_counter() - start
+
+    assert list(yields["limiting"]) == [row["limiting"] for row in looped]
+    assert np.allclose(
+        yields["products"]["CO2"]["mass"], [row["products"]["CO2"]["mass"] for row in looped]
+    )
+    print(f"{ROWS:,} experiments")
+    print(f"{'Row by row':<12}{looped_seconds:>10.3f} s")
+    print(f"{'Vectorized':<12}{vectorized_seconds:>10.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark the vectorized conversions against looping the scalar functions.
+
+Run from the `py` directory with `python -m benchmarks.vectorized`.
+"""
+import time
+
+import numpy as np
+
+from chemic import main as scalar
+from chemic import vectorized
+
+FORMULAS = scalar.FORMULA_TABLE["Formula"].tolist()
+ROWS = 200_000
+SEED = 0
+
+
+def timed(label, function, rows):
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    print(f"{label:<28}{seconds:>10.3f} s{rows / seconds:>14,.0f} rows/s")
+    return result
+
+
+def main():
+    rng = np.random.default_rng(SEED)
+    valid = [f for f in FORMULAS if vectorized.molar_masses(f)[0] > 0][:500]
+    formulas = rng.choice(np.array(valid, dtype=object), ROWS)
+    masses = rng.uniform(0.1, 100, ROWS)
+    scalar.FORMULA_CACHE.clear()
+
+    looped = timed(
+        "Scalar mass_to_moles loop",
+        lambda: [scalar.mass_to_moles(f, m) for f, m in zip(formulas, masses)],
+        ROWS,
+    )
+    batch = timed(
+        "Vectorized mass_to_moles",
+        lambda: vectorized.mass_to_moles(formulas, masses),
+        ROWS,
+    )
+    assert np.allclose(looped, batch)
+
+
+if __name__ == "__main__":
+    main()
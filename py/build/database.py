@@ -0,0 +1,27 @@
+import argparse
+import os
+import sys
+
+# Import the chemic package next to this folder, wherever this is run from.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from chemic.database import build_database, read_records, table_records
+
+UTILS = os.path.join(os.path.dirname(__file__), "..", "..", "utils")
+
+parser = argparse.ArgumentParser(
+    description="Merge the chemic formula table, WebBook species and scraped records into one SQLite database."
+)
+parser.add_argument("--output", help="where to write the database")
+parser.add_argument(
+    "--source",
+    action="append",
+    metavar="FILE",
+    help="a compound file to merge after the formula table, in order of precedence (CSV, JSON Lines or species TSV); defaults to utils/fetch/species.txt",
+)
+args = parser.parse_args()
+
+sources = [("common_formulas", table_records())]
+for path in args.source or [os.path.join(UTILS, "fetch", "species.txt")]:
+    sources.append((os.path.splitext(os.path.basename(path))[0], read_records(path)))
+print(f"Wrote {build_database(sources, args.output)}")
@@ -0,0 +1,39 @@
+import argparse
+import json
+import os
+import sys
+
+# Import the chemic package next to this folder, wherever this is run from.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from chemic.images import image_directory_entries, write_image_store
+
+parser = argparse.ArgumentParser(
+    description="Pack structure images into a content-addressed chemic image store."
+)
+parser.add_argument(
+    "directories",
+    nargs="*",
+    default=[os.path.join(os.path.dirname(__file__), "..", "..", "utils", "lib", "images")],
+    help="directories of <formula>.png or <CAS number>.png images",
+)
+parser.add_argument("--output", help="where to write the store")
+parser.add_argument(
+    "--records",
+    help="a JSON Lines export of utils/fetch, to index images named by CAS number under their formula too",
+)
+args = parser.parse_args()
+
+formulas = {}
+if args.records:
+    with open(args.records, encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            if record.get("cas_number") and record.get("formula"):
+                formulas[record["cas_number"]] = record["formula"]
+
+entries = []
+for directory in args.directories:
+    for path, formula, cas in image_directory_entries(directory):
+        entries.append((path, formula or formulas.get(cas), cas))
+print(f"Wrote {write_image_store(entries, args.output)}")
@@ -0,0 +1,32 @@
+import argparse
+import csv
+import os
+
+from molmass.elements import ELEMENTS
+
+parser = argparse.ArgumentParser(
+    description="Write the isotope table bundled with chemic from the molmass package's NIST data."
+)
+parser.add_argument(
+    "--output",
+    default=os.path.join(os.path.dirname(__file__), "..", "chemic", "isotopes.csv"),
+    help="where to write the table",
+)
+args = parser.parse_args()
+
+with open(args.output, "w", newline="") as file:
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow(["AtomicNumber", "Symbol", "MassNumber", "Mass", "Abundance"])
+    for element in ELEMENTS:
+        for isotope in element.isotopes.values():
+            if isotope.abundance > 0:
+                writer.writerow(
+                    [
+                        element.number,
+                        element.symbol,
+                        isotope.massnumber,
+                        repr(isotope.mass),
+                        repr(isotope.abundance),
+                    ]
+                )
+print(f"Wrote {os.path.normpath(args.output)}")
@@ -1,6 +1,7 @@
 from commoner import *
 from chemic import *
 from chemic.main import *
+from chemic.main import PERIODIC_TABLE
 
 import string
 
@@ -0,0 +1,26 @@
+import argparse
+import os
+import sys
+
+# Import the chemic package next to this folder, wherever this is run from.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from chemic.snapshot import Snapshot, write_snapshot
+
+parser = argparse.ArgumentParser(
+    description="Compile the chemic CSV tables into a binary snapshot."
+)
+parser.add_argument("--output", help="where to write the snapshot")
+parser.add_argument(
+    "--extra",
+    action="append",
+    default=[],
+    metavar="NAME=CSV",
+    help="also include another table, e.g. formulae=../utils/lib/data/formulae.csv",
+)
+args = parser.parse_args()
+
+extra = dict(entry.split("=", 1) for entry in args.extra)
+path = write_snapshot(args.output, extra)
+Snapshot(path, verify=True)
+print(f"Wrote {path}")
@@ -1,2 +1,10 @@
 __version__ = "1.2.0"
-from . import run
+
+import importlib
+
+
+def __getattr__(name):
+    # `run` pulls in the GUI stack, so only import it when it is asked for.
+    if name == "run":
+        return importlib.import_module(".run", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
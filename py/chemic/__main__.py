@@ -0,0 +1,147 @@
+from .batch import annotate_many
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+
+
+FORMATS = ("csv", "tsv", "jsonl")
+FORMAT_EXTENSIONS = {".tsv": "tsv", ".tab": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+INPUT_COLUMNS = ("formula", "Formula", "cas", "CAS")
+
+
+def _detect_format(path):
+    return FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower(), "csv")
+
+
+def _format_counts(counts):
+    """
+    Format element counts or percentages for a CSV cell, e.g. "H:2;O:1".
+    """
+    if counts is None:
+        return ""
+    return ";".join(f"{element}:{value}" for element, value in counts.items())
+
+
+def _read_rows(file, format, column):
+    """
+    Read rows from a CSV, TSV or JSONL file one at a time.
+
+    Args:
+        file (file): The open input file.
+        format (str): "csv", "tsv" or "jsonl".
+        column (str, optional): The column (or JSON key) holding the formula or CAS number.
+
+    Yields:
+        tuple: The row as a dictionary and its formula or CAS number.
+    """
+    if format == "jsonl":
+        for line in file:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                row = {column or "formula": row}
+            key = column or next((key for key in INPUT_COLUMNS if key in row), None)
+            yield row, row.get(key)
+        return
+    reader = csv.DictReader(file, delimiter="\t" if format == "tsv" else ",")
+    if reader.fieldnames is None:
+        return
+    if column is None:
+        column = next((key for key in INPUT_COLUMNS if key in reader.fieldnames), None)
+        column = column or reader.fieldnames[0]
+    elif column not in reader.fieldnames:
+        raise SystemExit(f"chemic: column {column!r} not found in the input")
+    for row in reader:
+        yield row, row[column]
+
+
+def annotate_command(args):
+    """
+    Annotate a CSV, TSV or JSONL file of formulas, writing the result to stdout.
+    """
+    input_format = args.format or _detect_format(args.input)
+    output_format = args.output_format or input_format
+    file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    with file:
+        rows, formulas = itertools.tee(_read_rows(file, input_format, args.column))
+        annotations = annotate_many(
+            (formula or "" for _, formula in formulas),
+            chunksize=args.chunksize,
+            workers=args.workers,
+        )
+        writer = None
+        for (row, _), annotation in zip(rows, annotations):
+            if output_format == "jsonl":
+                row.update(
+                    molar_mass=annotation["mass"],
+                    formula_name=annotation["name"],
+                    element_counts=annotation["elements"],
+                    percent_composition=annotation["percent_composition"],
+                )
+                sys.stdout.write(json.dumps(row) + "\n")
+                continue
+            row.update(
+                molar_mass="" if annotation["mass"] is None else annotation["mass"],
+                formula_name=annotation["name"] or "",
+                element_counts=_format_counts(annotation["elements"]),
+                percent_composition=_format_counts(annotation["percent_composition"]),
+            )
+            if writer is None:
+                # The header is written before the rest of the input is read,
+                # so it has the columns of the first row. Fields missing from a
+                # later row are left empty and fields it adds (extra JSON keys,
+                # or extra CSV cells, which DictReader puts under None) dropped.
+                fieldnames = [key for key in row if key is not None]
+                writer = csv.DictWriter(
+                    sys.stdout,
+                    fieldnames,
+                    delimiter="\t" if output_format == "tsv" else ",",
+                    lineterminator="\n",
+                    restval="",
+                    extrasaction="ignore",
+                )
+                writer.writeheader()
+            writer.writerow(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="chemic", description="Chemic, a Python library for chemistry.")
+    subparsers = parser.add_subparsers(dest="command")
+    annotate = subparsers.add_parser(
+        "annotate",
+        help="annotate a file of formulas or CAS numbers",
+        description="Read a CSV, TSV or JSONL file of formulas or CAS numbers row by row and write it to stdout with molar_mass, formula_name, element_counts and percent_composition columns added.",
+    )
+    annotate.add_argument("input", nargs="?", default="-", help="the input file, or - for stdin (the default)")
+    annotate.add_argument("--format", choices=FORMATS, help="the input format (default: from the file extension, else csv)")
+    annotate.add_argument("--output-format", choices=FORMATS, help="the output format (default: the input format); CSV and TSV output have the columns of the first row")
+    annotate.add_argument("--column", help="the column or JSON key with the formula or CAS number (default: formula, Formula, cas, CAS, else the first column)")
+    annotate.add_argument("--workers", type=int, default=1, help="the number of worker processes (default: 1)")
+    annotate.add_argument("--chunksize", type=int, default=1000, help="the number of rows sent to a worker at a time (default: 1000)")
+    subparsers.add_parser("cli", help="start the interactive CLI")
+    subparsers.add_parser("gui", help="start the GUI")
+    args = parser.parse_args(argv)
+
+    if args.command == "annotate":
+        try:
+            annotate_command(args)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # The reader went away (e.g. `| head`); stop quietly.
+            sys.stdout = None
+    else:
+        from . import run
+
+        if args.command == "gui":
+            run.gui()
+        else:
+            run.cli()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+from .data import get_backend, set_backend
+from .main import Formula, get_formula_by_cas, get_percent_composition, load_tables
+from .utils import is_cas_number
+
+import collections
+import concurrent.futures
+import itertools
+import os
+
+
+def annotate(formula):
+    """
+    Get the molar mass, name, element counts and percent composition of a formula.
+
+    Args:
+        formula (str): The formula, or a CAS number from the formula table.
+
+    Returns:
+        dict: The annotation, with None for every property if the formula is invalid.
+    """
+    annotation = {
+        "formula": formula,
+        "cas": None,
+        "mass": None,
+        "name": None,
+        "elements": None,
+        "percent_composition": None,
+    }
+    if is_cas_number(formula):
+        annotation["cas"] = formula
+        annotation["formula"] = formula = get_formula_by_cas(formula)
+        if formula is None:
+            return annotation
+    try:
+        molecule = Formula(formula)
+    except (ValueError, TypeError):
+        return annotation
+    if not molecule.elements:
+        return annotation
+    annotation["mass"] = molecule.mass
+    annotation["name"] = molecule.name
+    annotation["elements"] = molecule.elements
+    annotation["percent_composition"] = get_percent_composition(molecule)
+    return annotation
+
+
+def _annotate_chunk(chunk):
+    return [annotate(formula) for formula in chunk]
+
+
+def _initialize_worker(backend):
+    set_backend(backend)
+    load_tables()
+
+
+def _chunks(iterable, chunksize):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, chunksize)):
+        yield chunk
+
+
+def annotate_many(formulas, chunksize=1000, workers=None):
+    """
+    Annotate formulas in parallel, yielding the results in input order.
+
+    Formulas are read lazily in chunks and fanned out to a process pool whose
+    workers load the data tables once at start-up. At most two chunks per
+    worker are in flight, so arbitrarily long inputs run in constant memory.
+
+    Args:
+        formulas (iterable): The formulas, e.g. a list, generator or open file.
+        chunksize (int, optional): The number of formulas sent to a worker at a time. Defaults to 1000.
+        workers (int, optional): The number of worker processes; 1 annotates in this process. Defaults to the number of CPUs.
+
+    Yields:
+        dict: The annotation of each formula (see `annotate`).
+
+    Examples:
+        >>> for annotation in annotate_many(["H2O", "NaCl"], workers=1):
+        ...     print(annotation["name"], annotation["mass"])
+        Water 18.015
+        Sodium Chloride 58.44
+    """
+    if chunksize < 1:
+        raise ValueError("Chunk size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(formulas, chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _annotate_chunk(chunk)
+        return
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_initialize_worker,
+        initargs=(get_backend(),),
+    ) as executor:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_annotate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def annotate_file(path, chunksize=1000, workers=None):
+    """
+    Annotate a file with one formula per line, streaming it from disk.
+
+    Args:
+        path (str): The path of the file. Blank lines are skipped.
+        chunksize (int, optional): The number of formulas sent to a worker at a time. Defaults to 1000.
+        workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+
+    Yields:
+        dict: The annotation of each formula (see `annotate`).
+    """
+    with open(path, encoding="utf-8") as file:
+        formulas = (line.strip() for line in file if line.strip())
+        yield from annotate_many(formulas, chunksize=chunksize, workers=workers)
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+
+import os
+import threading
+
+
+# Every cache created with `named_cache`, keyed by name. A module's caches are
+# only created once it has been imported.
+CACHES = {}
+
+
+class LRUCache:
+    """
+    A size-bounded, thread-safe least-recently-used cache.
+
+    Args:
+        maxsize (int, optional): The maximum number of entries. 0 disables caching. Defaults to 1024.
+
+    Methods:
+        get: Get a value from the cache.
+        put: Add a value to the cache, evicting the least recently used entry if full.
+        clear: Remove all entries and reset the counters.
+        resize: Change the maximum number of entries.
+        stats: Get the hit, miss and eviction counters.
+
+    Examples:
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache.put("H2O", 18.015)
+        >>> cache.get("H2O")
+        18.015
+        >>> cache.stats()
+        {'hits': 1, 'misses': 0, 'evictions': 0, 'size': 1, 'maxsize': 2}
+    """
+
+    def __init__(self, maxsize=1024):
+        if maxsize < 0:
+            raise ValueError("Cache size cannot be negative")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def resize(self, maxsize):
+        if maxsize < 0:
+            raise ValueError("Cache size cannot be negative")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __repr__(self):
+        return f"LRUCache(maxsize={self.maxsize}, size={len(self._data)})"
+
+
+def named_cache(name, setting, default=4096):
+    """
+    Create an `LRUCache` sized from an environment variable and register it in
+    `CACHES`.
+
+    Caches are bounded by their number of entries, not by memory; each module
+    documents what an entry holds, and the README lists the settings.
+
+    Args:
+        name (str): The name of the cache in `CACHES`.
+        setting (str): The environment variable with the maximum number of entries.
+        default (int, optional): The maximum number of entries if the variable is not set. Defaults to 4096.
+
+    Returns:
+        LRUCache: The cache.
+    """
+    cache = LRUCache(maxsize=int(os.environ.get(setting, default)))
+    CACHES[name] = cache
+    return cache
+
+
+def cache_stats():
+    """
+    Get the counters of every named cache.
+
+    Returns:
+        dict: The `LRUCache.stats()` of each cache, keyed by name.
+    """
+    return {name: cache.stats() for name, cache in CACHES.items()}
+
+
+def resize_caches(maxsize):
+    """
+    Change the maximum number of entries of every named cache, e.g. 0 to
+    disable caching altogether.
+
+    Args:
+        maxsize (int): The maximum number of entries of each cache.
+    """
+    for cache in CACHES.values():
+        cache.resize(maxsize)
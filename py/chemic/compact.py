@@ -0,0 +1,200 @@
+from .main import Element, Formula, formula_key, hill_formula, hill_order, lookup_element
+from .main import _KEY, _OTHER_KEY, _cache_entry
+from .main import _KEY_PAIR as _PAIR
+
+
+# The largest count a packed key can hold, an unsigned 32-bit integer.
+MAX_COUNT = 0xFFFFFFFF
+
+
+class CompactFormula:
+    """
+    A compact, immutable and hashable chemical formula.
+
+    The composition is stored as a single bytes object of (atomic number,
+    count) pairs sorted by atomic number, which makes instances small, cheap to
+    compare and usable as dictionary keys or set members, e.g. to deduplicate
+    millions of formulas. Convert to a `Formula` with `to_formula()` for names
+    and the rest of the `Formula` API.
+
+    Args:
+        formula (str, dict, Formula, Element, CompactFormula): The formula.
+
+    Attributes:
+        key (bytes): The packed (atomic number, count) pairs.
+        pairs (tuple): The (atomic number, count) pairs.
+        elements (dict): The number of atoms of each element, keyed by symbol.
+        mass (float): The molar mass of the formula.
+        count (int): The number of atoms in the formula.
+
+    Raises:
+        ValueError: If the formula is invalid or has a fractional, negative or too large count (see `MAX_COUNT`).
+
+    Examples:
+        >>> CompactFormula("OH2") == CompactFormula("H2O")
+        True
+        >>> len({CompactFormula("H2O"), CompactFormula({"H": 2, "O": 1})})
+        1
+        >>> CompactFormula("H2O").pairs
+        ((1, 2), (8, 1))
+    """
+
+    __slots__ = ("key", "_hash")
+
+    def __init__(self, formula):
+        if isinstance(formula, CompactFormula):
+            key = formula.key
+        elif isinstance(formula, str):
+            # Parsed through the formula cache, and the key memoized there.
+            symbols, properties = _cache_entry(formula)
+            key = properties[_KEY]
+            if key is None:
+                key = properties[_KEY] = formula_key(symbols)
+            key = _integral_key(key)
+        elif isinstance(formula, Formula):
+            key = _integral_key(formula.key)
+        elif isinstance(formula, Element):
+            key = pack_elements({formula: 1})
+        elif isinstance(formula, dict):
+            key = pack_elements(formula)
+        else:
+            raise ValueError("Invalid formula")
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "_hash", hash(key))
+
+    @classmethod
+    def from_key(cls, key):
+        """
+        Create a formula from packed (atomic number, count) pairs.
+
+        Args:
+            key (bytes): The packed pairs, e.g. from another formula's `key`.
+
+        Returns:
+            CompactFormula: The formula.
+
+        Raises:
+            ValueError: If the key is not packed (atomic number, count) pairs, e.g. the key of a formula with fractional counts.
+        """
+        key = bytes(key)
+        numbers = key[:: _PAIR.size]
+        if (
+            len(key) % _PAIR.size
+            or any(lookup_element(number) is None for number in numbers)
+            or any(first >= second for first, second in zip(numbers, numbers[1:]))
+        ):
+            raise ValueError("Invalid packed key")
+        formula = object.__new__(cls)
+        object.__setattr__(formula, "key", key)
+        object.__setattr__(formula, "_hash", hash(formula.key))
+        return formula
+
+    @property
+    def pairs(self):
+        return tuple(_PAIR.iter_unpack(self.key))
+
+    @property
+    def elements(self):
+        return {
+            lookup_element(number).symbol: count
+            for number, count in _PAIR.iter_unpack(self.key)
+        }
+
+    @property
+    def mass(self):
+        return sum(
+            count * lookup_element(number).mass
+            for number, count in _PAIR.iter_unpack(self.key)
+        )
+
+    @property
+    def count(self):
+        return sum(count for _, count in _PAIR.iter_unpack(self.key))
+
+    def to_formula(self):
+        """
+        Convert to a `Formula`.
+
+        Returns:
+            Formula: The formula, with elements in Hill order (see `chemic.main.hill_order`).
+        """
+        elements = self.elements
+        return Formula({symbol: elements[symbol] for symbol in hill_order(elements)})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompactFormula objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("CompactFormula objects are immutable")
+
+    def __reduce__(self):
+        return (CompactFormula.from_key, (self.key,))
+
+    def __str__(self):
+        return hill_formula(self.elements)
+
+    def __repr__(self):
+        return f"CompactFormula({str(self)!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, CompactFormula):
+            return self.key == other.key
+        if isinstance(other, Formula):
+            return self.key == other.key
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __lt__(self, other):
+        if isinstance(other, CompactFormula):
+            return self.key < other.key
+        return NotImplemented
+
+    def __hash__(self):
+        return self._hash
+
+    def __len__(self):
+        return len(self.key) // _PAIR.size
+
+    def __getitem__(self, key):
+        return self.elements[key]
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def __contains__(self, item):
+        return item in self.elements
+
+
+def _integral_key(key):
+    """
+    Check that a canonical key is packed (atomic number, count) pairs rather
+    than the key of a formula with other counts (see `chemic.main.formula_key`).
+    """
+    if key[:1] == _OTHER_KEY:
+        raise ValueError(f"Counts must be whole numbers from 0 to {MAX_COUNT}")
+    return key
+
+
+def pack_elements(elements):
+    """
+    Pack a dictionary of elements into sorted (atomic number, count) pairs,
+    its canonical key (see `chemic.main.formula_key`).
+
+    Args:
+        elements (dict): The number of atoms of each element, keyed by anything `Element` accepts.
+
+    Returns:
+        bytes: The packed pairs, the same for any order of the elements.
+
+    Raises:
+        ValueError: If an element is unknown or a count is fractional, negative or above `MAX_COUNT`.
+    """
+    for element, count in elements.items():
+        if count != int(count) or not 0 <= count <= MAX_COUNT:
+            raise ValueError(f"Invalid count for {element}: {count}")
+    # Counts of an element given more than once are added up, and may still
+    # overflow.
+    return _integral_key(formula_key(elements))
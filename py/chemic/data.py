@@ -0,0 +1,199 @@
+from array import array
+from .snapshot import load_snapshot_table
+
+import csv
+import importlib.resources
+import importlib.util
+import math
+import os
+import sys
+
+
+BACKENDS = ("pandas", "compact")
+
+_TABLES = {}
+_RELOAD_HOOKS = []
+_BACKEND = os.environ.get("CHEMIC_BACKEND") or (
+    "pandas" if importlib.util.find_spec("pandas") else "compact"
+)
+
+
+class CompactTable:
+    """
+    A read-only, column-oriented table that does not depend on pandas.
+
+    Integer and float columns are stored as typed arrays and text columns as
+    tuples of interned strings. Missing values are NaN, as with pandas. Only
+    the small part of the DataFrame interface chemic uses is implemented.
+
+    Args:
+        columns (dict): The values of each column, keyed by column name.
+
+    Attributes:
+        columns (list): The column names.
+        shape (tuple): The number of rows and columns.
+
+    Methods:
+        to_dict: Get the rows as a list of dictionaries.
+
+    Examples:
+        >>> table = load_table("periodic_table", backend="compact")
+        >>> table["Symbol"][:3]
+        ('H', 'He', 'Li')
+        >>> table.to_dict("records")[0]["AtomicMass"]
+        1.008
+    """
+
+    __slots__ = ("columns", "_data", "_length")
+
+    def __init__(self, columns):
+        self._data = dict(columns)
+        self.columns = list(self._data)
+        lengths = {len(values) for values in self._data.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_csv(cls, file):
+        """
+        Read a table from a CSV file, inferring a compact type for each column.
+
+        Args:
+            file (file): The open CSV file.
+
+        Returns:
+            CompactTable: The table.
+        """
+        reader = csv.reader(file)
+        header = next(reader)
+        # Short rows are padded with missing values, as pandas does.
+        rows = [row + [""] * (len(header) - len(row)) for row in reader]
+        values = list(zip(*rows)) or [()] * len(header)
+        return cls(
+            {name: _compact_column(column) for name, column in zip(header, values)}
+        )
+
+    @property
+    def shape(self):
+        return (self._length, len(self.columns))
+
+    def to_dict(self, orient="records"):
+        if orient != "records":
+            raise ValueError("CompactTable only supports orient='records'")
+        columns = [self._data[name] for name in self.columns]
+        return [dict(zip(self.columns, row)) for row in zip(*columns)]
+
+    def __getitem__(self, column):
+        return self._data[column]
+
+    def __contains__(self, column):
+        return column in self._data
+
+    def __len__(self):
+        return self._length
+
+    def __repr__(self):
+        return f"CompactTable({self._length} rows, {len(self.columns)} columns)"
+
+
+def _compact_column(values):
+    """
+    Convert the text values of a CSV column into the most compact column type.
+
+    Args:
+        values (tuple): The raw values of the column.
+
+    Returns:
+        array, tuple: A signed integer array, a float array, or a tuple of interned strings.
+    """
+    present = [value for value in values if value != ""]
+    try:
+        if len(present) == len(values):
+            return array("q", [int(value) for value in values])
+    except ValueError:
+        pass
+    try:
+        return array("d", [float(value) if value != "" else math.nan for value in values])
+    except ValueError:
+        pass
+    return tuple(sys.intern(value) if value != "" else math.nan for value in values)
+
+
+def get_backend():
+    """
+    Get the name of the backend tables are loaded with.
+
+    Returns:
+        str: "pandas" or "compact".
+    """
+    return _BACKEND
+
+
+def set_backend(backend):
+    """
+    Choose how tables are loaded: as pandas DataFrames or as `CompactTable`s.
+
+    The default is "pandas" if it is installed, and can also be set with the
+    CHEMIC_BACKEND environment variable. Changing the backend drops all loaded
+    tables and everything built from them.
+
+    Args:
+        backend (str): "pandas" or "compact".
+    """
+    global _BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    if backend != _BACKEND:
+        _BACKEND = backend
+        _TABLES.clear()
+        for hook in _RELOAD_HOOKS:
+            hook()
+
+
+def on_reload(hook):
+    """
+    Register a function to call when loaded tables are dropped.
+
+    Args:
+        hook (callable): A function taking no arguments.
+
+    Returns:
+        callable: The hook, so this can be used as a decorator.
+    """
+    _RELOAD_HOOKS.append(hook)
+    return hook
+
+
+def load_table(name, backend=None):
+    """
+    Load one of the tables bundled with chemic, parsing it on first use.
+
+    The compact backend reads the table from the binary snapshot (see
+    `chemic.snapshot`) when an up-to-date one exists, and falls back to the
+    CSV otherwise. The pandas backend, the default when pandas is installed,
+    always parses the CSV and never uses the snapshot.
+
+    Args:
+        name (str): The name of the table, "periodic_table", "common_formulas" or "isotopes".
+        backend (str, optional): "pandas" or "compact". Defaults to the current backend.
+
+    Returns:
+        pandas.DataFrame, CompactTable: The table.
+    """
+    backend = backend or _BACKEND
+    table = _TABLES.get((backend, name))
+    if table is None:
+        if backend == "compact":
+            table = load_snapshot_table(name)
+        if table is None:
+            resource = importlib.resources.files("chemic").joinpath(f"{name}.csv")
+            with resource.open(encoding="utf-8", newline="") as file:
+                if backend == "compact":
+                    table = CompactTable.from_csv(file)
+                else:
+                    import pandas as pd
+
+                    table = pd.read_csv(file)
+        _TABLES[(backend, name)] = table
+    return table
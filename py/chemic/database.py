@@ -0,0 +1,413 @@
+from .data import load_table
+from .main import Formula, formula_key, hill_formula
+from .utils import is_cas_number, parse_formula
+
+import csv
+import html
+import json
+import os
+import re
+import sqlite3
+
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "compounds.sqlite")
+
+_TAG = re.compile(r"<[^>]*>")
+# A superscript right after a digit, as in the ring locants of
+# "tricyclo[4.2.2.2<sup>2,5</sup>]dodecane".
+_DIGIT_SUPERSCRIPT = re.compile(r"(?<=\d)<sup>([^<]*)</sup>", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE compounds (
+    id INTEGER PRIMARY KEY,
+    formula TEXT NOT NULL,
+    canonical TEXT,
+    key BLOB,
+    charge INTEGER NOT NULL DEFAULT 0,
+    mass REAL,
+    cas TEXT,
+    inchi TEXT,
+    inchi_key TEXT,
+    name TEXT,
+    sources TEXT NOT NULL
+);
+CREATE TABLE names (
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    compound INTEGER NOT NULL REFERENCES compounds (id)
+);
+CREATE INDEX compounds_key ON compounds (key, charge);
+CREATE UNIQUE INDEX compounds_cas ON compounds (cas);
+CREATE INDEX compounds_inchi_key ON compounds (inchi_key);
+CREATE INDEX compounds_mass ON compounds (mass);
+CREATE INDEX names_key ON names (key);
+"""
+
+_COLUMNS = ("id", "formula", "canonical", "key", "charge", "mass", "cas", "inchi", "inchi_key", "name", "sources")
+
+
+def default_path():
+    """
+    Get the path of the compound database.
+
+    Returns:
+        str: The CHEMIC_DATABASE environment variable, or `compounds.sqlite` in the chemic package.
+    """
+    return os.environ.get("CHEMIC_DATABASE") or DEFAULT_PATH
+
+
+def clean_name(name):
+    """
+    Get the plain text of a compound name, without markup like the `<sup>` and
+    entities in WebBook names.
+
+    A superscript right after a digit is written as "^{...}", so it does not
+    run into the digits before it: "[4.2.2.2<sup>2,5</sup>]" becomes
+    "[4.2.2.2^{2,5}]" rather than "[4.2.2.22,5]".
+
+    Args:
+        name (str): The name.
+
+    Returns:
+        str: The name as plain text, with runs of whitespace collapsed.
+    """
+    name = _DIGIT_SUPERSCRIPT.sub(r"^{\1}", name)
+    return _WHITESPACE.sub(" ", html.unescape(_TAG.sub("", name))).strip()
+
+
+def _name_key(name):
+    return clean_name(name).lower()
+
+
+def canonical_formula(formula):
+    """
+    Get the canonical forms of a formula, for matching formulas written in any
+    element order.
+
+    Args:
+        formula (str): The formula, optionally charged.
+
+    Returns:
+        tuple: The formula in Hill order without its charge, its canonical key (see `chemic.main.formula_key`), and the charge. The formula and key are None if the formula cannot be parsed, and the key if it has an unknown element.
+    """
+    parsed = parse_formula(formula, charge=True)
+    if parsed is None or not parsed[0]:
+        return None, None, 0
+    elements, charge = parsed
+    try:
+        key = formula_key(elements)
+    except ValueError:
+        key = None
+    return hill_formula(elements), key, charge
+
+
+def _mass(canonical):
+    try:
+        return Formula(canonical).mass
+    except ValueError:
+        return None
+
+
+def table_records():
+    """
+    Read the compounds in the bundled formula table.
+
+    Returns:
+        list: Records (see `build_database`).
+    """
+    records = []
+    for record in load_table("common_formulas").to_dict("records"):
+        names = [name for name in record["Names"].split("\n") if name.strip()]
+        cas = record["CAS"] if isinstance(record["CAS"], str) else None
+        records.append({"formula": record["Formula"], "names": names, "cas": cas})
+    return records
+
+
+def read_records(path):
+    """
+    Read the compounds in a file.
+
+    Args:
+        path (str): A CSV file with "Formula", newline-separated "Names" and "CAS" columns (like `utils/lib/data/formulae.csv`), a JSON Lines export of records scraped by `utils/fetch`, or a headerless tab-separated file of names, formulas and CAS numbers (like `utils/fetch/species.txt`).
+
+    Returns:
+        list: Records (see `build_database`).
+    """
+    records = []
+    with open(path, newline="", encoding="utf-8") as file:
+        if str(path).endswith(".csv"):
+            for row in csv.DictReader(file):
+                names = [name for name in (row.get("Names") or "").split("\n") if name.strip()]
+                records.append({"formula": row["Formula"], "names": names, "cas": row.get("CAS")})
+        elif str(path).endswith(".jsonl"):
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                records.append(
+                    {
+                        "formula": record.get("formula"),
+                        "names": [record.get("name")] + list(record.get("other_names") or ()),
+                        "cas": record.get("cas_number"),
+                        "inchi": record.get("inchi"),
+                        "inchi_key": record.get("inchi_key"),
+                    }
+                )
+        else:
+            for row in csv.reader(file, delimiter="\t"):
+                if len(row) >= 3:
+                    records.append({"formula": row[1], "names": [row[0]], "cas": row[2]})
+    return records
+
+
+def build_database(sources, path=None):
+    """
+    Merge compound records from several sources into one SQLite database.
+
+    Records with the same CAS number are merged into one compound: the first
+    source to give a field wins, and names from every source are kept as
+    synonyms. Records without a CAS number are merged by canonical formula and
+    name instead. Every formula is stored as given, in Hill order and as its
+    canonical key, with its charge and molar mass, indexed for lookups by
+    formula, CAS number, InChIKey, name and mass.
+
+    Args:
+        sources (iterable): (source name, records) pairs, in order of precedence. Each record is a dictionary with a "formula", a list of "names" and optionally a "cas", "inchi" and "inchi_key" (see `table_records` and `read_records`).
+        path (str, optional): Where to write the database. Defaults to `default_path()`.
+
+    Returns:
+        str: The path of the database.
+    """
+    path = path or default_path()
+    compounds = []
+    by_key = {}
+    for source, records in sources:
+        for record in records:
+            formula = (record.get("formula") or "").strip()
+            cas = (record.get("cas") or "").strip()
+            cas = cas if is_cas_number(cas) else None
+            names = [clean_name(name) for name in record.get("names") or () if isinstance(name, str)]
+            names = [name for name in names if name]
+            if not formula:
+                continue
+            canonical, canonical_key, charge = canonical_formula(formula)
+            key = cas or (canonical_key or formula, charge, names[0].lower() if names else None)
+            compound = by_key.get(key)
+            if compound is None:
+                compound = {
+                    "formula": formula,
+                    "canonical": canonical,
+                    "key": canonical_key,
+                    "charge": charge,
+                    "cas": cas,
+                    "inchi": None,
+                    "inchi_key": None,
+                    "names": {},
+                    "sources": [],
+                }
+                by_key[key] = compound
+                compounds.append(compound)
+            for field in ("inchi", "inchi_key"):
+                compound[field] = compound[field] or record.get(field) or None
+            for name in names:
+                compound["names"].setdefault(name.lower(), name)
+            if source not in compound["sources"]:
+                compound["sources"].append(source)
+
+    masses = {}
+    if os.path.exists(path + ".tmp"):
+        os.remove(path + ".tmp")
+    connection = sqlite3.connect(path + ".tmp")
+    with connection:
+        connection.executescript(_SCHEMA)
+        rows = []
+        names = []
+        for number, compound in enumerate(compounds, 1):
+            canonical = compound["canonical"]
+            if canonical is not None and canonical not in masses:
+                masses[canonical] = _mass(canonical)
+            synonyms = list(compound["names"].items())
+            rows.append(
+                (
+                    number,
+                    compound["formula"],
+                    canonical,
+                    compound["key"],
+                    compound["charge"],
+                    masses.get(canonical),
+                    compound["cas"],
+                    compound["inchi"],
+                    compound["inchi_key"],
+                    synonyms[0][1] if synonyms else None,
+                    ",".join(compound["sources"]),
+                )
+            )
+            names.extend((key, name, number) for key, name in synonyms)
+        connection.executemany(f"INSERT INTO compounds VALUES ({', '.join('?' * len(_COLUMNS))})", rows)
+        connection.executemany("INSERT INTO names VALUES (?, ?, ?)", names)
+    connection.execute("ANALYZE")
+    connection.close()
+    os.replace(path + ".tmp", path)
+    return path
+
+
+class CompoundDatabase:
+    """
+    Indexed lookups of compounds in a database written by `build_database`.
+
+    Compounds are returned as dictionaries of their "formula" (as first
+    given), "canonical" formula (in Hill order), canonical "key", "charge",
+    "mass", "cas", "inchi", "inchi_key", "name" and the "sources" they were
+    merged from.
+
+    Args:
+        path (str, optional): The database file. Defaults to `default_path()`.
+
+    Raises:
+        ValueError: If the file does not exist.
+
+    Examples:
+        >>> database = CompoundDatabase()
+        >>> database.by_cas("7732-18-5")["name"]
+        'water'
+        >>> [compound["cas"] for compound in database.by_formula("OH2")]
+        ['7732-18-5']
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        if not os.path.exists(self.path):
+            raise ValueError(f"No compound database at {self.path}")
+        self._connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM compounds").fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+    def _query(self, condition, parameters, limit=None):
+        query = f"SELECT {', '.join(_COLUMNS)} FROM compounds WHERE {condition}"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        rows = self._connection.execute(query, parameters).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def by_cas(self, cas_number):
+        """
+        Get the compound with a CAS number.
+
+        Args:
+            cas_number (str): The CAS number.
+
+        Returns:
+            dict: The compound, or None if there is none.
+        """
+        compounds = self._query("cas = ?", (cas_number.strip(),))
+        return compounds[0] if compounds else None
+
+    def by_formula(self, formula, limit=None):
+        """
+        Get the compounds with a formula, written in any element order.
+
+        Args:
+            formula (str): The formula, optionally charged (e.g. "SO4 2-").
+            limit (int, optional): The most compounds to return.
+
+        Returns:
+            list: The compounds, in order of precedence of their sources.
+        """
+        _, key, charge = canonical_formula(formula)
+        if key is None:
+            return self._query("formula = ?", (formula.strip(),), limit)
+        return self._query("key = ? AND charge = ? ORDER BY id", (key, charge), limit)
+
+    def by_inchi_key(self, inchi_key):
+        """
+        Get the compounds with a standard InChIKey.
+
+        Args:
+            inchi_key (str): The InChIKey.
+
+        Returns:
+            list: The compounds.
+        """
+        return self._query("inchi_key = ?", (inchi_key.strip(),))
+
+    def by_name(self, name, limit=None):
+        """
+        Get the compounds with a name or synonym, ignoring case.
+
+        Args:
+            name (str): The name.
+            limit (int, optional): The most compounds to return.
+
+        Returns:
+            list: The compounds.
+        """
+        return self._query(
+            "id IN (SELECT compound FROM names WHERE key = ?) ORDER BY id", (_name_key(name),), limit
+        )
+
+    def by_mass(self, mass, tolerance=0.01, limit=None):
+        """
+        Get the compounds with a molar mass within a tolerance.
+
+        Args:
+            mass (float): The molar mass.
+            tolerance (float, optional): The largest difference in mass. Defaults to 0.01.
+            limit (int, optional): The most compounds to return.
+
+        Returns:
+            list: The compounds, closest in mass first.
+        """
+        return self._query(
+            "mass BETWEEN ? AND ? ORDER BY ABS(mass - ?), id",
+            (mass - tolerance, mass + tolerance, mass),
+            limit,
+        )
+
+    def names(self, compound):
+        """
+        Get every name of a compound.
+
+        Args:
+            compound (dict, int): The compound or its id.
+
+        Returns:
+            list: The names, in the order they were found.
+        """
+        number = compound["id"] if isinstance(compound, dict) else compound
+        return [
+            name
+            for (name,) in self._connection.execute(
+                "SELECT name FROM names WHERE compound = ? ORDER BY rowid", (number,)
+            )
+        ]
+
+
+_DATABASES = {}
+
+
+def compound_database(path=None):
+    """
+    Get the compound database, opened once per path.
+
+    Args:
+        path (str, optional): The database file. Defaults to `default_path()`.
+
+    Returns:
+        CompoundDatabase: The database, or None if it has not been built.
+    """
+    path = path or default_path()
+    database = _DATABASES.get(path)
+    if database is None:
+        if not os.path.exists(path):
+            return None
+        try:
+            database = CompoundDatabase(path)
+        except (sqlite3.Error, ValueError):
+            return None
+        _DATABASES[path] = database
+    return database
@@ -0,0 +1,290 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+
+
+MAGIC = b"CHEMIMGS"
+VERSION = 1
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "images.pack")
+
+# Magic, format version, header length and number of images.
+_PREAMBLE = struct.Struct("<8sIII")
+# The SHA-256 digest, offset and length of each image, sorted by digest.
+_ENTRY = struct.Struct("<32sQQ")
+_CAS_NUMBER = re.compile(r"^\d{2,7}-\d{2}-\d$")
+
+
+def default_path():
+    """
+    Get the path of the image store.
+
+    Returns:
+        str: The CHEMIC_IMAGES environment variable, or `images.pack` in the chemic package.
+    """
+    return os.environ.get("CHEMIC_IMAGES") or DEFAULT_PATH
+
+
+def _read_source(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    with open(source, "rb") as file:
+        return file.read()
+
+
+def write_image_store(entries, path=None):
+    """
+    Pack structure images into a single content-addressed file.
+
+    Each distinct image is stored once, under the SHA-256 of its bytes, no
+    matter how many formulas or CAS numbers refer to it. Isomers share a
+    formula but not an image, so a formula maps to all of its images.
+
+    Args:
+        entries (iterable): (image, formula, CAS number) triples, where the image is its bytes or the path of a file, and the formula or CAS number may be None.
+        path (str, optional): Where to write the store. Defaults to `default_path()`.
+
+    Returns:
+        str: The path of the store.
+    """
+    path = path or default_path()
+    blobs = {}
+    formulas = {}
+    cas_numbers = {}
+    for source, formula, cas in entries:
+        data = _read_source(source)
+        digest = hashlib.sha256(data).digest()
+        # Keep paths rather than bytes, so the images are read again while
+        # writing instead of all being held in memory.
+        blobs.setdefault(digest, source if isinstance(source, (str, os.PathLike)) else data)
+        if formula:
+            digests = formulas.setdefault(formula, [])
+            if digest not in digests:
+                digests.append(digest)
+        if cas:
+            cas_numbers[cas] = digest
+    order = sorted(blobs)
+    index = {digest: position for position, digest in enumerate(order)}
+    header = {
+        "version": VERSION,
+        "formulas": {
+            formula: [index[digest] for digest in digests] for formula, digests in formulas.items()
+        },
+        "cas": {cas: index[digest] for cas, digest in cas_numbers.items()},
+    }
+    encoded_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    encoded_header += b" " * (-(len(encoded_header) + _PREAMBLE.size) % 8)
+    offset = _PREAMBLE.size + len(encoded_header) + _ENTRY.size * len(order)
+    table = bytearray()
+    for digest in order:
+        blob = blobs[digest]
+        length = len(blob) if isinstance(blob, bytes) else os.path.getsize(blob)
+        table += _ENTRY.pack(digest, offset, length)
+        offset += length
+    with open(path + ".tmp", "wb") as file:
+        file.write(_PREAMBLE.pack(MAGIC, VERSION, len(encoded_header), len(order)))
+        file.write(encoded_header)
+        file.write(table)
+        for digest in order:
+            file.write(_read_source(blobs[digest]))
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def image_directory_entries(directory):
+    """
+    List the images in a directory of `<formula>.png` or `<CAS number>.png`
+    files, like `utils/lib/images` or the output of `utils/fetch`.
+
+    Args:
+        directory (str): The directory.
+
+    Returns:
+        list: (path, formula, CAS number) triples for `write_image_store`.
+    """
+    entries = []
+    for filename in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(filename)
+        if extension.lower() != ".png":
+            continue
+        if _CAS_NUMBER.match(stem):
+            entries.append((os.path.join(directory, filename), None, stem))
+        else:
+            entries.append((os.path.join(directory, filename), stem, None))
+    return entries
+
+
+class ImageStore:
+    """
+    A memory-mapped store of structure images written by `write_image_store`.
+
+    Opening the store reads only its index. Images are returned as zero-copy
+    views of the mapped file, so serving one is a slice rather than an `open`
+    and a read, and processes serving the same store share its pages.
+
+    Args:
+        path (str, optional): The store file. Defaults to `default_path()`.
+
+    Raises:
+        ValueError: If the file is not a valid image store of this version.
+
+    Examples:
+        >>> store = ImageStore()
+        >>> bytes(store.get("H2O")[:4])
+        b'\\x89PNG'
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if len(self._view) < _PREAMBLE.size:
+            raise ValueError("Image store is truncated")
+        magic, version, header_length, count = _PREAMBLE.unpack_from(self._view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a chemic image store of a supported version")
+        start = _PREAMBLE.size + header_length
+        header = json.loads(bytes(self._view[_PREAMBLE.size : start]))
+        self._formulas = header["formulas"]
+        self._cas = header["cas"]
+        self._table = self._view[start : start + _ENTRY.size * count]
+        self._count = count
+        if len(self._table) != _ENTRY.size * count:
+            raise ValueError("Image store is truncated")
+        self._digests = None
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        return key in self._cas or key in self._formulas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Unmap the store. Views returned by it must be released first.
+        """
+        self._table.release()
+        self._view.release()
+        self._map.close()
+
+    def _position(self, key):
+        position = self._cas.get(key)
+        if position is None:
+            positions = self._formulas.get(key)
+            position = positions[0] if positions else None
+        return position
+
+    def _image(self, position):
+        _, offset, length = _ENTRY.unpack_from(self._table, position * _ENTRY.size)
+        return self._view[offset : offset + length]
+
+    def get(self, key):
+        """
+        Get the structure image of a CAS number or formula.
+
+        Args:
+            key (str): A CAS number or a formula. A formula with several images (isomers) gives the first.
+
+        Returns:
+            memoryview: A read-only view of the PNG (use `bytes()` to copy it), or None if there is none.
+        """
+        position = self._position(key)
+        return None if position is None else self._image(position)
+
+    def formula_images(self, formula):
+        """
+        Get every structure image of a formula, one per distinct structure.
+
+        Args:
+            formula (str): The formula.
+
+        Returns:
+            list: Read-only views of the PNGs.
+        """
+        return [self._image(position) for position in self._formulas.get(formula, ())]
+
+    def digest(self, key):
+        """
+        Get the SHA-256 of the image of a CAS number or formula, e.g. for an ETag.
+
+        Args:
+            key (str): A CAS number or a formula.
+
+        Returns:
+            str: The hexadecimal digest, or None if there is no image.
+        """
+        position = self._position(key)
+        if position is None:
+            return None
+        return _ENTRY.unpack_from(self._table, position * _ENTRY.size)[0].hex()
+
+    def by_digest(self, digest):
+        """
+        Get an image by the SHA-256 of its contents.
+
+        Args:
+            digest (str): The hexadecimal digest.
+
+        Returns:
+            memoryview: A read-only view of the PNG, or None if there is none.
+        """
+        if self._digests is None:
+            self._digests = {
+                _ENTRY.unpack_from(self._table, position * _ENTRY.size)[0]: position
+                for position in range(self._count)
+            }
+        try:
+            position = self._digests.get(bytes.fromhex(digest))
+        except ValueError:
+            return None
+        return None if position is None else self._image(position)
+
+    def verify(self):
+        """
+        Check every image against its digest.
+
+        Returns:
+            list: The digests of the images that do not match.
+        """
+        corrupt = []
+        for position in range(self._count):
+            digest, offset, length = _ENTRY.unpack_from(self._table, position * _ENTRY.size)
+            if hashlib.sha256(self._view[offset : offset + length]).digest() != digest:
+                corrupt.append(digest.hex())
+        return corrupt
+
+
+_STORES = {}
+
+
+def structure_image(key, path=None):
+    """
+    Get the structure image of a CAS number or formula from the image store.
+
+    Args:
+        key (str): A CAS number or a formula.
+        path (str, optional): The store file. Defaults to `default_path()`.
+
+    Returns:
+        memoryview: A read-only view of the PNG, or None if there is no store or no image for the key.
+    """
+    path = path or default_path()
+    store = _STORES.get(path)
+    if store is None:
+        if not os.path.exists(path):
+            return None
+        try:
+            store = ImageStore(path)
+        except (OSError, ValueError):
+            return None
+        _STORES[path] = store
+    return store.get(key)
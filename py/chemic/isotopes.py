@@ -0,0 +1,259 @@
+from .cache import named_cache
+from .data import load_table, on_reload
+from .main import Element, Formula
+
+import numpy as np
+
+
+# Relative probability below which the tails of a distribution are dropped.
+DEFAULT_THRESHOLD = 1e-9
+
+_ISOTOPES = None
+
+# Isotopic distributions of single elements raised to a count, keyed by
+# (symbol, count, threshold). Formulas in a batch share most of their
+# elements, so these are reused heavily. An entry holds three small arrays,
+# about 1 KB for typical counts and more for large ones; the default of 1024
+# entries can be set with CHEMIC_ISOTOPE_CACHE_SIZE.
+DISTRIBUTION_CACHE = named_cache("isotope", "CHEMIC_ISOTOPE_CACHE_SIZE", 1024)
+
+
+@on_reload
+def _reset_isotopes():
+    global _ISOTOPES
+    _ISOTOPES = None
+    DISTRIBUTION_CACHE.clear()
+
+
+def _build_isotopes():
+    """
+    Group the bundled isotope table by element.
+
+    Returns:
+        dict: For each symbol, a tuple of the lightest mass number, the abundance of each mass number from there on, the isotope masses times their abundances, and the mass of the most abundant isotope.
+    """
+    grouped = {}
+    for record in load_table("isotopes").to_dict("records"):
+        grouped.setdefault(record["Symbol"], []).append(record)
+    isotopes = {}
+    for symbol, records in grouped.items():
+        first = min(int(record["MassNumber"]) for record in records)
+        last = max(int(record["MassNumber"]) for record in records)
+        probabilities = np.zeros(last - first + 1)
+        weighted = np.zeros(last - first + 1)
+        for record in records:
+            index = int(record["MassNumber"]) - first
+            probabilities[index] = record["Abundance"]
+            weighted[index] = record["Abundance"] * record["Mass"]
+        most_abundant = max(records, key=lambda record: record["Abundance"])
+        isotopes[symbol] = (first, probabilities, weighted, float(most_abundant["Mass"]))
+    return isotopes
+
+
+def _isotopes():
+    global _ISOTOPES
+    if _ISOTOPES is None:
+        _ISOTOPES = _build_isotopes()
+    return _ISOTOPES
+
+
+def _element_isotopes(symbol):
+    isotopes = _isotopes().get(symbol)
+    if isotopes is None:
+        raise ValueError(f"No isotope data for {symbol}")
+    return isotopes
+
+
+def _integer_counts(formula):
+    """
+    Get the element counts of a formula as integers.
+
+    Args:
+        formula (str, dict, Formula, Element): The formula.
+
+    Returns:
+        dict: The number of atoms of each element, keyed by symbol.
+
+    Raises:
+        ValueError: If the formula is invalid or has a fractional count.
+    """
+    if not isinstance(formula, Formula):
+        formula = Formula(formula)
+    counts = {}
+    for symbol, count in formula.elements.items():
+        if count != int(count) or count < 0:
+            raise ValueError(f"Invalid count for {symbol}: {count}")
+        if count:
+            counts[symbol] = int(count)
+    return counts
+
+
+def monoisotopic_mass(formula):
+    """
+    Get the monoisotopic mass of a formula, the sum of the masses of the most
+    abundant isotope of each of its atoms.
+
+    Args:
+        formula (str, dict, Formula, Element): The formula.
+
+    Returns:
+        float: The monoisotopic mass.
+
+    Raises:
+        ValueError: If the formula is invalid or has an element without isotope data.
+
+    Examples:
+        >>> round(monoisotopic_mass("H2O"), 6)
+        18.010565
+    """
+    return sum(
+        count * _element_isotopes(symbol)[3]
+        for symbol, count in _integer_counts(formula).items()
+    )
+
+
+def _prune(first, probabilities, weighted, threshold):
+    """
+    Drop the leading and trailing bins of a distribution below a threshold.
+
+    Args:
+        first (int): The nominal mass of the first bin.
+        probabilities (numpy.ndarray): The probability of each nominal mass.
+        weighted (numpy.ndarray): The probability times the mean exact mass of each nominal mass.
+        threshold (float): The probability, relative to the most likely bin, below which bins are dropped.
+
+    Returns:
+        tuple: The pruned distribution.
+    """
+    keep = np.flatnonzero(probabilities >= threshold * probabilities.max())
+    start, stop = keep[0], keep[-1] + 1
+    return first + start, probabilities[start:stop], weighted[start:stop]
+
+
+def _convolve(left, right, threshold):
+    """
+    Combine the distributions of two independent groups of atoms.
+
+    The probabilities of each total nominal mass are the convolution of the
+    two distributions, and so are the probability-weighted exact masses, so
+    each bin keeps its mean exact mass.
+
+    Returns:
+        tuple: The pruned distribution of the combined group.
+    """
+    first_left, probabilities_left, weighted_left = left
+    first_right, probabilities_right, weighted_right = right
+    probabilities = np.convolve(probabilities_left, probabilities_right)
+    weighted = np.convolve(weighted_left, probabilities_right) + np.convolve(
+        probabilities_left, weighted_right
+    )
+    return _prune(first_left + first_right, probabilities, weighted, threshold)
+
+
+def _element_distribution(symbol, count, threshold):
+    """
+    Get the isotopic distribution of `count` atoms of an element.
+
+    The distribution is raised to the count by repeated squaring, pruning
+    after every step, so it takes a logarithmic number of small convolutions.
+
+    Returns:
+        tuple: The nominal mass of the first bin and the probabilities and weighted masses of each bin.
+    """
+    key = (symbol, count, threshold)
+    distribution = DISTRIBUTION_CACHE.get(key)
+    if distribution is not None:
+        return distribution
+    first, probabilities, weighted, _ = _element_isotopes(symbol)
+    power = (first, probabilities, weighted)
+    distribution = None
+    remaining = count
+    while remaining:
+        if remaining & 1:
+            distribution = (
+                power if distribution is None else _convolve(distribution, power, threshold)
+            )
+        remaining >>= 1
+        if remaining:
+            power = _convolve(power, power, threshold)
+    DISTRIBUTION_CACHE.put(key, distribution)
+    return distribution
+
+
+def isotopic_distribution(formula, threshold=DEFAULT_THRESHOLD):
+    """
+    Get the isotopic pattern of a formula, with one peak per nominal mass.
+
+    Args:
+        formula (str, dict, Formula, Element): The formula.
+        threshold (float, optional): The probability, relative to the most likely peak, below which peaks are dropped. Defaults to `DEFAULT_THRESHOLD`.
+
+    Returns:
+        tuple: Arrays of the mean exact mass and the probability of each peak, in order of mass. The probabilities sum to one, less the pruned tails.
+
+    Raises:
+        ValueError: If the formula is invalid or has an element without isotope data.
+
+    Examples:
+        >>> masses, probabilities = isotopic_distribution("CO2", threshold=1e-3)
+        >>> masses.round(4), probabilities.round(4)
+        (array([43.9898, 44.9932, 45.9941]), array([0.9845, 0.0114, 0.0041]))
+    """
+    distribution = None
+    for symbol, count in _integer_counts(formula).items():
+        element = _element_distribution(symbol, count, threshold)
+        distribution = (
+            element if distribution is None else _convolve(distribution, element, threshold)
+        )
+    if distribution is None:
+        return np.zeros(0), np.zeros(0)
+    _, probabilities, weighted = distribution
+    keep = probabilities > 0
+    return weighted[keep] / probabilities[keep], probabilities[keep]
+
+
+def isotopic_distributions(formulas, threshold=DEFAULT_THRESHOLD):
+    """
+    Get the isotopic patterns of many formulas (see `isotopic_distribution`).
+
+    Args:
+        formulas (iterable): The formulas.
+        threshold (float, optional): The relative probability below which peaks are dropped.
+
+    Returns:
+        list: A tuple of masses and probabilities for each formula, or None where the formula is invalid.
+    """
+    distributions = []
+    for formula in formulas:
+        try:
+            distributions.append(isotopic_distribution(formula, threshold))
+        except ValueError:
+            distributions.append(None)
+    return distributions
+
+
+def monoisotopic_masses(formulas):
+    """
+    Get the monoisotopic masses of many formulas at once.
+
+    Args:
+        formulas (str, iterable): A formula or an array, list or Series of formulas.
+
+    Returns:
+        numpy.ndarray: The monoisotopic masses, NaN where a formula is invalid or has an element without isotope data.
+    """
+    from .vectorized import ATOMIC_MASSES, _composition_matrix, _factorize
+
+    if isinstance(formulas, (str, Element, Formula)):
+        formulas = [formulas]
+    masses = np.full(len(ATOMIC_MASSES), np.nan)
+    for symbol, (_, _, _, mass) in _isotopes().items():
+        element = Element(symbol)
+        masses[element.number] = mass
+    uniques, codes = _factorize(formulas)
+    counts, invalid = _composition_matrix(uniques)
+    used = counts.any(axis=0)
+    invalid |= (counts[:, np.isnan(masses) & used] > 0).any(axis=1)
+    result = counts @ np.nan_to_num(masses)
+    result[invalid] = np.nan
+    return result[codes]
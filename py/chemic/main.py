@@ -1,20 +1,75 @@
 from commoner import *
-from .utils import validate_cas_number, parse_formula
+from .utils import is_cas_number, parse_formula
+from .cache import named_cache
+from .data import load_table, on_reload
 
-import pandas as pd
-import pydash
-import importlib.resources
+import struct
+import types
 
 
-PERIODIC_TABLE = pd.read_csv(
-    importlib.resources.open_text("chemic", "periodic_table.csv")
-)
-FORMULA_TABLE = pd.read_csv(
-    importlib.resources.open_text("chemic", "common_formulas.csv")
-)
 AVOGADRO = 6.02214076e23
 L_STP = 22.4
 
+# The tables and the indexes built from them are loaded on first access (see
+# `__getattr__`), so importing chemic does not pay for pandas or CSV parsing.
+_LAZY_TABLES = {
+    "PERIODIC_TABLE": "periodic_table",
+    "FORMULA_TABLE": "common_formulas",
+}
+_ELEMENT_REGISTRY_NAMES = (
+    "ELEMENTS_BY_SYMBOL",
+    "ELEMENTS_BY_NAME",
+    "ELEMENTS_BY_NUMBER",
+    "ELEMENTS_BY_MASS",
+    "ELEMENT_ALIASES",
+)
+_FORMULA_INDEX_NAMES = (
+    "FORMULA_NAMES",
+    "FORMULA_KEY_NAMES",
+    "CAS_NAMES",
+    "CAS_FORMULAS",
+    "NAME_FORMULAS",
+)
+_ELEMENT_REGISTRY = None
+_FORMULA_INDEX = None
+# Compound database paths found not to exist, so lookups that miss the formula
+# table do not check the filesystem again every time.
+_MISSING_DATABASES = set()
+
+# Each (atomic number, count) pair of a canonical key is packed as an unsigned
+# byte and an unsigned 32-bit integer.
+_KEY_PAIR = struct.Struct("<BI")
+# Keys of formulas with other counts (e.g. the 0.5 of "CaSO4·0.5H2O") start
+# with a byte that is never an atomic number, followed by pairs packed as an
+# unsigned byte and a double, so they cannot collide with integer keys.
+_OTHER_KEY = b"\xff"
+
+# Parsed formulas and their derived properties, including the canonical key
+# (filled in on first access), keyed by the stripped formula string. An entry
+# takes about 450 bytes. Use `FORMULA_CACHE.stats()`, `.clear()` and
+# `.resize()` to inspect or bound it; the default of 4096 entries can be set
+# with the CHEMIC_FORMULA_CACHE_SIZE environment variable.
+FORMULA_CACHE = named_cache("formula", "CHEMIC_FORMULA_CACHE_SIZE")
+
+
+@on_reload
+def _reset_tables():
+    global _ELEMENT_REGISTRY, _FORMULA_INDEX
+    _ELEMENT_REGISTRY = None
+    _FORMULA_INDEX = None
+    _MISSING_DATABASES.clear()
+    FORMULA_CACHE.clear()
+
+
+def __getattr__(name):
+    if name in _LAZY_TABLES:
+        return load_table(_LAZY_TABLES[name])
+    if name in _ELEMENT_REGISTRY_NAMES:
+        return _element_registry()[name]
+    if name in _FORMULA_INDEX_NAMES:
+        return _formula_index()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def reconstruct_formula(formula):
     """
@@ -56,12 +111,168 @@ def get_molar_mass(molecule):
     return molar_mass
 
 
+def hill_order(symbols):
+    """
+    Sort element symbols in Hill order: carbon first, then hydrogen, then the
+    rest alphabetically, or all alphabetically if there is no carbon.
+
+    Args:
+        symbols (iterable): The symbols.
+
+    Returns:
+        list: The symbols in Hill order.
+
+    Examples:
+        >>> hill_order(["O", "H", "C", "Cl"])
+        ['C', 'H', 'Cl', 'O']
+        >>> hill_order(["O", "H", "Na"])
+        ['H', 'Na', 'O']
+    """
+    symbols = set(symbols)
+    if "C" in symbols:
+        rest = sorted(symbol for symbol in symbols if symbol not in ("C", "H"))
+        return ["C"] + (["H"] if "H" in symbols else []) + rest
+    return sorted(symbols)
+
+
+def hill_formula(elements):
+    """
+    Write a dictionary of elements as a formula in Hill order, the canonical
+    form of a formula whatever order its elements were given in.
+
+    Args:
+        elements (dict): The number of atoms of each element, keyed by symbol.
+
+    Returns:
+        str: The formula, without elements with a count of zero.
+
+    Examples:
+        >>> hill_formula({"O": 1, "H": 2})
+        'H2O'
+    """
+    return reconstruct_formula(
+        {symbol: elements[symbol] for symbol in hill_order(elements) if elements[symbol]}
+    )
+
+
+def formula_key(elements):
+    """
+    Get the canonical key of a dictionary of elements.
+
+    The key is the (atomic number, count) pairs of the elements, sorted by
+    atomic number and packed into bytes, so it is the same for any order (and
+    any repetition) of the elements, compact, and fast to hash and compare. It
+    is what `Formula` equality, hashing and name lookup go by, the `key` of a
+    `CompactFormula` and the formula index of the compound database.
+
+    Args:
+        elements (dict): The number of atoms of each element, keyed by anything `Element` accepts.
+
+    Returns:
+        bytes: The key, e.g. b"\\x01\\x02\\x00\\x00\\x00\\x08\\x01\\x00\\x00\\x00" for both "H2O" and "OH2".
+
+    Raises:
+        ValueError: If an element is unknown.
+    """
+    by_symbol = _element_registry()["ELEMENTS_BY_SYMBOL"]
+    counts = {}
+    for element, count in elements.items():
+        found = by_symbol.get(element)
+        number = (Element(element) if found is None else found).number
+        counts[number] = counts.get(number, 0) + count
+    values = []
+    integral = True
+    for number in sorted(counts):
+        count = counts[number]
+        if count:
+            if type(count) is not int:
+                if count == int(count):
+                    count = int(count)
+                else:
+                    integral = False
+            if not 0 < count <= 0xFFFFFFFF:
+                integral = False
+            values += (number, count)
+    pairs = len(values) // 2
+    if integral:
+        return struct.pack("<" + "BI" * pairs, *values)
+    return _OTHER_KEY + struct.pack("<" + "Bd" * pairs, *values)
+
+
+def _build_formula_index():
+    """
+    Build the name lookup indexes from the formula table.
+
+    When several rows share a formula, CAS number or name, the first row wins,
+    matching the order the table was previously scanned in.
+
+    Returns:
+        dict: The indexes, keyed by their names in `_FORMULA_INDEX_NAMES`.
+    """
+    formula_names = {}
+    formula_key_names = {}
+    cas_names = {}
+    cas_formulas = {}
+    name_formulas = {}
+    for record in load_table("common_formulas").to_dict("records"):
+        formula, names, cas = record["Formula"], record["Names"], record["CAS"]
+        formula_names.setdefault(formula, names)
+        elements = parse_formula(formula)
+        if elements:
+            try:
+                formula_key_names.setdefault(formula_key(elements), names)
+            except ValueError:
+                pass
+        if isinstance(cas, str):
+            cas_names.setdefault(cas, names)
+            cas_formulas.setdefault(cas, formula)
+        for name in names.split("\n"):
+            name_formulas.setdefault(name.strip().lower(), formula)
+    return {
+        "FORMULA_NAMES": formula_names,
+        "FORMULA_KEY_NAMES": formula_key_names,
+        "CAS_NAMES": cas_names,
+        "CAS_FORMULAS": cas_formulas,
+        "NAME_FORMULAS": name_formulas,
+    }
+
+
+def _formula_index():
+    """
+    Get the formula table indexes, building them on first use.
+    """
+    global _FORMULA_INDEX
+    if _FORMULA_INDEX is None:
+        _FORMULA_INDEX = _build_formula_index()
+    return _FORMULA_INDEX
+
+
+def _database():
+    """
+    Get the compound database (see `chemic.database`), or None if it has not
+    been built. A missing database is remembered until the tables are reloaded.
+    """
+    from .database import compound_database, default_path
+
+    path = default_path()
+    if path in _MISSING_DATABASES:
+        return None
+    database = compound_database(path)
+    if database is None:
+        _MISSING_DATABASES.add(path)
+    return database
+
+
 def get_formula_name(formula, verbose=False):
     """
     Get the name of a molecule from its formula.
 
+    Formulas are matched exactly first and then regardless of element order,
+    so "OH2" resolves to the same entry as "H2O". Formulas missing from the
+    formula table are looked up in the compound database, if it has been built.
+
     Args:
-        formula (str): The formula of the molecule.
+        formula (str): The formula (or CAS number) of the molecule.
         verbose (bool, optional): Whether to print the process. Defaults to False.
 
     Returns:
@@ -69,30 +280,88 @@ def get_formula_name(formula, verbose=False):
     """
     if type(formula) != str:
         return None
-    if validate_cas_number(formula, False):
+    if is_cas_number(formula):
         if verbose:
             Shout.info("CAS number detected")
-        if formula in FORMULA_TABLE["CAS"].values:
-            return FORMULA_TABLE[FORMULA_TABLE["CAS"] == formula]["Names"].values[0]
-        else:
-            return None
+        names = _formula_index()["CAS_NAMES"].get(formula)
+        if names is None:
+            database = _database()
+            compound = database.by_cas(formula) if database is not None else None
+            return compound["name"] if compound is not None else None
+        return names
     else:
         if verbose:
             Shout.info("Formula detected")
-        if formula in FORMULA_TABLE["Formula"].values:
-            return (
-                FORMULA_TABLE[FORMULA_TABLE["Formula"] == formula]["Names"]
-                .values[0]
-                .split("\n")[0]
-            )
-        else:
-            return None
+        index = _formula_index()
+        names = index["FORMULA_NAMES"].get(formula)
+        if names is None:
+            elements = parse_formula(formula)
+            if not elements:
+                return None
+            try:
+                names = index["FORMULA_KEY_NAMES"].get(formula_key(elements))
+            except ValueError:
+                return None
+            if names is None:
+                database = _database()
+                compounds = database.by_formula(formula, limit=1) if database is not None else []
+                return compounds[0]["name"] if compounds else None
+        return names.split("\n")[0].strip()
+
+
+def get_formula_by_name(name):
+    """
+    Get the formula of a molecule from its name.
+
+    Names missing from the formula table are looked up in the compound
+    database, if it has been built.
+
+    Args:
+        name (str): The name (or any synonym) of the molecule, case-insensitive.
+
+    Returns:
+        str: The formula of the molecule, or None if the name is unknown.
+    """
+    if not isinstance(name, str):
+        return None
+    formula = _formula_index()["NAME_FORMULAS"].get(name.strip().lower())
+    if formula is None:
+        database = _database()
+        compounds = database.by_name(name, limit=1) if database is not None else []
+        return compounds[0]["formula"] if compounds else None
+    return formula
+
+
+def get_formula_by_cas(cas_number):
+    """
+    Get the formula of a molecule from its CAS number.
+
+    CAS numbers missing from the formula table are looked up in the compound
+    database, if it has been built.
+
+    Args:
+        cas_number (str): The CAS number of the molecule.
+
+    Returns:
+        str: The formula of the molecule, or None if the CAS number is unknown.
+    """
+    if not isinstance(cas_number, str):
+        return None
+    formula = _formula_index()["CAS_FORMULAS"].get(cas_number.strip())
+    if formula is None:
+        database = _database()
+        compound = database.by_cas(cas_number) if database is not None else None
+        return compound["formula"] if compound is not None else None
+    return formula
 
 
 class Element:
     """
     A class to represent an element.
 
+    Elements are immutable and interned: `Element("Fe")`, `Element("iron")` and
+    `Element(26)` all return the same shared instance from the element registry.
+
     Args:
         attribute (str, int): The attribute to use to initialize the element.
 
@@ -129,26 +398,38 @@ class Element:
         ...
     """
 
+    __slots__ = ("data", "symbol", "name", "number", "mass", "count")
+
+    def __new__(cls, attribute):
+        element = lookup_element(attribute)
+        if element is None:
+            raise ValueError(f"Invalid element: {attribute}")
+        return element
+
     def __init__(self, attribute):
-        if type(attribute) == str:
-            if attribute.isdigit():
-                attribute = int(attribute)
-            else:
-                attribute = attribute.capitalize()
-        attr_types = ["Symbol", "Element", "AtomicNumber", "AtomicMass"]
-        for attr_type in attr_types:
-            if attribute in PERIODIC_TABLE[attr_type].values:
-                self.data = PERIODIC_TABLE[
-                    PERIODIC_TABLE[attr_type] == attribute
-                ].to_dict("records")[0]
-                self.symbol = self.data["Symbol"]
-                self.name = self.data["Element"]
-                self.number = self.data["AtomicNumber"]
-                self.mass = self.data["AtomicMass"]
-                self.count = 1
-                break
-        else:
-            return None
+        # Instances are interned in the element registry and fully initialized
+        # when the registry is built, see `_build_element_registry`.
+        pass
+
+    @classmethod
+    def _from_record(cls, record):
+        element = object.__new__(cls)
+        object.__setattr__(element, "data", types.MappingProxyType(record))
+        object.__setattr__(element, "symbol", record["Symbol"])
+        object.__setattr__(element, "name", record["Element"])
+        object.__setattr__(element, "number", record["AtomicNumber"])
+        object.__setattr__(element, "mass", record["AtomicMass"])
+        object.__setattr__(element, "count", 1)
+        return element
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Element objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Element objects are immutable")
+
+    def __reduce__(self):
+        return (Element, (self.symbol,))
 
     def display(self):
         """
@@ -184,6 +465,8 @@ class Element:
         """
         Display the details of the element.
         """
+        import pydash
+
         for key in self.data:
             print(f"{pydash.separator_case(key, ' ').title()}: {self.data[key]}")
         return
@@ -275,15 +558,181 @@ class Element:
         return iter(self.data)
 
 
+def _build_element_registry():
+    """
+    Build the interned element registry from the periodic table.
+
+    Every element is constructed exactly once; `Element(...)` then resolves to
+    one of these shared instances with a dictionary lookup instead of scanning
+    the `PERIODIC_TABLE` table.
+
+    Returns:
+        dict: The registry indexes, keyed by their names in `_ELEMENT_REGISTRY_NAMES`.
+    """
+    registry = {name: {} for name in _ELEMENT_REGISTRY_NAMES}
+    for record in load_table("periodic_table").to_dict("records"):
+        element = Element._from_record(record)
+        registry["ELEMENTS_BY_SYMBOL"][element.symbol] = element
+        registry["ELEMENTS_BY_NAME"][element.name] = element
+        registry["ELEMENTS_BY_NUMBER"][element.number] = element
+        registry["ELEMENTS_BY_MASS"].setdefault(element.mass, element)
+        registry["ELEMENT_ALIASES"][element.symbol.lower()] = element
+        registry["ELEMENT_ALIASES"][element.name.lower()] = element
+    return registry
+
+
+def _element_registry():
+    """
+    Get the element registry, building it on first use.
+    """
+    global _ELEMENT_REGISTRY
+    if _ELEMENT_REGISTRY is None:
+        _ELEMENT_REGISTRY = _build_element_registry()
+    return _ELEMENT_REGISTRY
+
+
+def load_tables():
+    """
+    Load the data tables and build the element registry and formula indexes now
+    instead of on first use, e.g. before forking worker processes.
+    """
+    _element_registry()
+    _formula_index()
+
+
+def lookup_element(attribute):
+    """
+    Look up an element in the registry.
+
+    Args:
+        attribute (str, int, float, Element): The symbol, name, atomic number or atomic mass of the element.
+
+    Returns:
+        Element: The shared element instance, or None if no element matches.
+    """
+    if isinstance(attribute, Element):
+        return attribute
+    registry = _element_registry()
+    if isinstance(attribute, str):
+        if attribute.isdigit():
+            return registry["ELEMENTS_BY_NUMBER"].get(int(attribute))
+        for index in ("ELEMENTS_BY_SYMBOL", "ELEMENTS_BY_NAME"):
+            if attribute in registry[index]:
+                return registry[index][attribute]
+        return registry["ELEMENT_ALIASES"].get(attribute.lower())
+    try:
+        if attribute in registry["ELEMENTS_BY_NUMBER"]:
+            return registry["ELEMENTS_BY_NUMBER"][attribute]
+        return registry["ELEMENTS_BY_MASS"].get(attribute)
+    except TypeError:
+        return None
+
+
+def _formula_symbols(elements):
+    """
+    Key a dictionary of elements by symbol.
+
+    Args:
+        elements (dict): The number of atoms of each element, keyed by anything `Element` accepts.
+
+    Returns:
+        dict: The number of atoms of each element, keyed by symbol.
+    """
+    by_symbol = _element_registry()["ELEMENTS_BY_SYMBOL"]
+    return {
+        element if element in by_symbol else Element(element).symbol: num_atoms
+        for element, num_atoms in elements.items()
+    }
+
+
+def _formula_mass(symbols):
+    by_symbol = _element_registry()["ELEMENTS_BY_SYMBOL"]
+    mass = 0
+    for symbol, num_atoms in symbols.items():
+        mass += num_atoms * by_symbol[symbol].mass
+    return mass
+
+
+def _formula_name(symbols):
+    name = get_formula_name(reconstruct_formula(symbols))
+    if name == None:
+        if len(symbols) == 1:
+            return Element(next(iter(symbols))).name
+        return "Unknown"
+    return str(name).title()
+
+
+def _formula_counts(value):
+    """
+    Get the element counts of an operand of `Formula` arithmetic.
+
+    Args:
+        value (Formula, Element, str): The operand.
+
+    Returns:
+        dict: The number of atoms of each element, keyed by symbol, or None if the operand is not supported.
+    """
+    if isinstance(value, Formula):
+        return value.elements
+    if isinstance(value, Element):
+        return {value.symbol: 1}
+    if isinstance(value, str):
+        return Formula(value).elements
+    return None
+
+
+# Indices into a formula's properties list.
+_KEY, _MASS, _NAME, _COUNT = 0, 1, 2, 3
+
+
+def _cache_entry(formula):
+    """
+    Get the formula cache entry of a formula string, parsing it on a miss.
+
+    Args:
+        formula (str): The formula.
+
+    Returns:
+        tuple: The number of atoms of each element, keyed by symbol, and the list of memoized properties (indexed by `_KEY`, `_MASS`, `_NAME` and `_COUNT`).
+
+    Raises:
+        ValueError: If the formula is invalid.
+    """
+    if formula.isdigit():
+        raise ValueError("Invalid formula")
+    key = formula.strip()
+    entry = FORMULA_CACHE.get(key)
+    if entry is None:
+        elements = parse_formula(key)
+        if elements is None:
+            raise ValueError("Invalid formula")
+        entry = (_formula_symbols(elements), [None, None, None, None])
+        FORMULA_CACHE.put(key, entry)
+    return entry
+
+
 class Formula:
     """
     A class to represent a chemical formula.
 
+    The molar mass, name and atom count are computed on first access and then
+    memoized, so code that only needs the composition never pays for them.
+    Formulas parsed from the same string share these through the formula
+    cache, but each has its own `elements`, and changing them never affects
+    another formula.
+    Formulas can be added to and subtracted from each other (or elements and
+    formula strings) and multiplied by a number, which returns a new formula
+    with the molar mass updated incrementally. `+=`, `-=` and `*=` also return
+    a new formula, so a formula is never changed while it is hashed by its
+    canonical key in a set or dictionary.
+
     Args:
         elements (str, dict, Element): The elements in the formula.
 
     Attributes:
         elements (dict): The elements in the formula.
+        key (bytes): The canonical key of the formula (see `formula_key`).
+        canonical (str): The formula in Hill order (see `hill_formula`).
         mass (float): The molar mass of the formula.
         name (str): The name of the formula.
         count (int): The number of elements in the formula.
@@ -298,35 +747,83 @@ class Formula:
         18.015
         >>> print(Formula("H2O").name)
         Water
+        >>> print(Formula("CH2") * 3 + "H2O")
+        C3H8O
+        >>> Formula("OH2") == Formula("H2O"), Formula("OH2").canonical
+        (True, 'H2O')
     """
 
     def __init__(self, elements):
         if isinstance(elements, str):
-            if elements.isdigit():
-                raise ValueError("Invalid formula")
-            elements = parse_formula(elements.strip())
-        elif isinstance(elements, Element):
-            elements = {elements: 1}
+            entry = _cache_entry(elements)
+            symbols, properties = entry
         else:
-            if not isinstance(elements, dict):
-                return ValueError("Invalid formula")
-        self.elements = {
-            Element(element).symbol: elements[element] for element in elements
-        }
-        self.mass = get_molar_mass(self)
-        self.name = get_formula_name(reconstruct_formula(self.elements))
-        if self.name == None:
-            if len(self.elements) == 1:
-                element = list(self.elements.keys())[0]
-                if element in PERIODIC_TABLE["Symbol"].values:
-                    self.name = Element(element).name
+            if isinstance(elements, Element):
+                elements = {elements: 1}
+            elif not isinstance(elements, dict):
+                raise ValueError("Invalid formula")
+            symbols = _formula_symbols(elements)
+            properties = (None, None, None, None)
+            entry = None
+        # Each formula memoizes its properties in its own list, starting from
+        # those already computed for its cache entry (see `_memoize`).
+        self._entry = entry
+        self._properties = list(properties)
+        self.elements = dict(symbols)
+
+    def _memoize(self, index, value):
+        """
+        Store a computed property, and share it through the formula's cache
+        entry while the elements are still the ones that were parsed, so that
+        changing `elements` directly never affects other formulas.
+
+        Args:
+            index (int): The index of the property, e.g. `_MASS`.
+            value (any): The value of the property.
+
+        Returns:
+            any: The value.
+        """
+        self._properties[index] = value
+        entry = self._entry
+        if entry is not None:
+            if entry[0] == self.elements:
+                entry[1][index] = value
             else:
-                self.name = "Unknown"
-        else:
-            self.name = str(self.name).title()
-        self.count = 0
-        for element in self.elements:
-            self.count += self.elements[element]
+                self._entry = None
+        return value
+
+    @property
+    def key(self):
+        key = self._properties[_KEY]
+        if key is None:
+            key = self._memoize(_KEY, formula_key(self.elements))
+        return key
+
+    @property
+    def canonical(self):
+        return hill_formula(self.elements)
+
+    @property
+    def mass(self):
+        mass = self._properties[_MASS]
+        if mass is None:
+            mass = self._memoize(_MASS, _formula_mass(self.elements))
+        return mass
+
+    @property
+    def name(self):
+        name = self._properties[_NAME]
+        if name is None:
+            name = self._memoize(_NAME, _formula_name(self.elements))
+        return name
+
+    @property
+    def count(self):
+        count = self._properties[_COUNT]
+        if count is None:
+            count = self._memoize(_COUNT, sum(self.elements.values()))
+        return count
 
     def __str__(self):
         return reconstruct_formula(self.elements)
@@ -336,43 +833,105 @@ class Formula:
 
     def __eq__(self, other):
         if isinstance(other, Formula):
-            return self.elements == other.elements
-        return False
+            # Equal dictionaries are the common case and need no key; otherwise
+            # the keys also match formulas that differ only by zero counts.
+            return self.elements == other.elements or self.key == other.key
+        # Let the other operand decide, e.g. a `CompactFormula` compares keys.
+        return NotImplemented
 
     def __ne__(self, other):
-        return not self.__eq__(other)
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def _copy(self):
+        formula = object.__new__(Formula)
+        formula.elements = dict(self.elements)
+        formula._entry = None
+        formula._properties = list(self._properties)
+        return formula
+
+    def _update(self, counts, factor=1):
+        """
+        Add `factor` times a dictionary of element counts to the formula in place.
+
+        The molar mass and atom count are updated by the change in each count
+        rather than recomputed, and the name is looked up again on next access.
+
+        Args:
+            counts (dict): The number of atoms of each element, keyed by symbol.
+            factor (int, float, optional): The multiple of `counts` to add. Defaults to 1.
+
+        Raises:
+            ValueError: If the result would have a negative count.
+        """
+        elements = self.elements
+        for symbol, num_atoms in counts.items():
+            if elements.get(symbol, 0) + num_atoms * factor < 0:
+                raise ValueError(f"Cannot subtract more {symbol} than the formula contains")
+        by_symbol = _element_registry()["ELEMENTS_BY_SYMBOL"]
+        _, mass, _, count = self._properties
+        for symbol, num_atoms in counts.items():
+            delta = num_atoms * factor
+            total = elements.get(symbol, 0) + delta
+            if total:
+                elements[symbol] = total
+            else:
+                elements.pop(symbol, None)
+            if mass is not None:
+                mass += delta * by_symbol[symbol].mass
+            if count is not None:
+                count += delta
+        self._entry = None
+        self._properties = [None, mass, None, count]
+
+    def _scale(self, factor):
+        if isinstance(factor, bool) or not isinstance(factor, (int, float)):
+            return False
+        if factor < 0:
+            raise ValueError("Cannot multiply a formula by a negative number")
+        elements = self.elements
+        for symbol in list(elements):
+            if factor:
+                elements[symbol] *= factor
+            else:
+                del elements[symbol]
+        _, mass, _, count = self._properties
+        self._entry = None
+        self._properties = [
+            None,
+            None if mass is None else mass * factor,
+            None,
+            None if count is None else count * factor,
+        ]
+        return True
 
     def __add__(self, other):
-        if isinstance(other, Formula):
-            return Formula({**self.elements, **other.elements})
-        elif isinstance(other, Element):
-            for element in self.elements:
-                if element == other:
-                    return Formula(
-                        {**self.elements, **{element: self.elements[element] + 1}}
-                    )
-            return Formula({**self.elements, **{other: 1}})
-        return NotImplemented
+        counts = _formula_counts(other)
+        if counts is None:
+            return NotImplemented
+        formula = self._copy()
+        formula._update(counts)
+        return formula
+
+    def __radd__(self, other):
+        return self.__add__(other)
 
     def __sub__(self, other):
-        if isinstance(other, Formula):
-            return Formula(
-                {
-                    **self.elements,
-                    **{
-                        element: -1 * other.elements[element]
-                        for element in other.elements
-                    },
-                }
-            )
-        elif isinstance(other, Element):
-            for element in self.elements:
-                if element == other:
-                    return Formula(
-                        {**self.elements, **{element: self.elements[element] - 1}}
-                    )
-            return ValueError("Cannot subtract element not in formula")
-        return NotImplemented
+        counts = _formula_counts(other)
+        if counts is None:
+            return NotImplemented
+        formula = self._copy()
+        formula._update(counts, -1)
+        return formula
+
+    def __mul__(self, other):
+        formula = self._copy()
+        if not formula._scale(other):
+            return NotImplemented
+        return formula
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
 
     def __lt__(self, other):
         return self.mass < other.mass
@@ -387,7 +946,7 @@ class Formula:
         return self.mass >= other.mass
 
     def __hash__(self):
-        return hash(self.elements)
+        return hash(self.key)
 
     def __len__(self):
         return len(self.elements)
@@ -447,10 +1006,10 @@ def mass_to_moles(molecule, mass):
     Returns:
         float: The moles.
     """
+    if isinstance(molecule, str):
+        molecule = Formula(molecule)
     if isinstance(molecule, Element) or isinstance(molecule, Formula):
         return mass / molecule.mass
-    elif isinstance(molecule, str):
-        return mass / Formula(molecule).mass
     return None
 
 
@@ -465,10 +1024,10 @@ def moles_to_mass(molecule, moles):
     Returns:
         float: The mass.
     """
+    if isinstance(molecule, str):
+        molecule = Formula(molecule)
     if isinstance(molecule, Element) or isinstance(molecule, Formula):
         return moles * molecule.mass
-    elif isinstance(molecule, str):
-        return moles * Formula(molecule).mass
     return None
 
 
@@ -483,10 +1042,10 @@ def mass_to_atoms(molecule, mass):
     Returns:
         float: The atoms.
     """
+    if isinstance(molecule, str):
+        molecule = Formula(molecule)
     if isinstance(molecule, Element) or isinstance(molecule, Formula):
         return mass / molecule.mass * AVOGADRO * molecule.count
-    elif isinstance(molecule, str):
-        return mass / Formula(molecule).mass * AVOGADRO * Formula(molecule).count
     return None
 
 
@@ -501,10 +1060,10 @@ def atoms_to_mass(molecule, atoms):
     Returns:
         float: The mass.
     """
+    if isinstance(molecule, str):
+        molecule = Formula(molecule)
     if isinstance(molecule, Element) or isinstance(molecule, Formula):
         return atoms / AVOGADRO * molecule.mass
-    elif isinstance(molecule, str):
-        return atoms / AVOGADRO * Formula(molecule).mass
     return None
 
 
@@ -519,10 +1078,10 @@ def mass_to_particles(molecule, mass):
     Returns:
         float: The particles.
     """
+    if isinstance(molecule, str):
+        molecule = Formula(molecule)
     if isinstance(molecule, Element) or isinstance(molecule, Formula):
         return mass / molecule.mass * AVOGADRO
-    elif isinstance(molecule, str):
-        return mass / Formula(molecule).mass * AVOGADRO
     return None
 
 
@@ -537,10 +1096,10 @@ def particles_to_mass(molecule, particles):
     Returns:
         float: The mass.
     """
+    if isinstance(molecule, str):
+        molecule = Formula(molecule)
     if isinstance(molecule, Element) or isinstance(molecule, Formula):
         return particles / AVOGADRO * molecule.mass
-    elif isinstance(molecule, str):
-        return particles / AVOGADRO * Formula(molecule).mass
     return None
 
 
@@ -555,10 +1114,10 @@ def moles_to_atoms(molecule, moles):
     Returns:
         float: The atoms.
     """
+    if isinstance(molecule, str):
+        molecule = Formula(molecule)
     if isinstance(molecule, Element) or isinstance(molecule, Formula):
         return moles * AVOGADRO * molecule.count
-    elif isinstance(molecule, str):
-        return moles * AVOGADRO * Formula(molecule).count
     return None
 
 
@@ -573,10 +1132,10 @@ def atoms_to_moles(molecule, atoms):
     Returns:
         float: The moles.
     """
+    if isinstance(molecule, str):
+        molecule = Formula(molecule)
     if isinstance(molecule, Element) or isinstance(molecule, Formula):
         return atoms / AVOGADRO / molecule.count
-    elif isinstance(molecule, str):
-        return atoms / AVOGADRO / Formula(molecule).count
     return None
 
 
@@ -0,0 +1,295 @@
+from .data import load_table
+
+import bisect
+import csv
+import difflib
+import json
+import re
+import numpy as np
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+# How many trigram matches per requested result are re-ranked by shared letters.
+_RERANK = 4
+
+
+def normalize_name(name):
+    """
+    Normalize a compound name for searching.
+
+    Args:
+        name (str): The name.
+
+    Returns:
+        str: The name in lower case with runs of whitespace collapsed.
+    """
+    return _WHITESPACE.sub(" ", name.strip().lower())
+
+
+def trigrams(name):
+    """
+    Get the trigrams of a normalized name.
+
+    The name is padded with two spaces in front and one behind, so its first
+    letters form trigrams of their own and a prefix of a name shares all of its
+    leading trigrams with the name.
+
+    Args:
+        name (str): The normalized name.
+
+    Returns:
+        set: The trigrams.
+
+    Examples:
+        >>> sorted(trigrams("co2"))
+        ['  c', ' co', 'co2', 'o2 ']
+    """
+    padded = f"  {name} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    A typo-tolerant index of compound names and synonyms, for looking up
+    formulas by name and for autocompletion.
+
+    Prefix completion is a binary search over the sorted names. Fuzzy search
+    counts the trigrams every name shares with the query in one NumPy
+    `bincount` over the postings of the query's trigrams, and only scores the
+    names sharing enough of them to reach the threshold.
+
+    Args:
+        entries (iterable, optional): (name, formula) pairs to index.
+
+    Examples:
+        >>> index = NameIndex.from_table()
+        >>> index.search("glucsoe", limit=1)
+        [('glucose', 'C6H12O6', 0.667)]
+        >>> index.complete("sodium chl", limit=2)
+        [('sodium chlorate', 'NaClO3'), ('sodium chloride', 'NaCl')]
+    """
+
+    def __init__(self, entries=()):
+        self._names = []
+        self._formulas = []
+        self._keys = []
+        self._sizes = []
+        self._seen = set()
+        self._postings = {}
+        self._sorted = None
+        self._arrays = None
+        for name, formula in entries:
+            self.add(name, formula)
+
+    @classmethod
+    def from_table(cls):
+        """
+        Index every synonym in the bundled formula table.
+
+        Returns:
+            NameIndex: The index.
+        """
+        index = cls()
+        for record in load_table("common_formulas").to_dict("records"):
+            for name in record["Names"].split("\n"):
+                index.add(name, record["Formula"])
+        return index
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Index the names in a file of compounds.
+
+        Args:
+            path (str): A CSV file with "Formula" and newline-separated "Names" columns (like `utils/lib/data/formulae.csv`), a headerless tab-separated file of names, formulas and CAS numbers (like `utils/fetch/species.txt`), or a JSON Lines file of records scraped by `utils/fetch` (see `add_records`).
+
+        Returns:
+            NameIndex: The index.
+        """
+        index = cls()
+        with open(path, newline="", encoding="utf-8") as file:
+            if str(path).endswith(".csv"):
+                for row in csv.DictReader(file):
+                    for name in (row.get("Names") or "").split("\n"):
+                        index.add(name, row["Formula"])
+            elif str(path).endswith(".jsonl"):
+                index.add_records(json.loads(line) for line in file if line.strip())
+            else:
+                for row in csv.reader(file, delimiter="\t"):
+                    if len(row) >= 2:
+                        index.add(row[0], row[1])
+        return index
+
+    def add(self, name, formula):
+        """
+        Add a name to the index.
+
+        Args:
+            name (str): The name. Names that are empty or already indexed for the formula are skipped.
+            formula (str): The formula the name refers to. Names without a formula are skipped.
+        """
+        if not isinstance(name, str) or not formula:
+            return
+        key = normalize_name(name)
+        if not key or (key, formula) in self._seen:
+            return
+        self._seen.add((key, formula))
+        entry = len(self._names)
+        self._names.append(name.strip())
+        self._formulas.append(formula)
+        self._keys.append(key)
+        grams = trigrams(key)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(entry)
+        self._sorted = None
+        self._arrays = None
+
+    def add_records(self, records):
+        """
+        Add the names of records scraped from the NIST Chemistry WebBook.
+
+        Args:
+            records (iterable): Dictionaries with a "formula", a "name" and optionally a list of "other_names", as produced by `utils/fetch`.
+        """
+        for record in records:
+            formula = record.get("formula")
+            if not isinstance(formula, str) or not formula:
+                continue
+            self.add(record.get("name"), formula)
+            for name in record.get("other_names") or ():
+                self.add(name, formula)
+
+    def __len__(self):
+        return len(self._names)
+
+    def _prepare(self):
+        if self._sorted is None:
+            order = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+            self._sorted = ([self._keys[entry] for entry in order], np.asarray(order))
+        if self._arrays is None:
+            self._arrays = (
+                {gram: np.asarray(entries, dtype=np.int32) for gram, entries in self._postings.items()},
+                np.asarray(self._sizes),
+                np.asarray([len(key) for key in self._keys]),
+            )
+
+    def complete(self, prefix, limit=10):
+        """
+        Complete a partial name, for autocompletion.
+
+        Names starting with the prefix come first, shortest first. If there are
+        fewer than `limit` of them, the rest are filled in from `search`, so
+        typos in the prefix still give suggestions.
+
+        Args:
+            prefix (str): The start of a name.
+            limit (int, optional): The most suggestions to return. Defaults to 10.
+
+        Returns:
+            list: The (name, formula) of each suggestion.
+        """
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        self._prepare()
+        keys, order = self._sorted
+        start = bisect.bisect_left(keys, key)
+        stop = bisect.bisect_left(keys, key + "￿", lo=start)
+        entries = order[start:stop]
+        # A stable sort by length keeps names of the same length alphabetical.
+        entries = entries[np.argsort(self._arrays[2][entries], kind="stable")[:limit]]
+        suggestions = [(self._names[entry], self._formulas[entry]) for entry in entries]
+        if len(suggestions) < limit:
+            seen = set(suggestions)
+            for name, formula, _ in self.search(prefix, limit=limit, prefix=True):
+                if (name, formula) not in seen:
+                    suggestions.append((name, formula))
+                    if len(suggestions) == limit:
+                        break
+        return suggestions
+
+    def search(self, query, limit=10, threshold=0.3, prefix=False):
+        """
+        Find the names most similar to a query, tolerating typos.
+
+        Names are scored by the trigrams they share with the query over the
+        trigrams of both (or, with `prefix`, over the trigrams of the query
+        alone, so that a partly typed name matches the whole name). The best of
+        those are ranked by the mean of that score and the share of letters
+        they have in common, in any order.
+
+        Args:
+            query (str): The name to search for.
+            limit (int, optional): The most results to return. Defaults to 10.
+            threshold (float, optional): The lowest trigram score (from 0 to 1) to consider. Defaults to 0.3.
+            prefix (bool, optional): Whether the query may be the start of a name. Defaults to False.
+
+        Returns:
+            list: The (name, formula, score) of each result, best first.
+        """
+        key = normalize_name(query)
+        if not key or not self._names:
+            return []
+        self._prepare()
+        postings, sizes, lengths = self._arrays
+        grams = trigrams(key)
+        if prefix:
+            grams.discard(f"{key[-2:]} ")
+        matched = [postings[gram] for gram in grams if gram in postings]
+        if not matched:
+            return []
+        shared = np.bincount(np.concatenate(matched), minlength=len(self._names))
+        # A name can score at most its shared trigrams over the query's, so
+        # names sharing too few trigrams are dropped before scoring.
+        candidates = np.flatnonzero(shared >= max(threshold * len(grams), 1))
+        shared = shared[candidates]
+        if prefix:
+            scores = shared / len(grams)
+        else:
+            scores = shared / (len(grams) + sizes[candidates] - shared)
+        keep = scores >= threshold
+        candidates, scores = candidates[keep], scores[keep]
+        if not len(candidates):
+            return []
+        # Take the best by trigrams (shortest first on ties), then order those
+        # by also counting the letters they share in any order, which forgives
+        # transposed letters that break several trigrams at once.
+        best = np.lexsort((lengths[candidates], -scores))[: limit * _RERANK]
+        results = []
+        for rank in best:
+            entry = candidates[rank]
+            target = self._keys[entry][: len(key)] if prefix else self._keys[entry]
+            similarity = difflib.SequenceMatcher(None, key, target).quick_ratio()
+            results.append(
+                (
+                    round((float(scores[rank]) + similarity) / 2, 3),
+                    self._names[entry],
+                    self._formulas[entry],
+                )
+            )
+        results.sort(key=lambda result: -result[0])
+        return [(name, formula, score) for score, name, formula in results[:limit]]
+
+    def lookup(self, name, exact=False):
+        """
+        Get the formula for a name, allowing typos.
+
+        Args:
+            name (str): The name.
+            exact (bool, optional): Whether to only match the name itself, ignoring case and whitespace. Defaults to False.
+
+        Returns:
+            str: The formula of the best match, or None if nothing is similar enough.
+        """
+        if exact:
+            key = normalize_name(name)
+            self._prepare()
+            keys, order = self._sorted
+            position = bisect.bisect_left(keys, key)
+            if key and position < len(keys) and keys[position] == key:
+                return self._formulas[order[position]]
+            return None
+        results = self.search(name, limit=1)
+        return results[0][1] if results else None
@@ -0,0 +1,395 @@
+from .cache import named_cache
+from .data import on_reload
+from .main import lookup_element
+from .utils import parse_formula
+
+import math
+import re
+
+
+_ARROW = re.compile(r"\s*(?:<=>|<->|<=|->|=>|→|⟶|⇌|⇄|=)\s*")
+_SEPARATOR = re.compile(r"\s+\+\s+|(?<=[^\s+\-])\+(?=[^\s+\-0-9])")
+_COEFFICIENT = re.compile(r"^(\d+)\s*(?=[A-Za-z(\[{])")
+_STATE = re.compile(r"\s*\((?:s|l|g|aq)\)\s*$")
+_ELECTRONS = ("e", "e-", "e−")
+
+# Parsed species, keyed by the species string. Batches of reactions share most
+# of their species (O2, H2O, CO2, ...), so each is usually parsed only once. An
+# entry takes about 350 bytes; the default of 4096 entries can be set with
+# CHEMIC_SPECIES_CACHE_SIZE.
+SPECIES_CACHE = named_cache("species", "CHEMIC_SPECIES_CACHE_SIZE")
+
+
+@on_reload
+def _reset_species():
+    SPECIES_CACHE.clear()
+
+
+def parse_species(species):
+    """
+    Parse a species of a reaction into element counts and a charge.
+
+    A leading coefficient ("2H2O") and a trailing state ("(aq)") are ignored,
+    and "e-" is read as an electron. Charges are read with `strict_ion` (see
+    `chemic.utils.parse_charge`), so "Fe3+" is Fe with a charge of +3 and
+    "[Fe(CN)6]4-" has a charge of -4.
+
+    Args:
+        species (str): The species, e.g. "Fe2O3", "MnO4-", "Cu 2+" or "Fe3+".
+
+    Returns:
+        tuple: The number of atoms of each element, keyed by symbol, and the net charge.
+
+    Raises:
+        ValueError: If the species is not a valid formula.
+    """
+    elements, charge = _parse_species(species)
+    return dict(elements), charge
+
+
+def _parse_species(species):
+    parsed = SPECIES_CACHE.get(species)
+    if parsed is None:
+        parsed = _read_species(species)
+        SPECIES_CACHE.put(species, parsed)
+    return parsed
+
+
+def _read_species(species):
+    species = _COEFFICIENT.sub("", _STATE.sub("", species.strip()))
+    if species in _ELECTRONS:
+        return {}, -1
+    parsed = parse_formula(species, charge=True, strict_ion=True)
+    if parsed is None or not parsed[0]:
+        raise ValueError(f"Invalid species: {species}")
+    elements, charge = parsed
+    for symbol, count in elements.items():
+        if lookup_element(symbol) is None or count != int(count):
+            raise ValueError(f"Invalid species: {species}")
+    return elements, charge
+
+
+def parse_reaction(equation):
+    """
+    Split a reaction into its reactants and products.
+
+    Args:
+        equation (str): The reaction, e.g. "Fe + O2 -> Fe2O3". Species are separated by "+" and the sides by "->", "=>", "=", "<->", "<=>" or an arrow character.
+
+    Returns:
+        tuple: The reactants and the products, each a tuple of species strings.
+
+    Raises:
+        ValueError: If the reaction does not have exactly two sides.
+    """
+    sides = _ARROW.split(equation.strip())
+    if len(sides) != 2 or not all(sides):
+        raise ValueError(f"Invalid reaction: {equation}")
+    reactants, products = (
+        tuple(
+            _COEFFICIENT.sub("", species.strip())
+            for species in _SEPARATOR.split(side)
+        )
+        for side in sides
+    )
+    if not all(reactants) or not all(products):
+        raise ValueError(f"Invalid reaction: {equation}")
+    return reactants, products
+
+
+def composition_matrix(reactants, products):
+    """
+    Build the element-by-species matrix of a reaction.
+
+    Reactant columns are positive and product columns negative, so a vector of
+    coefficients balances the reaction exactly when the matrix times it is
+    zero. If any species is charged, the last row holds the charges.
+
+    Args:
+        reactants (list): The reactant species.
+        products (list): The product species.
+
+    Returns:
+        list: The rows of the matrix, as lists of integers.
+    """
+    columns = []
+    for sign, side in ((1, reactants), (-1, products)):
+        for species in side:
+            elements, charge = _parse_species(species)
+            columns.append((sign, elements, charge))
+    rows = {}
+    for index, (sign, elements, _) in enumerate(columns):
+        for symbol, count in elements.items():
+            if symbol not in rows:
+                rows[symbol] = [0] * len(columns)
+            rows[symbol][index] += sign * int(count)
+    matrix = list(rows.values())
+    if any(charge for _, _, charge in columns):
+        matrix.append([sign * charge for sign, _, charge in columns])
+    return matrix
+
+
+def _row_reduce(matrix, width):
+    """
+    Reduce an integer matrix to row echelon form without fractions.
+
+    Each elimination step cross-multiplies rows and divides out the row's
+    greatest common divisor, so entries stay small integers.
+
+    Args:
+        matrix (list): The rows of the matrix, modified in place.
+        width (int): The number of columns.
+
+    Returns:
+        list: The (row, column) of each pivot.
+    """
+    pivots = []
+    row = 0
+    for column in range(width):
+        pivot = None
+        for candidate in range(row, len(matrix)):
+            if matrix[candidate][column]:
+                pivot = candidate
+                break
+        if pivot is None:
+            continue
+        matrix[row], matrix[pivot] = matrix[pivot], matrix[row]
+        pivot_row = matrix[row]
+        pivot_value = pivot_row[column]
+        for other in range(len(matrix)):
+            value = matrix[other][column]
+            if other == row or not value:
+                continue
+            reduced = [
+                entry * pivot_value - pivot_entry * value
+                for entry, pivot_entry in zip(matrix[other], pivot_row)
+            ]
+            divisor = math.gcd(*reduced)
+            matrix[other] = [entry // divisor for entry in reduced] if divisor > 1 else reduced
+        pivots.append((row, column))
+        row += 1
+        if row == len(matrix):
+            break
+    return pivots
+
+
+def _solution(matrix, pivots, width, free_values):
+    """
+    Solve for the pivot variables given values for the free variables.
+
+    Returns:
+        list: The smallest integer solution, or None if it is all zeros.
+    """
+    scale = 1
+    for row, column in pivots:
+        scale = math.lcm(scale, abs(matrix[row][column]))
+    solution = [scale * free_values.get(column, 0) for column in range(width)]
+    for row, column in pivots:
+        values = matrix[row]
+        total = sum(values[free] * value for free, value in free_values.items())
+        solution[column] = -total * scale // values[column]
+    divisor = math.gcd(*solution)
+    if not divisor:
+        return None
+    if sum(solution) < 0:
+        divisor = -divisor
+    return [value // divisor for value in solution]
+
+
+def nullspace(matrix, width):
+    """
+    Compute an integer basis of the nullspace of an integer matrix.
+
+    Args:
+        matrix (list): The rows of the matrix.
+        width (int): The number of columns.
+
+    Returns:
+        list: The basis vectors, one per free column, as lists of integers with no common factor.
+    """
+    matrix = [list(row) for row in matrix]
+    pivots = _row_reduce(matrix, width)
+    pivot_columns = {column for _, column in pivots}
+    return [
+        _solution(matrix, pivots, width, {free: 1})
+        for free in range(width)
+        if free not in pivot_columns
+    ]
+
+
+class Reaction:
+    """
+    A class to represent a chemical reaction.
+
+    Args:
+        reactants (str, list): The reaction (e.g. "Fe + O2 -> Fe2O3"), or the reactant species.
+        products (list, optional): The product species, if `reactants` is not a whole reaction.
+        coefficients (list, optional): The coefficient of each reactant and then each product. Defaults to 1 for every species.
+
+    Attributes:
+        reactants (tuple): The reactant species.
+        products (tuple): The product species.
+        coefficients (tuple): The coefficient of each reactant and then each product.
+
+    Examples:
+        >>> print(Reaction("Fe + O2 -> Fe2O3").balance())
+        4Fe + 3O2 -> 2Fe2O3
+        >>> Reaction("Fe + O2 -> Fe2O3").balance().coefficients
+        (4, 3, 2)
+    """
+
+    def __init__(self, reactants, products=None, coefficients=None):
+        if isinstance(reactants, str):
+            if products is not None:
+                raise ValueError("Products must not be given with a whole reaction")
+            reactants, products = parse_reaction(reactants)
+        elif products is None:
+            raise ValueError("Products are required")
+        self.reactants = tuple(reactants)
+        self.products = tuple(products)
+        species = len(self.reactants) + len(self.products)
+        if coefficients is None:
+            coefficients = (1,) * species
+        elif len(coefficients) != species:
+            raise ValueError("There must be one coefficient per species")
+        self.coefficients = tuple(coefficients)
+
+    @property
+    def species(self):
+        return self.reactants + self.products
+
+    @property
+    def reactant_coefficients(self):
+        return self.coefficients[: len(self.reactants)]
+
+    @property
+    def product_coefficients(self):
+        return self.coefficients[len(self.reactants) :]
+
+    def matrix(self):
+        """
+        Get the element-by-species matrix of the reaction (see `composition_matrix`).
+
+        Returns:
+            list: The rows of the matrix.
+        """
+        return composition_matrix(self.reactants, self.products)
+
+    def is_balanced(self):
+        """
+        Check whether the reaction conserves every element and the charge.
+
+        Returns:
+            bool: True if the reaction is balanced, False otherwise.
+        """
+        return all(
+            sum(entry * coefficient for entry, coefficient in zip(row, self.coefficients)) == 0
+            for row in self.matrix()
+        )
+
+    def solutions(self):
+        """
+        Get the independent ways of balancing the reaction.
+
+        Returns:
+            list: A basis of the balancing coefficients, as tuples of integers (which may be zero or negative). Empty if the reaction cannot be balanced, and longer than one if the reaction is a combination of independent reactions.
+        """
+        width = len(self.reactants) + len(self.products)
+        return [tuple(vector) for vector in nullspace(self.matrix(), width)]
+
+    def balance(self):
+        """
+        Balance the reaction with the smallest whole-number coefficients.
+
+        The coefficients are found from the exact integer nullspace of the
+        composition matrix. If the reaction has several independent
+        solutions, every free coefficient is set to one.
+
+        Returns:
+            Reaction: The balanced reaction.
+
+        Raises:
+            ValueError: If the reaction cannot be balanced with positive coefficients.
+        """
+        width = len(self.reactants) + len(self.products)
+        matrix = self.matrix()
+        pivots = _row_reduce(matrix, width)
+        pivot_columns = {column for _, column in pivots}
+        free_values = {column: 1 for column in range(width) if column not in pivot_columns}
+        if not free_values:
+            raise ValueError(f"Reaction cannot be balanced: {self}")
+        coefficients = _solution(matrix, pivots, width, free_values)
+        if coefficients is None or min(coefficients) <= 0:
+            raise ValueError(f"Reaction cannot be balanced: {self}")
+        return Reaction(self.reactants, self.products, coefficients)
+
+    def __str__(self):
+        sides = []
+        for species, coefficients in (
+            (self.reactants, self.reactant_coefficients),
+            (self.products, self.product_coefficients),
+        ):
+            sides.append(
+                " + ".join(
+                    f"{coefficient if coefficient != 1 else ''}{item}"
+                    for item, coefficient in zip(species, coefficients)
+                )
+            )
+        return " -> ".join(sides)
+
+    def __repr__(self):
+        return f"Reaction({str(self)!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, Reaction):
+            return (
+                self.reactants == other.reactants
+                and self.products == other.products
+                and self.coefficients == other.coefficients
+            )
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.reactants, self.products, self.coefficients))
+
+
+def balance(equation):
+    """
+    Balance a reaction.
+
+    Args:
+        equation (str): The reaction, e.g. "Fe + O2 -> Fe2O3".
+
+    Returns:
+        Reaction: The balanced reaction.
+
+    Raises:
+        ValueError: If the reaction is invalid or cannot be balanced.
+
+    Examples:
+        >>> print(balance("MnO4- + Fe 2+ + H+ -> Mn 2+ + Fe 3+ + H2O"))
+        MnO4- + 5Fe 2+ + 8H+ -> Mn 2+ + 5Fe 3+ + 4H2O
+    """
+    return Reaction(equation).balance()
+
+
+def balance_many(equations):
+    """
+    Balance many reactions.
+
+    Args:
+        equations (iterable): The reactions.
+
+    Returns:
+        list: The balanced reactions, with None for each reaction that is invalid or cannot be balanced.
+    """
+    balanced = []
+    for equation in equations:
+        try:
+            balanced.append(Reaction(equation).balance())
+        except ValueError:
+            balanced.append(None)
+    return balanced
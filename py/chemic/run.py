@@ -1,17 +1,21 @@
 from commoner import *
 from .main import *
 from .utils import *
+from .data import load_table
 
 import string
 
 from typing import Dict
-from nicegui import ui
 
 
 def gui():
     """
     Start the GUI.
     """
+    from nicegui import ui
+
+    from .names import NameIndex
+
     GITHUB_BUTTON = """<a href="https://github.com/uncenter/chemic" target"_blank" type="button" class="text-white bg-[#24292F] font-medium rounded-lg text-sm px-5 py-2.5 text-center inline-flex items-center mr-2 mb-2 mt-3 mb-5">
     <svg class="w-4 h-4 mr-2 -ml-1" aria-hidden="true" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24.774" width="24" height="24.774"><path fill="currentColor" d="M8.027 19.229c0 .097-.111.174-.252.174-.16.015-.271-.063-.271-.174 0-.097.111-.174.252-.174.145-.015.271.063.271.174zm-1.505-.218c-.034.097.063.208.208.237.126.048.271 0 .3-.097s-.063-.208-.208-.252c-.126-.034-.266.015-.3.111zm2.139-.082c-.14.034-.237.126-.223.237.015.097.14.16.285.126.14-.034.237-.126.223-.223-.015-.092-.145-.155-.285-.14zM11.845.387C5.134.387 0 5.482 0 12.194c0 5.366 3.377 9.958 8.202 11.574.619.111.837-.271.837-.585 0-.3-.015-1.955-.015-2.971 0 0-3.387.726-4.098-1.442 0 0-.552-1.408-1.345-1.771 0 0-1.108-.76.077-.745 0 0 1.205.097 1.868 1.248 1.06 1.868 2.835 1.331 3.527 1.011.111-.774.426-1.311.774-1.631-2.705-.3-5.434-.692-5.434-5.347 0-1.331.368-1.998 1.142-2.85-.126-.315-.537-1.611.126-3.285C6.672 5.085 9 6.706 9 6.706c.968-.271 2.008-.411 3.039-.411s2.071.14 3.039.411c0 0 2.327-1.626 3.339-1.306.663 1.679.252 2.971.126 3.285.774.856 1.248 1.524 1.248 2.85 0 4.669-2.85 5.042-5.555 5.347.445.382.823 1.108.823 2.245 0 1.631-.015 3.648-.015 4.045 0 .315.223.697.837.585C20.719 22.152 24 17.56 24 12.194 24 5.482 18.556.387 11.845.387zM4.703 17.076c-.063.048-.048.16.034.252.077.077.189.111.252.048.063-.048.048-.16-.034-.252-.077-.077-.189-.111-.252-.048zm-.523-.392c-.034.063.015.14.111.189.077.048.174.034.208-.034.034-.063-.015-.14-.111-.189-.097-.029-.174-.015-.208.034zm1.568 1.723c-.077.063-.048.208.063.3.111.111.252.126.315.048.063-.063.034-.208-.063-.3-.106-.111-.252-.126-.315-.048zm-.552-.711c-.077.048-.077.174 0 .285.077.111.208.16.271.111.077-.063.077-.189 0-.3-.068-.111-.194-.16-.271-.097z"/></svg>
     Github
@@ -20,6 +24,8 @@ def gui():
 
     ui.colors(primary="#299fbb")
 
+    names = NameIndex.from_table()
+
     def search():
         def result(molecule):
             bottom_content.clear()
@@ -65,17 +71,31 @@ def gui():
             with ui.card().style("border: 1px solid var(--q-info);"):
                 ui.icon("info", color="blue")
                 ui.label(
-                    "Enter a formula or element and press submit to search for it. This will display the name, molar mass, percent composition, and type of the molecule."
+                    "Enter a formula, element or name and press submit to search for it. This will display the name, molar mass, percent composition, and type of the molecule."
                 )
 
             def submit(value):
                 if value is not None:
+                    if not isformula(value):
+                        value = names.lookup(value, exact=True) or value
                     result(value)
 
+            def suggest(event):
+                if event.value and not isformula(event.value):
+                    molecule_input.set_autocomplete(
+                        [name for name, _ in names.complete(event.value, limit=8)]
+                    )
+
             molecule_input = ui.input(
                 label="Molecule",
-                placeholder="Ex. Fe or H2O",
-                validation={"Invalid molecule": lambda x: isformula(x)},
+                placeholder="Ex. Fe, H2O or water",
+                on_change=suggest,
+                validation={
+                    # Only exact names, so a typo is never silently searched
+                    # as a different compound; suggestions offer the matches.
+                    "Invalid molecule": lambda x: isformula(x)
+                    or names.lookup(x, exact=True) is not None
+                },
             )
             with ui.row():
                 ui.button("Submit", on_click=lambda: submit(molecule_input.value))
@@ -211,7 +231,7 @@ def gui():
                 if value is not None:
                     result(value)
 
-            data = PERIODIC_TABLE
+            data = load_table("periodic_table")
             columnDefs = [{"headerName": col, "field": col} for col in data.columns[:7]]
             rowData = data.to_dict("records")
             grid = ui.aggrid(
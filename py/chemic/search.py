@@ -0,0 +1,479 @@
+from .data import load_table
+from .main import Element, hill_order, reconstruct_formula
+from .utils import parse_formula
+
+import csv
+import numpy as np
+
+
+def read_formula_file(path):
+    """
+    Read the formulas and names from a file of compounds.
+
+    Args:
+        path (str): A CSV file with "Formula" and "Names" columns (like `utils/lib/data/formulae.csv`), or a headerless tab-separated file of names, formulas and CAS numbers (like `utils/fetch/species.txt`).
+
+    Returns:
+        list: The (formula, name) of each row, with the first synonym as the name.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if str(path).endswith(".csv"):
+            return [
+                (row["Formula"], (row.get("Names") or "").split("\n")[0].strip())
+                for row in csv.DictReader(file)
+            ]
+        return [
+            (row[1], row[0]) for row in csv.reader(file, delimiter="\t") if len(row) >= 2
+        ]
+
+
+def _table_rows():
+    return [
+        (record["Formula"], record["Names"].split("\n")[0].strip())
+        for record in load_table("common_formulas").to_dict("records")
+    ]
+
+
+class MassIndex:
+    """
+    A sorted index of formulas by molar mass, for finding candidate formulas
+    of a measured mass.
+
+    Queries are binary searches over a sorted NumPy array of masses, so each
+    takes logarithmic time in the size of the index.
+
+    Args:
+        formulas (iterable): The formulas.
+        names (iterable, optional): A name for each formula.
+        monoisotopic (bool, optional): Whether to index monoisotopic masses instead of molar masses. Defaults to False.
+
+    Attributes:
+        masses (numpy.ndarray): The masses, sorted.
+        formulas (numpy.ndarray): The formula of each mass.
+        names (numpy.ndarray): The name of each mass (None if no names were given).
+
+    Examples:
+        >>> index = MassIndex.from_table()
+        >>> index.search(18.015, tolerance=0.001)
+        [('H2O', 'water', 18.015)]
+    """
+
+    def __init__(self, formulas, names=None, monoisotopic=False):
+        formulas = np.asarray(list(formulas), dtype=object)
+        if names is None:
+            names = np.full(len(formulas), None, dtype=object)
+        else:
+            names = np.asarray(list(names), dtype=object)
+            if len(names) != len(formulas):
+                raise ValueError("There must be one name per formula")
+        if monoisotopic:
+            from .isotopes import monoisotopic_masses as masses_of
+        else:
+            from .vectorized import molar_masses as masses_of
+        masses = masses_of(formulas) if len(formulas) else np.zeros(0)
+        valid = ~np.isnan(masses)
+        order = np.argsort(masses[valid], kind="stable")
+        self.masses = masses[valid][order]
+        self.formulas = formulas[valid][order]
+        self.names = names[valid][order]
+
+    @classmethod
+    def from_table(cls, monoisotopic=False):
+        """
+        Index the bundled formula table, naming each formula by its first synonym.
+
+        Args:
+            monoisotopic (bool, optional): Whether to index monoisotopic masses. Defaults to False.
+
+        Returns:
+            MassIndex: The index.
+        """
+        rows = _table_rows()
+        return cls(
+            (formula for formula, _ in rows),
+            (name for _, name in rows),
+            monoisotopic=monoisotopic,
+        )
+
+    @classmethod
+    def from_file(cls, path, monoisotopic=False):
+        """
+        Index a file of formulas.
+
+        Args:
+            path (str): The file (see `read_formula_file`).
+            monoisotopic (bool, optional): Whether to index monoisotopic masses. Defaults to False.
+
+        Returns:
+            MassIndex: The index.
+        """
+        rows = read_formula_file(path)
+        return cls(
+            (formula for formula, _ in rows),
+            (name for _, name in rows),
+            monoisotopic=monoisotopic,
+        )
+
+    def __len__(self):
+        return len(self.masses)
+
+    def _matches(self, start, stop, mass=None):
+        matches = [
+            (self.formulas[index], self.names[index], float(self.masses[index]))
+            for index in range(start, stop)
+        ]
+        if mass is not None:
+            matches.sort(key=lambda match: abs(match[2] - mass))
+        return matches
+
+    def range(self, low, high):
+        """
+        Find every formula with a mass in a range.
+
+        Args:
+            low (float): The lowest mass.
+            high (float): The highest mass.
+
+        Returns:
+            list: The (formula, name, mass) of each match, in order of mass.
+        """
+        start = np.searchsorted(self.masses, low, side="left")
+        stop = np.searchsorted(self.masses, high, side="right")
+        return self._matches(start, stop)
+
+    def search(self, mass, tolerance=0.01, ppm=None):
+        """
+        Find the formulas with a mass close to a measured mass.
+
+        Args:
+            mass (float): The measured mass.
+            tolerance (float, optional): The largest absolute difference in mass. Defaults to 0.01.
+            ppm (float, optional): The largest difference in parts per million of the mass, used instead of `tolerance`.
+
+        Returns:
+            list: The (formula, name, mass) of each match, closest first.
+        """
+        if ppm is not None:
+            tolerance = mass * ppm / 1e6
+        start = np.searchsorted(self.masses, mass - tolerance, side="left")
+        stop = np.searchsorted(self.masses, mass + tolerance, side="right")
+        return self._matches(start, stop, mass)
+
+    def search_many(self, masses, tolerance=0.01, ppm=None):
+        """
+        Find the formulas close to each of many measured masses.
+
+        The bounds of every window are found with one vectorized binary
+        search.
+
+        Args:
+            masses (array-like): The measured masses.
+            tolerance (float, optional): The largest absolute difference in mass. Defaults to 0.01.
+            ppm (float, optional): The largest difference in parts per million of each mass, used instead of `tolerance`.
+
+        Returns:
+            list: For each mass, the (formula, name, mass) of each match, closest first.
+        """
+        masses = np.asarray(masses, dtype=float)
+        tolerance = masses * ppm / 1e6 if ppm is not None else np.full(len(masses), tolerance)
+        starts = np.searchsorted(self.masses, masses - tolerance, side="left")
+        stops = np.searchsorted(self.masses, masses + tolerance, side="right")
+        return [
+            self._matches(start, stop, mass)
+            for start, stop, mass in zip(starts, stops, masses)
+        ]
+
+
+class CompositionIndex:
+    """
+    An inverted index from elements to the formulas that contain them, for
+    queries like "every compound with Cl and at least 2 O".
+
+    Each element has a bitset (a Python integer with one bit per row) of the
+    rows containing it, and postings of those rows sorted by count. Count
+    ranges become bitsets of the rows with at least a given count, which are
+    built from the postings on first use and cached (as are the rows made only
+    of a given set of elements), so a query is a handful of integer AND
+    operations.
+
+    Args:
+        formulas (iterable): The formulas.
+        names (iterable, optional): A name for each formula.
+
+    Attributes:
+        formulas (numpy.ndarray): The formula of each row.
+        names (numpy.ndarray): The name of each row (None if no names were given).
+        masses (numpy.ndarray): The molar mass of each row (NaN if the formula is invalid).
+
+    Examples:
+        >>> index = CompositionIndex.from_table()
+        >>> index.count(contains=["Cl"], counts={"O": (2, None)}) > 0
+        True
+    """
+
+    def __init__(self, formulas, names=None):
+        from .main import ELEMENTS_BY_SYMBOL as by_symbol
+        from .vectorized import molar_masses
+
+        self.formulas = np.asarray(list(formulas), dtype=object)
+        if names is None:
+            self.names = np.full(len(self.formulas), None, dtype=object)
+        else:
+            self.names = np.asarray(list(names), dtype=object)
+            if len(self.names) != len(self.formulas):
+                raise ValueError("There must be one name per formula")
+        postings = {}
+        valid = np.zeros(len(self.formulas), dtype=bool)
+        for row, formula in enumerate(self.formulas):
+            elements = parse_formula(formula) if isinstance(formula, str) else None
+            if not elements or not all(symbol in by_symbol for symbol in elements):
+                continue
+            valid[row] = True
+            for symbol, count in elements.items():
+                if count:
+                    postings.setdefault(symbol, ([], []))
+                    postings[symbol][0].append(row)
+                    postings[symbol][1].append(count)
+        self.masses = molar_masses(self.formulas) if len(self.formulas) else np.zeros(0)
+        self.masses[~valid] = np.nan
+        self._rows = len(self.formulas)
+        self._valid = self._bitset(np.flatnonzero(valid))
+        self._postings = {}
+        self._presence = {}
+        for symbol, (rows, counts) in postings.items():
+            rows = np.asarray(rows)
+            counts = np.asarray(counts)
+            order = np.argsort(counts, kind="stable")
+            self._postings[symbol] = (counts[order], rows[order])
+            self._presence[symbol] = self._bitset(rows)
+        self._at_least = {}
+        self._only = {}
+
+    @classmethod
+    def from_table(cls):
+        """
+        Index the bundled formula table, naming each formula by its first synonym.
+
+        Returns:
+            CompositionIndex: The index.
+        """
+        rows = _table_rows()
+        return cls((formula for formula, _ in rows), (name for _, name in rows))
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Index a file of formulas.
+
+        Args:
+            path (str): The file (see `read_formula_file`).
+
+        Returns:
+            CompositionIndex: The index.
+        """
+        rows = read_formula_file(path)
+        return cls((formula for formula, _ in rows), (name for _, name in rows))
+
+    def __len__(self):
+        return self._rows
+
+    def _bitset(self, rows):
+        bits = np.zeros(self._rows, dtype=bool)
+        bits[rows] = True
+        return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+    def _rows_of(self, bitset):
+        data = bitset.to_bytes((self._rows + 7) // 8, "little")
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder="little")
+        return np.flatnonzero(bits[: self._rows])
+
+    def _rows_with_at_least(self, symbol, count):
+        """
+        Get the bitset of the rows with at least `count` atoms of an element.
+        """
+        if count <= 0:
+            return self._valid
+        key = (symbol, count)
+        bitset = self._at_least.get(key)
+        if bitset is None:
+            postings = self._postings.get(symbol)
+            if postings is None:
+                bitset = 0
+            else:
+                counts, rows = postings
+                bitset = self._bitset(rows[np.searchsorted(counts, count, side="left") :])
+            self._at_least[key] = bitset
+        return bitset
+
+    def _rows_with_only(self, allowed):
+        """
+        Get the bitset of the rows with no elements outside `allowed`.
+        """
+        bitset = self._only.get(allowed)
+        if bitset is None:
+            others = 0
+            for symbol, presence in self._presence.items():
+                if symbol not in allowed:
+                    others |= presence
+            bitset = self._only[allowed] = self._valid & ~others
+        return bitset
+
+    def _match(self, contains, excludes, counts, only):
+        bitset = self._valid
+        for symbol in contains or ():
+            bitset &= self._presence.get(symbol, 0)
+        for symbol in excludes or ():
+            bitset &= ~self._presence.get(symbol, 0)
+        for symbol, bounds in (counts or {}).items():
+            low, high = (bounds, bounds) if not isinstance(bounds, (tuple, list)) else bounds
+            if low is not None:
+                bitset &= self._rows_with_at_least(symbol, low)
+            if high is not None:
+                bitset &= ~self._rows_with_at_least(symbol, high + 1)
+        if only is not None:
+            bitset &= self._rows_with_only(frozenset(only))
+        return bitset
+
+    def query(self, contains=None, excludes=None, counts=None, only=None, mass=None):
+        """
+        Find the formulas matching a composition query.
+
+        Args:
+            contains (iterable, optional): Symbols of elements every match must contain.
+            excludes (iterable, optional): Symbols of elements no match may contain.
+            counts (dict, optional): The number of atoms of elements, keyed by symbol, as an exact count or a (lowest, highest) tuple where either bound can be None.
+            only (iterable, optional): Symbols of the only elements matches may contain.
+            mass (tuple, optional): The (lowest, highest) molar mass of matches.
+
+        Returns:
+            list: The (formula, name, mass) of each match, in row order.
+
+        Examples:
+            >>> index = CompositionIndex.from_table()
+            >>> index.query(only=["H", "O"], counts={"O": 1})
+            [('H2O', 'water', 18.015), ...]
+        """
+        rows = self._rows_of(self._match(contains, excludes, counts, only))
+        if mass is not None:
+            low, high = mass
+            masses = self.masses[rows]
+            rows = rows[(masses >= low) & (masses <= high)]
+        return [
+            (self.formulas[row], self.names[row], float(self.masses[row])) for row in rows
+        ]
+
+    def count(self, contains=None, excludes=None, counts=None, only=None):
+        """
+        Count the formulas matching a composition query (see `query`), without
+        listing them.
+
+        Returns:
+            int: The number of matches.
+        """
+        return self._match(contains, excludes, counts, only).bit_count()
+
+
+# Valences used for the ring and double bond equivalent check.
+_VALENCES = {"C": 4, "Si": 4, "H": 1, "F": 1, "Cl": 1, "Br": 1, "I": 1, "N": 3, "P": 3}
+
+
+def _ring_double_bonds(elements):
+    """
+    Get the number of rings plus double bonds a composition implies.
+
+    Returns:
+        float: The ring and double bond equivalent, counting S and O as divalent.
+    """
+    total = 2
+    for symbol, count in elements.items():
+        total += count * (_VALENCES.get(symbol, 2) - 2)
+    return total / 2
+
+
+def enumerate_formulas(
+    mass, tolerance=0.01, elements="CHNOPS", limits=None, monoisotopic=False, chemical=True
+):
+    """
+    Enumerate the compositions with a mass within a window.
+
+    Compositions are built heaviest element first with a bounded
+    branch-and-bound search: each element's count is limited by the mass left
+    (and by `limits`), and a branch is dropped as soon as the lighter elements
+    can no longer make up the rest of the mass within their limits.
+
+    Args:
+        mass (float): The target mass.
+        tolerance (float, optional): The largest absolute difference in mass. Defaults to 0.01.
+        elements (str, list, optional): The elements to use, as a formula-like string of symbols (e.g. "CHNOPS") or a list of symbols. Defaults to "CHNOPS".
+        limits (dict, optional): The largest count of any element, keyed by symbol.
+        monoisotopic (bool, optional): Whether to use monoisotopic masses instead of molar masses. Defaults to False.
+        chemical (bool, optional): Whether to keep only compositions with a whole, non-negative number of rings and double bonds. Defaults to True.
+
+    Returns:
+        list: The (formula, mass) of each composition, closest first.
+
+    Examples:
+        >>> enumerate_formulas(18.015, tolerance=0.001, elements="HO")
+        [('H2O', 18.015)]
+    """
+    if isinstance(elements, str):
+        parsed = parse_formula(elements)
+        if not parsed:
+            raise ValueError("Invalid elements")
+        elements = list(parsed)
+    symbols = [Element(symbol).symbol for symbol in elements]
+    if monoisotopic:
+        from .isotopes import monoisotopic_mass
+
+        element_masses = {symbol: monoisotopic_mass(symbol) for symbol in symbols}
+    else:
+        element_masses = {symbol: Element(symbol).mass for symbol in symbols}
+    limits = limits or {}
+    order = sorted(symbols, key=element_masses.get, reverse=True)
+    masses = [element_masses[symbol] for symbol in order]
+    maxima = [limits.get(symbol) for symbol in order]
+    if min(masses) <= 0 or mass + tolerance <= 0:
+        return []
+    # The most mass the elements after each position can still add.
+    reach = [0.0] * len(order)
+    for position in range(len(order) - 2, -1, -1):
+        maximum = maxima[position + 1]
+        addable = np.inf if maximum is None else maximum * masses[position + 1]
+        reach[position] = reach[position + 1] + addable
+    low, high = mass - tolerance, mass + tolerance
+    counts = [0] * len(order)
+    hill = [(symbol, order.index(symbol)) for symbol in hill_order(symbols)]
+    results = []
+
+    def search(position, total):
+        element_mass = masses[position]
+        most = int((high - total) // element_mass)
+        if maxima[position] is not None:
+            most = min(most, maxima[position])
+        for count in range(most, -1, -1):
+            subtotal = total + count * element_mass
+            # Counts are tried from the most down, so once the lighter
+            # elements cannot make up the difference, no smaller count can.
+            if subtotal + reach[position] < low:
+                break
+            counts[position] = count
+            if position + 1 < len(order):
+                search(position + 1, subtotal)
+            elif subtotal >= low:
+                found(subtotal)
+        counts[position] = 0
+
+    def found(total):
+        composition = {symbol: counts[position] for symbol, position in hill if counts[position]}
+        if not composition:
+            return
+        if chemical:
+            equivalents = _ring_double_bonds(composition)
+            if equivalents < 0 or equivalents != int(equivalents):
+                return
+        results.append((reconstruct_formula(composition), total))
+
+    search(0, 0.0)
+    results.sort(key=lambda result: abs(result[1] - mass))
+    return results
+
@@ -0,0 +1,282 @@
+from array import array
+
+import hashlib
+import importlib.resources
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+
+MAGIC = b"CHEMSNAP"
+VERSION = 2
+BUNDLED_TABLES = ("periodic_table", "common_formulas", "isotopes")
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "tables.snapshot")
+
+# Magic, format version, header length and payload CRC32.
+_PREAMBLE = struct.Struct("<8sIII")
+# Marks a missing value in a string column; it never appears in the CSVs.
+_MISSING = b"\x00"
+
+
+class _StringColumn:
+    """
+    A column of strings decoded on access from a snapshot's memory map.
+
+    Args:
+        blob (memoryview): The UTF-8 encoded values, back to back.
+        offsets (memoryview): The start of each value in `blob`, plus the end of the last one.
+    """
+
+    __slots__ = ("_blob", "_offsets")
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def _decode(self, index):
+        value = bytes(self._blob[self._offsets[index] : self._offsets[index + 1]])
+        if value == _MISSING:
+            return math.nan
+        return sys.intern(value.decode("utf-8"))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._decode(i) for i in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("column index out of range")
+        return self._decode(index)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        return (self._decode(i) for i in range(len(self)))
+
+
+def default_path():
+    """
+    Get the path of the snapshot file.
+
+    Returns:
+        str: The CHEMIC_SNAPSHOT environment variable, or `tables.snapshot` in the chemic package.
+    """
+    return os.environ.get("CHEMIC_SNAPSHOT") or DEFAULT_PATH
+
+
+def _bundled_csv(name):
+    return importlib.resources.files("chemic").joinpath(f"{name}.csv")
+
+
+def _checksum(path):
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def write_snapshot(path=None, extra=None):
+    """
+    Compile the bundled CSV tables into a binary snapshot.
+
+    Numeric columns are stored as raw arrays and text columns as one UTF-8 blob
+    with an offset array, so loading the snapshot is a memory map rather than
+    a parse. The size, modification time and SHA-256 of every source CSV are
+    recorded so that stale snapshots are ignored after a CSV changes.
+
+    Args:
+        path (str, optional): Where to write the snapshot. Defaults to `default_path()`.
+        extra (dict, optional): Additional tables to include, as {name: path to CSV}, e.g. {"formulae": "utils/lib/data/formulae.csv"}.
+
+    Returns:
+        str: The path of the snapshot.
+    """
+    from .data import CompactTable
+
+    path = path or default_path()
+    sources = {name: str(_bundled_csv(name)) for name in BUNDLED_TABLES}
+    sources.update(extra or {})
+    header = {"version": VERSION, "tables": {}}
+    payload = bytearray()
+    for name, source in sources.items():
+        with open(source, encoding="utf-8", newline="") as file:
+            table = CompactTable.from_csv(file)
+        columns = []
+        for column in table.columns:
+            values = table[column]
+            if isinstance(values, array):
+                columns.append(_write_chunk(payload, column, values.typecode, values.tobytes()))
+                continue
+            encoded = [
+                value.encode("utf-8") if isinstance(value, str) else _MISSING
+                for value in values
+            ]
+            offsets = array("q", [0])
+            for value in encoded:
+                offsets.append(offsets[-1] + len(value))
+            entry = _write_chunk(payload, column, "s", b"".join(encoded))
+            entry["offsets"] = _write_chunk(payload, column, "q", offsets.tobytes())
+            columns.append(entry)
+        header["tables"][name] = {
+            "source": os.path.abspath(source) if name in (extra or {}) else None,
+            "stamp": _stamp(source),
+            "sha256": _checksum(source),
+            "rows": len(table),
+            "columns": columns,
+        }
+    encoded_header = json.dumps(header).encode("utf-8")
+    # Keep the payload 8-byte aligned so arrays can be cast in place.
+    encoded_header += b" " * (-(len(encoded_header) + _PREAMBLE.size) % 8)
+    with open(path + ".tmp", "wb") as file:
+        file.write(
+            _PREAMBLE.pack(MAGIC, VERSION, len(encoded_header), zlib.crc32(payload))
+        )
+        file.write(encoded_header)
+        file.write(payload)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def _write_chunk(payload, name, typecode, data):
+    payload.extend(b"\x00" * (-len(payload) % 8))
+    entry = {"name": name, "type": typecode, "offset": len(payload), "length": len(data)}
+    payload.extend(data)
+    return entry
+
+
+class Snapshot:
+    """
+    A memory-mapped table snapshot written by `write_snapshot`.
+
+    Opening a snapshot reads only its header, and numeric columns are
+    zero-copy views of the mapped file, so pages are read as they are used and
+    processes that load the same snapshot share them. The payload checksum is
+    only checked on request, since that reads the whole file.
+
+    Args:
+        path (str, optional): The snapshot file. Defaults to `default_path()`.
+        verify (bool, optional): Whether to check the payload against its CRC32 when opening. Defaults to False.
+
+    Methods:
+        load: Get a table from the snapshot as a `CompactTable`.
+        is_fresh: Check that a table still matches its source CSV.
+        verify: Check the payload against its CRC32.
+
+    Raises:
+        ValueError: If the file is not a valid snapshot of this version, or `verify` is True and the checksum does not match.
+    """
+
+    def __init__(self, path=None, verify=False):
+        self.path = path or default_path()
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if len(view) < _PREAMBLE.size:
+            raise ValueError("Snapshot is truncated")
+        magic, version, header_length, self._crc = _PREAMBLE.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a chemic snapshot of a supported version")
+        start = _PREAMBLE.size + header_length
+        self.header = json.loads(bytes(view[_PREAMBLE.size : start]))
+        self._payload = view[start:]
+        if verify and not self.verify():
+            raise ValueError("Snapshot checksum does not match")
+
+    @property
+    def tables(self):
+        return list(self.header["tables"])
+
+    def verify(self):
+        """
+        Check the payload against the CRC32 it was written with. This reads
+        every page of the snapshot.
+
+        Returns:
+            bool: True if the payload is intact.
+        """
+        return zlib.crc32(self._payload) == self._crc
+
+    def is_fresh(self, name):
+        """
+        Check that a table was compiled from the current version of its CSV.
+
+        The size and modification time of the CSV are compared first, so this
+        is a `stat` call in the common case. Only a CSV with a new modification
+        time but the same size (e.g. after a checkout) is read and compared by
+        its SHA-256.
+
+        Args:
+            name (str): The name of the table.
+
+        Returns:
+            bool: False if the source CSV has changed since the snapshot was written.
+        """
+        entry = self.header["tables"][name]
+        source = entry["source"] or str(_bundled_csv(name))
+        if not os.path.exists(source):
+            return entry["source"] is not None
+        size, mtime = _stamp(source)
+        if size != entry["stamp"][0]:
+            return False
+        return mtime == entry["stamp"][1] or _checksum(source) == entry["sha256"]
+
+    def load(self, name):
+        """
+        Load a table from the snapshot.
+
+        Args:
+            name (str): The name of the table.
+
+        Returns:
+            CompactTable: The table.
+        """
+        from .data import CompactTable
+
+        columns = {}
+        for column in self.header["tables"][name]["columns"]:
+            data = self._chunk(column)
+            if column["type"] == "s":
+                columns[column["name"]] = _StringColumn(data, self._chunk(column["offsets"]).cast("q"))
+            else:
+                columns[column["name"]] = data.cast(column["type"])
+        return CompactTable(columns)
+
+    def _chunk(self, entry):
+        return self._payload[entry["offset"] : entry["offset"] + entry["length"]]
+
+
+_SNAPSHOTS = {}
+
+
+def load_snapshot_table(name, path=None):
+    """
+    Load a table from the snapshot if there is an up-to-date one.
+
+    Args:
+        name (str): The name of the table.
+        path (str, optional): The snapshot file. Defaults to `default_path()`.
+
+    Returns:
+        CompactTable: The table, or None if there is no snapshot, it is invalid, or the table is missing or stale.
+    """
+    path = path or default_path()
+    snapshot = _SNAPSHOTS.get(path)
+    if snapshot is None:
+        if not os.path.exists(path):
+            return None
+        try:
+            snapshot = Snapshot(path)
+        except (OSError, ValueError):
+            return None
+        _SNAPSHOTS[path] = snapshot
+    if name not in snapshot.header["tables"] or not snapshot.is_fresh(name):
+        return None
+    return snapshot.load(name)
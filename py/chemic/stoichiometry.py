@@ -0,0 +1,146 @@
+from .main import Formula, mass_to_moles, moles_to_mass
+from .reaction import Reaction, parse_species
+
+
+def balanced_reaction(reaction):
+    """
+    Get a balanced reaction.
+
+    Args:
+        reaction (str, Reaction): The reaction, e.g. "Fe + O2 -> Fe2O3".
+
+    Returns:
+        Reaction: The reaction itself if it is already balanced, otherwise the balanced reaction.
+
+    Raises:
+        ValueError: If the reaction cannot be balanced.
+    """
+    if isinstance(reaction, str):
+        reaction = Reaction(reaction)
+    if not isinstance(reaction, Reaction):
+        raise ValueError("Invalid reaction")
+    if reaction.is_balanced():
+        return reaction
+    return reaction.balance()
+
+
+def species_formula(species):
+    """
+    Get the formula of a species of a reaction, without its charge or state.
+
+    Args:
+        species (str): The species, e.g. "Fe2O3", "Cu 2+" or "NaCl(aq)".
+
+    Returns:
+        Formula: The formula.
+
+    Raises:
+        ValueError: If the species is invalid or is an electron.
+    """
+    elements, _ = parse_species(species)
+    if not elements:
+        raise ValueError(f"Species has no mass: {species}")
+    return Formula(elements)
+
+
+def _reactant_amounts(reaction, masses, moles):
+    """
+    Get the moles of each reactant with a given amount.
+
+    Args:
+        reaction (Reaction): The balanced reaction.
+        masses (dict): The mass of some reactants, keyed by species.
+        moles (dict): The moles of some reactants, keyed by species.
+
+    Returns:
+        dict: The moles of each reactant with a given amount, keyed by index in `reaction.reactants`.
+    """
+    if (masses is None) == (moles is None):
+        raise ValueError("Give either masses or moles")
+    amounts = masses if moles is None else moles
+    indexes = {species: index for index, species in enumerate(reaction.reactants)}
+    reactant_moles = {}
+    for species, amount in amounts.items():
+        if species not in indexes:
+            raise ValueError(f"Not a reactant: {species}")
+        if amount < 0:
+            raise ValueError(f"Amount must not be negative: {species}")
+        if moles is None:
+            amount = mass_to_moles(species_formula(species), amount)
+        reactant_moles[indexes[species]] = amount
+    if not reactant_moles:
+        raise ValueError("Give the amount of at least one reactant")
+    return reactant_moles
+
+
+def _amount(species, moles):
+    try:
+        mass = moles_to_mass(species_formula(species), moles)
+    except ValueError:
+        mass = None
+    return {"moles": moles, "mass": mass}
+
+
+def get_yields(reaction, masses=None, moles=None):
+    """
+    Find the limiting reagent, theoretical yields and excess amounts of a reaction.
+
+    Reactants without a given amount are assumed to be in excess.
+
+    Args:
+        reaction (str, Reaction): The reaction, balanced if it is not already.
+        masses (dict, optional): The mass of each reactant, keyed by species.
+        moles (dict, optional): The moles of each reactant, keyed by species (instead of `masses`).
+
+    Returns:
+        dict: The balanced reaction ("reaction"), the limiting reagent ("limiting"), the moles of reaction ("extent"), and the "moles" and "mass" (None for electrons) of each product made ("products") and of each given reactant left over ("excess"), keyed by species.
+
+    Raises:
+        ValueError: If the reaction cannot be balanced or the amounts are invalid.
+
+    Examples:
+        >>> yields = get_yields("Fe + O2 -> Fe2O3", masses={"Fe": 10, "O2": 10})
+        >>> yields["limiting"]
+        'Fe'
+        >>> round(yields["products"]["Fe2O3"]["mass"], 2)
+        14.3
+    """
+    reaction = balanced_reaction(reaction)
+    reactant_moles = _reactant_amounts(reaction, masses, moles)
+    coefficients = reaction.reactant_coefficients
+    limiting = min(
+        reactant_moles, key=lambda index: reactant_moles[index] / coefficients[index]
+    )
+    extent = reactant_moles[limiting] / coefficients[limiting]
+    products = {
+        species: _amount(species, coefficient * extent)
+        for species, coefficient in zip(reaction.products, reaction.product_coefficients)
+    }
+    excess = {
+        reaction.reactants[index]: _amount(
+            reaction.reactants[index], max(available - coefficients[index] * extent, 0)
+        )
+        for index, available in reactant_moles.items()
+    }
+    return {
+        "reaction": reaction,
+        "limiting": reaction.reactants[limiting],
+        "extent": extent,
+        "products": products,
+        "excess": excess,
+    }
+
+
+def limiting_reagent(reaction, masses=None, moles=None):
+    """
+    Find the limiting reagent of a reaction (see `get_yields`).
+
+    Args:
+        reaction (str, Reaction): The reaction.
+        masses (dict, optional): The mass of each reactant, keyed by species.
+        moles (dict, optional): The moles of each reactant, keyed by species (instead of `masses`).
+
+    Returns:
+        str: The limiting reagent.
+    """
+    return get_yields(reaction, masses=masses, moles=moles)["limiting"]
@@ -1,115 +1,210 @@
-from commoner import reverse, replace_all, Shout, Chalk
+from commoner import Shout, Chalk
 
+import re
 
-def validate_cas_number(cas_num, verbose=True):
+
+CAS_FORMAT_ERROR = "CAS number is not formatted correctly [x(2-7)-x(2)-x(1)]"
+
+
+def cas_number_error(cas_num):
+    """
+    Find out why a CAS number is invalid, without printing anything.
+
+    The check digit is computed directly from the character codes, so no
+    intermediate strings are created.
+
+    Args:
+        cas_num (str): The CAS number, e.g. "7732-18-5".
+
+    Returns:
+        str: The reason the CAS number is invalid, or None if it is valid.
+    """
     if not isinstance(cas_num, str):
-        if verbose:
-            Shout.error("CAS number is not a string")
-        return False
-    if len(replace_all(cas_num, "-", "")) > 10:
-        if verbose:
-            Shout.error("CAS number is too long")
-        return False
-    cas_num = {
-        "full": cas_num,
-        "clean": replace_all(cas_num, "-", ""),
-        "parts": cas_num.split("-"),
-    }
-    if len(cas_num["parts"]) != 3:
-        if verbose:
-            Shout.error("CAS number is not formatted correctly [x(2-7)-x(2)-x(1)]")
-        return False
+        return "CAS number is not a string"
+    length = len(cas_num)
+    if length - cas_num.count("-") > 10:
+        return "CAS number is too long"
+    first = cas_num.find("-")
+    second = length - 2
+    if not 2 <= first <= 7 or first != second - 3 or cas_num[second] != "-":
+        return CAS_FORMAT_ERROR
     check_sum = 0
-    check_sum_num = reverse(cas_num["parts"][0] + cas_num["parts"][1])
-    for i in range(0, len(check_sum_num)):
-        check_sum += int(check_sum_num[i]) * (i + 1)
-    check_sum = check_sum % 10
-    if check_sum != int(cas_num["parts"][2]):
-        if verbose:
-            Shout.error(
-                f"Check sum does not match check digit [{check_sum} != {cas_num['parts'][2]}]"
-            )
-        return False
+    weight = 1
+    for index in range(second - 1, -1, -1):
+        if index == first:
+            continue
+        digit = ord(cas_num[index]) - 48
+        if not 0 <= digit <= 9:
+            return CAS_FORMAT_ERROR
+        check_sum += digit * weight
+        weight += 1
+    check_digit = ord(cas_num[-1]) - 48
+    if not 0 <= check_digit <= 9:
+        return CAS_FORMAT_ERROR
+    if check_sum % 10 != check_digit:
+        return f"Check sum does not match check digit [{check_sum % 10} != {check_digit}]"
+    return None
+
+
+def is_cas_number(cas_num):
+    """
+    Check whether a value is a valid CAS number, without printing anything.
+
+    Args:
+        cas_num (str): The CAS number.
+
+    Returns:
+        bool: True if the CAS number is valid, False otherwise.
+    """
+    return cas_number_error(cas_num) is None
+
+
+def validate_cas_number(cas_num, verbose=True):
+    error = cas_number_error(cas_num)
     if verbose:
-        Shout.success("CAS number is valid")
-    return True
+        if error is None:
+            Shout.success("CAS number is valid")
+        else:
+            Shout.error(error)
+    return error is None
+
+
+_FORMULA_TOKEN = re.compile(
+    r"([A-Z][a-z]*|[a-z])(\d*)|([(\[{])|([)\]}])(\d*)|(\s*[·•⋅*.]\s*)|(\d+(?:\.\d+)?)|(.)",
+    re.S,
+)
+_FORMULA_CHARGE = re.compile(
+    r"(?:[\s^]+(\d+)([+\-−])|[\s^]*([+\-−])(\d*)|[\s^]*([+\-−]{2,}))\s*$"
+)
+# A single element or bracketed group with digits directly before the sign,
+# e.g. "Fe3+" or "[Fe(CN)6]4-".
+_ION_CHARGE = re.compile(r"^\s*([A-Z][a-z]?|[(\[{].*[)\]}])(\d+)([+\-−])\s*$")
+_CLOSING_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+
+
+def parse_charge(formula, strict_ion=False):
+    """
+    Split the trailing charge off a formula.
+
+    Digits directly before the sign are a count followed by a charge of 1, so
+    "O2−" is the superoxide ion, as in the formula table. With `strict_ion`,
+    they are the charge of a single element or bracketed group instead, as in
+    ionic equations: "Fe3+" is Fe with a charge of +3 and "[Fe(CN)6]4-" has a
+    charge of -4.
 
+    Args:
+        formula (str): The formula, e.g. "SO4 2-", "SO4^2-", "AlF4-", "Fe+3" or "O--" (the Unicode minus sign "−" is also accepted).
+        strict_ion (bool, optional): Whether to read "Fe3+" as an ion with a charge of +3. Defaults to False.
 
-def parse_formula(formula):
+    Returns:
+        tuple: The formula without its charge and the net charge (0 if there is none).
+    """
+    if formula.rstrip().rstrip("0123456789")[-1:] not in ("+", "-", "−"):
+        return formula, 0
+    if strict_ion:
+        match = _ION_CHARGE.match(formula)
+        if match is not None:
+            charge = int(match.group(2))
+            return formula[: match.end(1)], charge if match.group(3) == "+" else -charge
+    match = _FORMULA_CHARGE.search(formula)
+    if match is None:
+        return formula, 0
+    magnitude, sign, lead_sign, trail_magnitude, signs = match.groups()
+    if signs:
+        if len(set(signs)) != 1:
+            return formula, 0
+        charge = len(signs)
+        sign = signs[0]
+    else:
+        sign = sign or lead_sign
+        charge = int(magnitude or trail_magnitude or 1)
+    return formula[: match.start()], charge if sign == "+" else -charge
+
+
+def parse_formula(formula, charge=False, strict_ion=False):
+    """
+    Parse a formula into a dictionary of element counts.
+
+    The formula is tokenized and parsed in a single left-to-right pass with a
+    stack of open groups, so parsing time grows linearly with its length.
+    Supports nested groups ("Ca3(PO4)2", "K4[Fe(CN)6]"), multi-digit counts,
+    hydrates ("CuSO4·5H2O", "CaSO4 · 0.5H2O") and trailing charges (see
+    `parse_charge`). A charge written directly after a count ("Fe3+") is read
+    as a count followed by a single charge unless `strict_ion` is set; write
+    "Fe 3+" or "Fe+3" to be unambiguous.
+
+    Args:
+        formula (str): The formula to parse.
+        charge (bool, optional): Whether to also return the net charge. Defaults to False.
+        strict_ion (bool, optional): Whether digits directly before the sign of a single element or bracketed group are its charge (see `parse_charge`). Defaults to False.
+
+    Returns:
+        dict: The number of atoms of each element, in order of first appearance, or None if the formula is invalid or has no elements. If `charge` is True, a tuple of this dictionary and the net charge.
+    """
+    if not isinstance(formula, str):
+        return None
+    formula, net_charge = parse_charge(formula, strict_ion)
     element_dict = {}
-    looking_for_num = False
-    skip = False
-    element = ""
-    for i in range(len(formula)):
-        if skip:
-            skip = False
-            continue
-        elif formula[i] == "(":
-            if looking_for_num:
-                element_dict[element] = 1
-                looking_for_num = False
-            for j in range(i, len(formula)):
-                if formula[j] == ")":
-                    index = j
-                    break
-            result = parse_formula(formula[i + 1 : index])
-            multiplier = None
-            for k in range(index + 1, len(formula)):
-                if formula[k].isdigit():
-                    multiplier = int(formula[index + 1 : k + 1])
-                else:
-                    break
-            if multiplier == None:
-                multiplier = 1
-            for sub_element, sub_num_atoms in result.items():
-                if sub_element in element_dict:
-                    element_dict[sub_element] += sub_num_atoms * (multiplier)
-                else:
-                    element_dict[sub_element] = sub_num_atoms * (multiplier)
-            formula = formula.replace(formula[: index + (1 + len(str(multiplier)))], "")
-            sub_element_dict = parse_formula(formula)
-            for sub_element, sub_num_atoms in sub_element_dict.items():
-                if sub_element in element_dict:
-                    element_dict[sub_element] += sub_num_atoms
-                else:
-                    element_dict[sub_element] = sub_num_atoms
-            return element_dict
-        if formula[i].isupper():
-            if looking_for_num:
-                element_dict[element] = 1
-                looking_for_num = False
-            element = formula[i]
-            num_atoms = 1
-            looking_for_num = True
-        elif formula[i].islower():
-            if i == 0 or not formula[i - 1].isupper():
-                if formula[i - 1].islower():
-                    element_dict[element] = 1
-                element = formula[i].upper()
-                num_atoms = 1
-            else:
-                element += formula[i]
-            looking_for_num = True
-        elif formula[i].isdigit():
-            if i < len(formula) - 1 and formula[i + 1].isdigit():
-                num_atoms = int(formula[i : i + 2])
-                skip = True
-            else:
-                num_atoms = int(formula[i])
-            if element in element_dict:
-                element_dict[element] += num_atoms
-            else:
-                element_dict[element] = num_atoms
-            looking_for_num = False
+    part = {}
+    stack = [part]
+    closing = []
+    coefficient = 1
+    for (
+        element,
+        num_atoms,
+        opening,
+        close,
+        multiplier,
+        separator,
+        number,
+        other,
+    ) in _FORMULA_TOKEN.findall(formula):
+        if element:
+            if element.islower():
+                element = element.upper()
+            counts = stack[-1]
+            counts[element] = counts.get(element, 0) + (int(num_atoms) if num_atoms else 1)
+        elif opening:
+            stack.append({})
+            closing.append(_CLOSING_BRACKETS[opening])
+        elif close:
+            if not closing or closing.pop() != close:
+                return None
+            group = stack.pop()
+            counts = stack[-1]
+            multiplier = int(multiplier) if multiplier else 1
+            for sub_element, sub_num_atoms in group.items():
+                counts[sub_element] = (
+                    counts.get(sub_element, 0) + sub_num_atoms * multiplier
+                )
+        elif separator:
+            if closing:
+                return None
+            for sub_element, sub_num_atoms in part.items():
+                element_dict[sub_element] = (
+                    element_dict.get(sub_element, 0) + sub_num_atoms * coefficient
+                )
+            part = {}
+            stack = [part]
+            coefficient = 1
+        elif number:
+            # A leading number is a coefficient, e.g. the 5 in "CuSO4·5H2O".
+            if part or closing:
+                return None
+            coefficient *= float(number) if "." in number else int(number)
         else:
-            return
-    if looking_for_num:
-        element_dict[element] = num_atoms
-    new_dict = {}
-    for element, num_atoms in element_dict.items():
-        if element != "":
-            new_dict[element] = num_atoms
-    return new_dict
+            return None
+    if closing:
+        return None
+    for sub_element, sub_num_atoms in part.items():
+        element_dict[sub_element] = (
+            element_dict.get(sub_element, 0) + sub_num_atoms * coefficient
+        )
+    if not element_dict:
+        return None
+    if charge:
+        return element_dict, net_charge
+    return element_dict
 
 
 def create_menu(*args, cursor="> ", prompt="Select an option: ", color="cyan"):
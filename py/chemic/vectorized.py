@@ -0,0 +1,375 @@
+from .main import AVOGADRO, ELEMENTS_BY_NUMBER, ELEMENTS_BY_SYMBOL, Element, Formula
+from .stoichiometry import balanced_reaction, species_formula
+from .utils import CAS_FORMAT_ERROR, parse_formula
+
+import itertools
+import numpy as np
+
+
+# Atomic masses indexed by atomic number; index 0 is unused.
+ATOMIC_MASSES = np.full(max(ELEMENTS_BY_NUMBER) + 1, np.nan)
+for _number, _element in ELEMENTS_BY_NUMBER.items():
+    ATOMIC_MASSES[_number] = _element.mass
+
+
+def _factorize(formulas):
+    """
+    Map each formula to the index of its first occurrence.
+
+    Args:
+        formulas (iterable): Formula strings, `Formula` or `Element` objects.
+
+    Returns:
+        tuple: The unique formulas and an array of their indexes for each input.
+    """
+    uniques = []
+    positions = {}
+    codes = []
+    for formula in formulas:
+        # A `Formula` is mutable, so it is keyed by its composition rather than
+        # by the object itself.
+        key = (Formula, formula.key) if isinstance(formula, Formula) else formula
+        position = positions.get(key)
+        if position is None:
+            position = positions[key] = len(uniques)
+            uniques.append(formula)
+        codes.append(position)
+    return uniques, np.array(codes, dtype=np.intp)
+
+
+def _composition_matrix(formulas):
+    """
+    Build the element count matrix of unique formulas.
+
+    Args:
+        formulas (list): Unique formula strings, `Formula` or `Element` objects.
+
+    Returns:
+        tuple: A (formulas x atomic number) count matrix and a mask of the formulas that could not be parsed.
+    """
+    counts = np.zeros((len(formulas), len(ATOMIC_MASSES)))
+    invalid = np.zeros(len(formulas), dtype=bool)
+    for row, formula in enumerate(formulas):
+        if isinstance(formula, Element):
+            elements = {formula.symbol: 1}
+        elif isinstance(formula, Formula):
+            elements = formula.elements
+        elif isinstance(formula, str):
+            elements = parse_formula(formula.strip())
+        else:
+            elements = None
+        if not elements:
+            invalid[row] = True
+            continue
+        for symbol, num_atoms in elements.items():
+            element = ELEMENTS_BY_SYMBOL.get(symbol)
+            if element is None:
+                invalid[row] = True
+                break
+            counts[row, element.number] += num_atoms
+    return counts, invalid
+
+
+def _properties(formulas):
+    """
+    Get the molar mass and number of atoms of every formula.
+
+    Each unique formula is parsed once and the masses of all of them are
+    computed with a single matrix product against `ATOMIC_MASSES`.
+
+    Args:
+        formulas (str, iterable): A formula or an array, list or Series of formulas.
+
+    Returns:
+        tuple: Arrays of the molar masses and numbers of atoms (NaN for invalid formulas).
+    """
+    if isinstance(formulas, (str, Element, Formula)):
+        formulas = [formulas]
+    uniques, codes = _factorize(formulas)
+    counts, invalid = _composition_matrix(uniques)
+    counts[invalid] = 0
+    masses = counts @ np.nan_to_num(ATOMIC_MASSES)
+    atoms = counts.sum(axis=1)
+    masses[invalid] = np.nan
+    atoms[invalid] = np.nan
+    return masses[codes], atoms[codes]
+
+
+def molar_masses(formulas):
+    """
+    Get the molar masses of many formulas.
+
+    Args:
+        formulas (str, iterable): A formula or an array, list or Series of formulas.
+
+    Returns:
+        numpy.ndarray: The molar masses, NaN where a formula is invalid.
+
+    Examples:
+        >>> molar_masses(["H2O", "NaCl", "H2O"])
+        array([18.015, 58.44 , 18.015])
+    """
+    return _properties(formulas)[0]
+
+
+def mass_to_moles(formulas, masses):
+    """
+    Convert masses to moles.
+
+    Args:
+        formulas (str, iterable): The formula, or one formula per mass.
+        masses (float, array-like): The masses.
+
+    Returns:
+        numpy.ndarray: The moles.
+    """
+    return np.asarray(masses, dtype=float) / molar_masses(formulas)
+
+
+def moles_to_mass(formulas, moles):
+    """
+    Convert moles to masses.
+
+    Args:
+        formulas (str, iterable): The formula, or one formula per amount.
+        moles (float, array-like): The moles.
+
+    Returns:
+        numpy.ndarray: The masses.
+    """
+    return np.asarray(moles, dtype=float) * molar_masses(formulas)
+
+
+def mass_to_atoms(formulas, masses):
+    """
+    Convert masses to atoms.
+
+    Args:
+        formulas (str, iterable): The formula, or one formula per mass.
+        masses (float, array-like): The masses.
+
+    Returns:
+        numpy.ndarray: The atoms.
+    """
+    mass, atoms = _properties(formulas)
+    return np.asarray(masses, dtype=float) / mass * AVOGADRO * atoms
+
+
+def atoms_to_mass(formulas, atoms):
+    """
+    Convert atoms to masses.
+
+    Args:
+        formulas (str, iterable): The formula, or one formula per amount.
+        atoms (float, array-like): The atoms.
+
+    Returns:
+        numpy.ndarray: The masses.
+    """
+    return np.asarray(atoms, dtype=float) / AVOGADRO * molar_masses(formulas)
+
+
+def mass_to_particles(formulas, masses):
+    """
+    Convert masses to particles.
+
+    Args:
+        formulas (str, iterable): The formula, or one formula per mass.
+        masses (float, array-like): The masses.
+
+    Returns:
+        numpy.ndarray: The particles.
+    """
+    return np.asarray(masses, dtype=float) / molar_masses(formulas) * AVOGADRO
+
+
+def particles_to_mass(formulas, particles):
+    """
+    Convert particles to masses.
+
+    Args:
+        formulas (str, iterable): The formula, or one formula per amount.
+        particles (float, array-like): The particles.
+
+    Returns:
+        numpy.ndarray: The masses.
+    """
+    return np.asarray(particles, dtype=float) / AVOGADRO * molar_masses(formulas)
+
+
+def moles_to_atoms(formulas, moles):
+    """
+    Convert moles to atoms.
+
+    Args:
+        formulas (str, iterable): The formula, or one formula per amount.
+        moles (float, array-like): The moles.
+
+    Returns:
+        numpy.ndarray: The atoms.
+    """
+    return np.asarray(moles, dtype=float) * AVOGADRO * _properties(formulas)[1]
+
+
+def atoms_to_moles(formulas, atoms):
+    """
+    Convert atoms to moles.
+
+    Args:
+        formulas (str, iterable): The formula, or one formula per amount.
+        atoms (float, array-like): The atoms.
+
+    Returns:
+        numpy.ndarray: The moles.
+    """
+    return np.asarray(atoms, dtype=float) / AVOGADRO / _properties(formulas)[1]
+
+
+def _species_masses(species):
+    formulas = []
+    for item in species:
+        try:
+            formulas.append(species_formula(item))
+        except ValueError:
+            formulas.append(None)
+    return molar_masses(formulas)
+
+
+def get_yields(reaction, masses=None, moles=None):
+    """
+    Find the limiting reagent, theoretical yields and excess amounts of a
+    reaction for many experiments at once.
+
+    Each experiment is a row: the moles of reaction are the row-wise minimum of
+    the given moles of each reactant divided by its coefficient. Reactants
+    without a given amount are assumed to be in excess.
+
+    Args:
+        reaction (str, Reaction): The reaction, balanced if it is not already.
+        masses (dict, optional): The masses of each reactant (arrays or lists of the same length), keyed by species. A `pandas.DataFrame` with one column per reactant also works.
+        moles (dict, optional): The moles of each reactant, keyed by species (instead of `masses`).
+
+    Returns:
+        dict: The same keys as `chemic.stoichiometry.get_yields`, with arrays in place of numbers; "limiting" is an array of species (None where every amount is NaN).
+
+    Raises:
+        ValueError: If the reaction cannot be balanced or the amounts are invalid.
+
+    Examples:
+        >>> yields = get_yields("H2 + O2 -> H2O", moles={"H2": [2, 3], "O2": [2, 1]})
+        >>> yields["limiting"]
+        array(['H2', 'O2'], dtype=object)
+        >>> yields["products"]["H2O"]["moles"]
+        array([2., 2.])
+    """
+    reaction = balanced_reaction(reaction)
+    if (masses is None) == (moles is None):
+        raise ValueError("Give either masses or moles")
+    amounts = masses if moles is None else moles
+    given = list(amounts)
+    if not given:
+        raise ValueError("Give the amount of at least one reactant")
+    for species in given:
+        if species not in reaction.reactants:
+            raise ValueError(f"Not a reactant: {species}")
+    coefficients = dict(zip(reaction.reactants, reaction.reactant_coefficients))
+    available = np.column_stack([np.asarray(amounts[species], dtype=float) for species in given])
+    if (available < 0).any():
+        raise ValueError("Amounts must not be negative")
+    given_masses = _species_masses(given)
+    if moles is None:
+        available = available / given_masses
+    ratios = available / np.array([coefficients[species] for species in given])
+    missing = np.isnan(ratios).all(axis=1)
+    limiting_column = np.argmin(np.where(np.isnan(ratios), np.inf, ratios), axis=1)
+    extent = ratios[np.arange(len(ratios)), limiting_column]
+    extent[missing] = np.nan
+    limiting = np.array(given, dtype=object)[limiting_column]
+    limiting[missing] = None
+    products = {}
+    for species, coefficient, mass in zip(
+        reaction.products, reaction.product_coefficients, _species_masses(reaction.products)
+    ):
+        made = coefficient * extent
+        products[species] = {"moles": made, "mass": made * mass}
+    excess = {}
+    for column, species in enumerate(given):
+        left = np.maximum(available[:, column] - coefficients[species] * extent, 0)
+        excess[species] = {"moles": left, "mass": left * given_masses[column]}
+    return {
+        "reaction": reaction,
+        "limiting": limiting,
+        "extent": extent,
+        "products": products,
+        "excess": excess,
+    }
+
+
+_CAS_REASONS = np.array(
+    [
+        None,
+        "CAS number is not a string",
+        "CAS number is too long",
+        CAS_FORMAT_ERROR,
+        "Check sum does not match check digit",
+    ],
+    dtype=object,
+)
+
+
+def validate_cas_numbers(cas_numbers):
+    """
+    Validate many CAS numbers at once.
+
+    The strings are laid out as a fixed-width array of character codes and the
+    format and check digit of every row are checked with array operations.
+
+    Args:
+        cas_numbers (iterable): An array, list or Series of CAS numbers.
+
+    Returns:
+        tuple: A boolean array that is True where a CAS number is valid, and an object array with the reason each invalid one failed (None where valid), using the same messages as `utils.cas_number_error` without the digits in the check sum message.
+
+    Examples:
+        >>> valid, reasons = validate_cas_numbers(["7732-18-5", "7732-18-4"])
+        >>> valid
+        array([ True, False])
+        >>> reasons[1]
+        'Check sum does not match check digit'
+    """
+    values = np.asarray(cas_numbers, dtype=object).ravel().tolist()
+    is_string = np.fromiter(map(isinstance, values, itertools.repeat(str)), dtype=bool, count=len(values))
+    strings = [value if isinstance(value, str) else "" for value in values]
+    lengths = np.fromiter(map(len, strings), dtype=np.intp, count=len(strings))
+    dashes = np.fromiter(map(str.count, strings, itertools.repeat("-")), dtype=np.intp, count=len(strings))
+    too_long = lengths - dashes > 10
+
+    # One row of character codes per CAS number; longer values are truncated
+    # since they are never well formed.
+    width = 12
+    codes = np.array(strings, dtype=f"<U{width}").view(np.uint32).reshape(len(strings), width)
+    positions = np.arange(width)
+    first = lengths - 5
+    second = lengths - 2
+    is_dash = codes == ord("-")
+    is_digit = (codes >= ord("0")) & (codes <= ord("9"))
+    in_string = positions < lengths[:, None]
+    expected_dash = (positions == first[:, None]) | (positions == second[:, None])
+    well_formed = (
+        (first >= 2)
+        & (first <= 7)
+        & np.all(np.where(expected_dash, is_dash, is_digit | ~in_string), axis=1)
+    )
+
+    # Digits before the second dash are weighted 1, 2, 3, ... from the right.
+    digits = np.where(is_digit, codes.astype(np.int64) - ord("0"), 0)
+    weights = second[:, None] - positions - (positions < first[:, None])
+    weights = np.where((positions < second[:, None]) & ~expected_dash, weights, 0)
+    check_sum = (digits * weights).sum(axis=1) % 10
+    check_digit = digits[np.arange(len(strings)), np.clip(lengths - 1, 0, width - 1)]
+
+    failure = np.select(
+        [~is_string, too_long, ~well_formed, check_sum != check_digit], [1, 2, 3, 4], 0
+    )
+    reasons = _CAS_REASONS[failure]
+    return failure == 0, reasons
@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_built_data(tmp_path, monkeypatch):
+    """
+    Point the compound database and image store at files that do not exist,
+    so tests do not depend on what has been built locally.
+    """
+    monkeypatch.setenv("CHEMIC_DATABASE", str(tmp_path / "missing.sqlite"))
+    monkeypatch.setenv("CHEMIC_IMAGES", str(tmp_path / "missing.pack"))
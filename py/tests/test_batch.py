@@ -0,0 +1,47 @@
+import pytest
+
+from chemic.batch import annotate, annotate_file, annotate_many
+
+
+def test_annotate():
+    annotation = annotate("H2O")
+    assert annotation["formula"] == "H2O" and annotation["cas"] is None
+    assert annotation["mass"] == pytest.approx(18.015)
+    assert annotation["name"] == "Water"
+    assert annotation["elements"] == {"H": 2, "O": 1}
+    assert sum(annotation["percent_composition"].values()) == pytest.approx(100)
+
+
+def test_annotate_cas_number():
+    annotation = annotate("7732-18-5")
+    assert (annotation["cas"], annotation["formula"], annotation["name"]) == ("7732-18-5", "H2O", "Water")
+
+
+@pytest.mark.parametrize("formula", ["Xx2", "H2O)", "", None, "50-00-0"])
+def test_annotate_invalid(formula):
+    annotation = annotate(formula)
+    assert annotation["mass"] is None and annotation["elements"] is None
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_annotate_many_keeps_order(workers):
+    formulas = ["H2O", "NaCl", "bad(", "CO2"] * 10
+    annotations = list(annotate_many(iter(formulas), chunksize=3, workers=workers))
+    assert [annotation["formula"] for annotation in annotations] == formulas
+    assert [annotation["mass"] for annotation in annotations] == [
+        annotate(formula)["mass"] for formula in formulas
+    ]
+
+
+def test_annotate_many_chunksize():
+    with pytest.raises(ValueError):
+        list(annotate_many(["H2O"], chunksize=0))
+
+
+def test_annotate_file(tmp_path):
+    path = tmp_path / "formulas.txt"
+    path.write_text("H2O\n\n  NaCl  \n", encoding="utf-8")
+    assert [annotation["name"] for annotation in annotate_file(str(path), workers=1)] == [
+        "Water",
+        "Sodium Chloride",
+    ]
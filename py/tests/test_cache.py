@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+import chemic.isotopes  # noqa: F401
+import chemic.reaction  # noqa: F401
+from chemic.cache import CACHES, LRUCache, cache_stats, named_cache, resize_caches
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 1, "size": 2, "maxsize": 2}
+
+
+def test_lru_cache_resize_and_clear():
+    cache = LRUCache(maxsize=3)
+    for key in "abc":
+        cache.put(key, key)
+    cache.resize(1)
+    assert len(cache) == 1 and "c" in cache
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "maxsize": 1}
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+    assert cache.get("a", "missing") == "missing"
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=-1)
+
+
+def test_lru_cache_is_thread_safe():
+    cache = LRUCache(maxsize=64)
+
+    def work(offset):
+        for i in range(2000):
+            cache.put((offset + i) % 100, i)
+            cache.get(i % 100)
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 64
+
+
+def test_named_cache(monkeypatch):
+    monkeypatch.setenv("CHEMIC_TEST_CACHE_SIZE", "3")
+    cache = named_cache("test", "CHEMIC_TEST_CACHE_SIZE")
+    try:
+        assert CACHES["test"] is cache and cache.maxsize == 3
+        cache.put("a", 1)
+        assert cache_stats()["test"]["size"] == 1
+    finally:
+        del CACHES["test"]
+
+
+def test_every_cache_has_its_own_setting():
+    assert {"formula", "species", "isotope"} <= set(CACHES)
+    sizes = {name: cache.maxsize for name, cache in CACHES.items()}
+    try:
+        resize_caches(5)
+        assert all(stats["maxsize"] == 5 for stats in cache_stats().values())
+    finally:
+        for name, size in sizes.items():
+            CACHES[name].resize(size)
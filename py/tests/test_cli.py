@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+
+import pytest
+
+from chemic.__main__ import main
+
+
+def _annotate(tmp_path, capsys, name, text, *options):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    main(["annotate", str(path), *options])
+    return capsys.readouterr().out
+
+
+def test_annotate_csv(tmp_path, capsys):
+    output = _annotate(tmp_path, capsys, "in.csv", "id,formula\n1,H2O\n2,NaCl\n3,bad(\n")
+    rows = list(csv.DictReader(io.StringIO(output)))
+    assert list(rows[0]) == ["id", "formula", "molar_mass", "formula_name", "element_counts", "percent_composition"]
+    assert [row["formula_name"] for row in rows] == ["Water", "Sodium Chloride", ""]
+    assert rows[0]["element_counts"] == "H:2;O:1"
+    assert float(rows[1]["molar_mass"]) == pytest.approx(58.44)
+    assert rows[2]["molar_mass"] == ""
+
+
+def test_annotate_tsv_by_cas_number(tmp_path, capsys):
+    output = _annotate(tmp_path, capsys, "in.tsv", "CAS\tnote\n7732-18-5\twater\n")
+    rows = list(csv.DictReader(io.StringIO(output), delimiter="\t"))
+    assert rows[0]["formula_name"] == "Water" and rows[0]["note"] == "water"
+
+
+def test_annotate_jsonl(tmp_path, capsys):
+    output = _annotate(tmp_path, capsys, "in.jsonl", '{"formula": "H2O"}\n\n"CO2"\n')
+    rows = [json.loads(line) for line in output.splitlines()]
+    assert rows[0]["element_counts"] == {"H": 2, "O": 1}
+    assert rows[1]["formula"] == "CO2" and rows[1]["formula_name"] == "Carbon Dioxide"
+
+
+def test_annotate_jsonl_to_csv_with_varying_keys(tmp_path, capsys):
+    text = '{"formula": "H2O", "a": 1}\n{"formula": "CO2", "b": 2}\n{"c": 3, "formula": "NaCl"}\n'
+    output = _annotate(tmp_path, capsys, "in.jsonl", text, "--output-format", "csv")
+    rows = list(csv.DictReader(io.StringIO(output)))
+    assert list(rows[0])[:2] == ["formula", "a"]
+    assert [(row["formula"], row["a"], row["formula_name"]) for row in rows] == [
+        ("H2O", "1", "Water"),
+        ("CO2", "", "Carbon Dioxide"),
+        ("NaCl", "", "Sodium Chloride"),
+    ]
+
+
+def test_annotate_csv_with_extra_cells(tmp_path, capsys):
+    output = _annotate(tmp_path, capsys, "in.csv", "formula\nH2O\nCO2,extra\n")
+    rows = list(csv.DictReader(io.StringIO(output)))
+    assert [row["formula_name"] for row in rows] == ["Water", "Carbon Dioxide"]
+    assert None not in rows[0]
+
+
+def test_annotate_missing_column(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        _annotate(tmp_path, capsys, "in.csv", "formula\nH2O\n", "--column", "smiles")
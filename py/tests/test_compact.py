@@ -0,0 +1,101 @@
+import pickle
+
+import pytest
+
+from chemic.compact import MAX_COUNT, CompactFormula, pack_elements
+from chemic.main import FORMULA_CACHE, Element, Formula
+
+
+def test_compact_formula():
+    formula = CompactFormula("C6H12O6")
+    assert formula.pairs == ((1, 12), (6, 6), (8, 6))
+    assert formula.elements == {"H": 12, "C": 6, "O": 6}
+    assert formula.mass == pytest.approx(Formula("C6H12O6").mass)
+    assert formula.count == 24
+    assert len(formula) == 3 and formula["C"] == 6 and "O" in formula
+    assert str(formula) == "C6H12O6"
+    assert str(formula.to_formula()) == "C6H12O6"
+    assert str(CompactFormula("H4C").to_formula()) == Formula("H4C").canonical == "CH4"
+    assert repr(CompactFormula("H2O")) == "CompactFormula('H2O')"
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["H2O", "OH2", " H2O ", "HOH", {"H": 2, "O": 1}, {Element("O"): 1, "H": 2}, Formula("H2O")],
+)
+def test_compact_formula_inputs(value):
+    assert CompactFormula(value) == CompactFormula("H2O")
+    assert hash(CompactFormula(value)) == hash(CompactFormula("H2O"))
+
+
+def test_compact_formula_from_element_and_key():
+    assert CompactFormula(Element("O")).pairs == ((8, 1),)
+    formula = CompactFormula("NaCl")
+    assert CompactFormula.from_key(formula.key) == formula
+    assert CompactFormula(formula) == formula
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["bad(", "Xx", "2", 5, None, {"H": -1}, {"H": 0.5}, {"H": MAX_COUNT + 1}, "CaSO4·0.5H2O", f"C{MAX_COUNT + 1}"],
+)
+def test_invalid_compact_formula(value):
+    with pytest.raises(ValueError):
+        CompactFormula(value)
+
+
+def test_compact_formula_is_immutable_and_pickles():
+    formula = CompactFormula("H2O")
+    with pytest.raises(AttributeError):
+        formula.key = b""
+    assert pickle.loads(pickle.dumps(formula)) == formula
+
+
+def test_equality_with_formula_is_symmetric():
+    compact, formula = CompactFormula("H2O"), Formula("OH2")
+    assert compact == formula and formula == compact
+    assert not (compact != formula) and not (formula != compact)
+    assert CompactFormula("H2O") != Formula("H2O2") and Formula("H2O2") != CompactFormula("H2O")
+    assert hash(compact) == hash(formula)
+    assert len({compact, formula}) == 1 and len({formula, compact}) == 1
+
+
+def test_formula_equality_with_other_types():
+    assert Formula("H2O") != "H2O"
+    assert not Formula("H2O") == 18
+    assert CompactFormula("H2O") != "H2O"
+
+
+def test_compact_formulas_deduplicate_and_sort():
+    formulas = {CompactFormula(value) for value in ["H2O", "OH2", "CO2", "O2C", "NaCl"]}
+    assert len(formulas) == 3
+    assert sorted(formulas)[0] == CompactFormula("H2O")
+
+
+def test_pack_elements():
+    assert pack_elements({"O": 1, "H": 2}) == pack_elements({"H": 2, "O": 1})
+    with pytest.raises(ValueError):
+        pack_elements({"H": 1.5})
+
+
+def test_counts_that_do_not_fit_a_packed_key():
+    assert CompactFormula({"C": MAX_COUNT}).pairs == ((6, MAX_COUNT),)
+    with pytest.raises(ValueError):
+        pack_elements({"C": MAX_COUNT, Element("C"): 1})
+    with pytest.raises(ValueError):
+        CompactFormula(Formula({"C": MAX_COUNT + 1}))
+    with pytest.raises(ValueError):
+        CompactFormula.from_key(Formula("CaSO4·0.5H2O").key)
+
+
+@pytest.mark.parametrize("key", [b"\x01", b"\x00\x01\x00\x00\x00", b"\x08\x01\x00\x00\x00\x01\x02\x00\x00\x00"])
+def test_invalid_packed_keys(key):
+    with pytest.raises(ValueError):
+        CompactFormula.from_key(key)
+
+
+def test_compact_formulas_share_the_formula_cache():
+    FORMULA_CACHE.clear()
+    key = CompactFormula(" CH4 ").key
+    assert Formula("CH4")._properties[0] == key
+    assert CompactFormula("CH4").key is key
@@ -0,0 +1,107 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from chemic import data, main
+
+
+def _imported_modules(statement):
+    """Run a statement in a fresh interpreter and list the modules it imported."""
+    process = subprocess.run(
+        [sys.executable, "-c", f"{statement}\nimport sys\nprint(' '.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(process.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "statement",
+    ["import chemic", "import chemic.main", "from chemic.utils import parse_formula"],
+)
+def test_import_is_lightweight(statement):
+    modules = _imported_modules(statement)
+    assert not {"pandas", "numpy", "nicegui", "pydash", "chemic.run"} & modules
+
+
+def test_tables_load_on_first_use():
+    modules = _imported_modules(
+        "import chemic.main\nassert chemic.main.Formula('H2O').name == 'Water'"
+    )
+    assert "chemic.main" in modules and "nicegui" not in modules
+
+
+def test_lazy_module_attributes():
+    assert main.ELEMENTS_BY_SYMBOL["H"].number == 1
+    assert "Formula" in main.FORMULA_TABLE.columns
+    with pytest.raises(AttributeError):
+        main.NOT_A_TABLE
+
+
+def test_load_table_is_cached():
+    assert data.load_table("periodic_table") is data.load_table("periodic_table")
+    with pytest.raises(FileNotFoundError):
+        data.load_table("no_such_table")
+
+
+@pytest.fixture
+def compact_backend():
+    backend = data.get_backend()
+    data.set_backend("compact")
+    yield
+    data.set_backend(backend)
+
+
+def _same(a, b):
+    return a == b or (a != a and b != b)
+
+
+@pytest.mark.parametrize("name", ["periodic_table", "common_formulas", "isotopes"])
+def test_compact_table_matches_pandas(name):
+    compact = data.load_table(name, backend="compact")
+    frame = data.load_table(name, backend="pandas")
+    assert compact.shape == frame.shape
+    assert compact.columns == list(frame.columns)
+    for compact_row, frame_row in zip(compact.to_dict("records"), frame.to_dict("records")):
+        assert compact_row.keys() == frame_row.keys()
+        assert all(_same(compact_row[key], frame_row[key]) for key in compact_row), compact_row
+
+
+def test_compact_table_column_types():
+    table = data.load_table("periodic_table", backend="compact")
+    assert table["AtomicNumber"].typecode == "q"
+    assert table["AtomicMass"].typecode == "d"
+    assert table["Symbol"][:3] == ("H", "He", "Li")
+    with pytest.raises(ValueError):
+        table.to_dict("list")
+    with pytest.raises(ValueError):
+        data.CompactTable({"a": [1, 2], "b": [1]})
+
+
+def test_set_backend_reloads_everything(compact_backend):
+    assert data.get_backend() == "compact"
+    assert isinstance(data.load_table("periodic_table"), data.CompactTable)
+    assert main.Formula("H2O").mass == pytest.approx(18.015)
+    assert main.get_formula_name("H2O") == "water"
+    with pytest.raises(ValueError):
+        data.set_backend("polars")
+
+
+def test_compact_backend_does_not_need_pandas():
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\nsys.modules['pandas'] = None\n"
+            "from chemic.main import Formula, get_formula_by_name\n"
+            "print(Formula('H2O').name, get_formula_by_name('water'))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "CHEMIC_BACKEND": "compact"},
+    )
+    assert process.stdout.split() == ["Water", "H2O"]
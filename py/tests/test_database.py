@@ -0,0 +1,139 @@
+import json
+import sqlite3
+
+import pytest
+
+from chemic import data
+from chemic.database import (
+    CompoundDatabase,
+    build_database,
+    canonical_formula,
+    clean_name,
+    compound_database,
+    read_records,
+    table_records,
+)
+from chemic.main import Formula, formula_key, get_formula_by_cas, get_formula_by_name, get_formula_name
+
+TABLE = [
+    {"formula": "H2O", "names": ["water", "oxidane"], "cas": "7732-18-5"},
+    {"formula": "CH3CH2OH", "names": ["ethanol"], "cas": "64-17-5"},
+    {"formula": "SO4 2-", "names": ["sulfate"], "cas": None},
+]
+SCRAPED = [
+    {"formula": "OH2", "names": ["Water", "dihydrogen monoxide"], "cas": "7732-18-5", "inchi_key": "XLYOFNOQVPJJNP-UHFFFAOYSA-N"},
+    {"formula": "C2H6O", "names": ["Dimethyl ether"], "cas": "115-10-6"},
+    {"formula": "C6H6", "names": ["Benzene", "Benzol"], "cas": None},
+    {"formula": "C6H6", "names": ["benzene"], "cas": "bad-cas"},
+    {"formula": "", "names": ["nothing"], "cas": "50-00-0"},
+]
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = build_database([("table", TABLE), ("webbook", SCRAPED)], str(tmp_path / "compounds.sqlite"))
+    database = CompoundDatabase(path)
+    yield database
+    database.close()
+
+
+def test_clean_name():
+    assert clean_name(" Nitrous oxide (<sup>14</sup>N<sub>2</sub>O) ") == "Nitrous oxide (14N2O)"
+    assert clean_name("HC&eth;CNO  radical") == "HCðCNO radical"
+    assert clean_name("Tetracyclo[4.2.2.2<sup>2,5</sup>.0<sup>1,6</sup>]dodecane") == "Tetracyclo[4.2.2.2^{2,5}.0^{1,6}]dodecane"
+
+
+def test_canonical_formula():
+    assert canonical_formula("CH3CH2OH") == ("C2H6O", formula_key({"C": 2, "H": 6, "O": 1}), 0)
+    assert canonical_formula("SO4 2-") == ("O4S", formula_key({"S": 1, "O": 4}), -2)
+    assert canonical_formula("bad(") == (None, None, 0)
+
+
+def test_records_merge_by_cas_number(database):
+    assert len(database) == 5
+    water = database.by_cas("7732-18-5")
+    assert (water["formula"], water["canonical"], water["name"]) == ("H2O", "H2O", "water")
+    assert water["inchi_key"] == "XLYOFNOQVPJJNP-UHFFFAOYSA-N"
+    assert water["sources"] == "table,webbook"
+    assert water["mass"] == pytest.approx(Formula("H2O").mass)
+    assert database.names(water) == ["water", "oxidane", "dihydrogen monoxide"]
+    assert database.by_cas(" 64-17-5 ")["name"] == "ethanol"
+    assert database.by_cas("50-00-0") is None
+
+
+def test_records_without_cas_numbers_merge_by_formula_and_name(database):
+    benzene = database.by_formula("C6H6")
+    assert len(benzene) == 1
+    assert benzene[0]["cas"] is None
+    assert database.names(benzene[0]) == ["Benzene", "Benzol"]
+
+
+def test_lookups(database):
+    assert [compound["cas"] for compound in database.by_formula("OH2")] == ["7732-18-5"]
+    assert [compound["cas"] for compound in database.by_formula("C2H6O")] == ["64-17-5", "115-10-6"]
+    assert len(database.by_formula("C2H6O", limit=1)) == 1
+    assert database.by_formula("SO4 2-")[0]["name"] == "sulfate"
+    assert database.by_formula("SO4") == []
+    assert database.by_formula("bad(") == []
+    assert database.by_name("DIHYDROGEN  monoxide")[0]["cas"] == "7732-18-5"
+    assert database.by_name("unknown") == []
+    assert database.by_inchi_key("XLYOFNOQVPJJNP-UHFFFAOYSA-N")[0]["formula"] == "H2O"
+    assert [compound["formula"] for compound in database.by_mass(46.07, tolerance=0.01)] == ["CH3CH2OH", "C2H6O"]
+
+
+def test_database_is_read_only(database):
+    with pytest.raises(sqlite3.OperationalError):
+        database._connection.execute("DELETE FROM compounds")
+
+
+def test_missing_database(tmp_path):
+    with pytest.raises(ValueError):
+        CompoundDatabase(str(tmp_path / "missing.sqlite"))
+    assert compound_database(str(tmp_path / "missing.sqlite")) is None
+    assert compound_database() is None
+
+
+def test_read_records(tmp_path):
+    table = tmp_path / "formulae.csv"
+    table.write_text('Formula,Names,CAS\nH2O,"water\n\noxidane",7732-18-5\n', encoding="utf-8")
+    species = tmp_path / "species.txt"
+    species.write_text("methane\tCH4\t74-82-8\nbroken\tCH4\n", encoding="utf-8")
+    scraped = tmp_path / "records.jsonl"
+    scraped.write_text(
+        json.dumps({"formula": "C2H6", "name": "Ethane", "other_names": ["Bimethyl"], "cas_number": "74-84-0", "inchi_key": "K"})
+        + "\n\n",
+        encoding="utf-8",
+    )
+    assert read_records(table) == [{"formula": "H2O", "names": ["water", "oxidane"], "cas": "7732-18-5"}]
+    assert read_records(species) == [{"formula": "CH4", "names": ["methane"], "cas": "74-82-8"}]
+    assert read_records(scraped) == [
+        {"formula": "C2H6", "names": ["Ethane", "Bimethyl"], "cas": "74-84-0", "inchi": None, "inchi_key": "K"}
+    ]
+
+
+def test_table_records():
+    water = next(record for record in table_records() if record["cas"] == "7732-18-5")
+    assert water["formula"] == "H2O" and "water" in water["names"]
+
+
+def test_lookups_fall_back_to_the_database(tmp_path, monkeypatch):
+    records = [{"formula": "C10H18N2", "names": ["1,5-Diazatricyclo[4.2.2.2<sup>2,5</sup>]dodecane"], "cas": "100098-23-5"}]
+    path = build_database([("webbook", records + SCRAPED)], str(tmp_path / "fallback.sqlite"))
+    monkeypatch.setenv("CHEMIC_DATABASE", path)
+    assert get_formula_by_cas("100098-23-5") == "C10H18N2"
+    assert get_formula_name("100098-23-5") == "1,5-Diazatricyclo[4.2.2.2^{2,5}]dodecane"
+    assert get_formula_by_name("1,5-diazatricyclo[4.2.2.2^{2,5}]dodecane") == "C10H18N2"
+    assert get_formula_name("N2C10H18") == get_formula_name("100098-23-5")
+    assert get_formula_by_cas("7732-18-5") == "H2O"
+
+
+def test_missing_database_is_remembered_until_reload(tmp_path, monkeypatch):
+    path = str(tmp_path / "later.sqlite")
+    monkeypatch.setenv("CHEMIC_DATABASE", path)
+    assert get_formula_by_cas("100098-23-5") is None
+    build_database([("webbook", [{"formula": "C10H18N2", "names": ["Diazatricyclododecane"], "cas": "100098-23-5"}])], path)
+    assert get_formula_by_cas("100098-23-5") is None
+    backend = data.get_backend()
+    data.set_backend("compact" if backend == "pandas" else "pandas")
+    data.set_backend(backend)
+    assert get_formula_by_cas("100098-23-5") == "C10H18N2"
@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The WebBook scraper lives in utils/fetch, outside the chemic package.
+FETCH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "utils", "fetch")
+sys.path.insert(0, FETCH)
+
+from extract import Species, extract  # noqa: E402
+
+CORPUS = os.path.join(FETCH, "corpus")
+with open(os.path.join(CORPUS, "expected.json"), encoding="utf-8") as file:
+    EXPECTED = json.load(file)
+with open(os.path.join(CORPUS, "100-00-5.html"), encoding="utf-8") as file:
+    SAMPLE = file.read()
+
+
+@pytest.mark.parametrize("filename", sorted(EXPECTED))
+def test_corpus(filename):
+    with open(os.path.join(CORPUS, filename), "rb") as file:
+        assert extract(file.read()).to_dict() == EXPECTED[filename]
+
+
+def test_extract_accepts_text():
+    assert extract(SAMPLE) == extract(SAMPLE.encode("utf-8"))
+
+
+def test_names_keep_their_markup():
+    name = "1,5-Diazatricyclo[4.2.2.2<sup>2,5</sup>]dodecane"
+    page = SAMPLE.replace("Benzene, 1-chloro-4-nitro-", name)
+    page = page.replace("p-Chloronitrobenzene;", f"HC&eth;CNO  <sub>2</sub>; {name};")
+    species = extract(page)
+    assert species.name == name
+    assert species.other_names[:3] == ["HC&eth;CNO <sub>2</sub>", name, "p-Nitrochlorobenzene"]
+    assert species.other_names[-1] == "NSC 9792"
+
+
+def test_structure_formula_wins():
+    page = SAMPLE.replace("<img alt=C6H4ClNO2", "<img alt='C6H4Cl(NO2)'")
+    assert extract(page).formula == "C6H4Cl(NO2)"
+
+
+def test_missing_fields():
+    assert extract(b"") == Species()
+    assert extract(b"<h1 id=Top>Water</h1><strong>Molecular weight:</strong> n/a") == Species(name="Water")
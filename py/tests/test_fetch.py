@@ -0,0 +1,88 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# The WebBook fetcher lives in utils/fetch, outside the chemic package.
+FETCH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "utils", "fetch")
+sys.path.insert(0, FETCH)
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("commoner")
+
+import fetch  # noqa: E402
+from fake_webbook import STATS, fake_webbook  # noqa: E402
+
+SPECIES = {
+    "64-17-5": ("Ethanol", "C2H6O"),
+    "115-10-6": ("Dimethyl ether", "C2H6O"),
+    "71-43-2": ("Benzene", "C6H6"),
+    "7732-18-5": ("Water", "H2O"),
+}
+
+
+@pytest.fixture
+def species_path(tmp_path):
+    path = tmp_path / "species.txt"
+    with open(path, "w") as file:
+        for cas, (name, formula) in SPECIES.items():
+            file.write(f"{name}\t{formula}\t{cas}\n")
+        file.write("Unknown\tXx\t50-00-0\n")
+        file.write("No CAS number\tH2\tN/A\n")
+    return str(path)
+
+
+async def _run(tmp_path, species_path, **options):
+    async with fake_webbook(species=SPECIES, **options) as (root, app):
+        counts = await fetch.run(
+            species_path,
+            str(tmp_path / "images"),
+            str(tmp_path / "checkpoint.sqlite"),
+            root,
+            concurrency=4,
+            rate=10_000,
+            failed_path=None,
+        )
+        return counts, app[STATS]["requests"]
+
+
+def test_fetch_writes_records_and_images(tmp_path, species_path, monkeypatch):
+    monkeypatch.setattr(fetch, "BACKOFF", 0)
+    counts, _ = asyncio.run(_run(tmp_path, species_path, failure_rate=0.2))
+    assert counts == {"success": 4, "failed": 1, "error": 0, "skipped": 0}
+    # Isomers get an image each, named by CAS number.
+    assert sorted(os.listdir(tmp_path / "images")) == sorted(f"{cas}.png" for cas in SPECIES)
+    checkpoint = fetch.Checkpoint(str(tmp_path / "checkpoint.sqlite"))
+    assert checkpoint.export(str(tmp_path / "records.jsonl")) == 4
+    assert checkpoint.done() == set(SPECIES) | {"50-00-0"}
+    checkpoint.close()
+    with open(tmp_path / "records.jsonl", encoding="utf-8") as file:
+        records = {record["cas_number"]: record for record in map(json.loads, file)}
+    assert {cas: (record["name"], record["formula"]) for cas, record in records.items()} == SPECIES
+
+
+def test_fetch_resumes_without_requests(tmp_path, species_path):
+    asyncio.run(_run(tmp_path, species_path))
+    counts, requests = asyncio.run(_run(tmp_path, species_path))
+    assert counts == {"success": 0, "failed": 0, "error": 0, "skipped": 5}
+    assert requests == 0
+
+
+def test_fetch_counts_errors_and_retries_them(tmp_path, species_path, monkeypatch):
+    monkeypatch.setattr(fetch, "BACKOFF", 0)
+    counts, _ = asyncio.run(_run(tmp_path, species_path, failure_rate=1.0))
+    assert counts["error"] == 5 and counts["success"] == 0
+    counts, _ = asyncio.run(_run(tmp_path, species_path))
+    assert counts == {"success": 4, "failed": 1, "error": 0, "skipped": 0}
+
+
+def test_import_failed(tmp_path):
+    failed = tmp_path / "failed.txt"
+    failed.write_text("50-00-0\n\n64-17-5\n")
+    checkpoint = fetch.Checkpoint(str(tmp_path / "checkpoint.sqlite"))
+    checkpoint.import_failed(str(failed))
+    assert checkpoint.done() == {"50-00-0", "64-17-5"}
+    assert len(checkpoint) == 2
+    checkpoint.close()
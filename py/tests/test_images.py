@@ -0,0 +1,87 @@
+import hashlib
+
+import pytest
+
+from chemic.images import ImageStore, image_directory_entries, structure_image, write_image_store
+
+BENZENE = b"\x89PNG benzene"
+ETHANOL = b"\x89PNG ethanol"
+DIMETHYL_ETHER = b"\x89PNG dimethyl ether"
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    entries = [
+        (ETHANOL, "C2H6O", "64-17-5"),
+        (DIMETHYL_ETHER, "C2H6O", "115-10-6"),
+        (BENZENE, "C6H6", "71-43-2"),
+        (BENZENE, "C6H6", None),
+        (ETHANOL, None, "64-17-5"),
+    ]
+    return write_image_store(entries, str(tmp_path / "images.pack"))
+
+
+def test_store_deduplicates_images(store_path):
+    with ImageStore(store_path) as store:
+        assert len(store) == 3
+        assert store.verify() == []
+
+
+def test_isomers_keep_their_own_images(store_path):
+    with ImageStore(store_path) as store:
+        assert bytes(store.get("64-17-5")) == ETHANOL
+        assert bytes(store.get("115-10-6")) == DIMETHYL_ETHER
+        assert [bytes(image) for image in store.formula_images("C2H6O")] == [ETHANOL, DIMETHYL_ETHER]
+        assert bytes(store.get("C2H6O")) == ETHANOL
+        assert store.formula_images("C6H6") == [BENZENE]
+        assert store.get("H2O") is None and store.formula_images("H2O") == []
+        assert "C6H6" in store and "71-43-2" in store and "H2O" not in store
+
+
+def test_digests(store_path):
+    digest = hashlib.sha256(BENZENE).hexdigest()
+    with ImageStore(store_path) as store:
+        assert store.digest("71-43-2") == store.digest("C6H6") == digest
+        assert store.digest("H2O") is None
+        assert bytes(store.by_digest(digest)) == BENZENE
+        assert store.by_digest("00" * 32) is None
+        assert store.by_digest("not hex") is None
+
+
+def test_verify_finds_corrupt_images(store_path):
+    with open(store_path, "rb") as file:
+        data = bytearray(file.read())
+    data[data.index(ETHANOL) + 5] ^= 0xFF
+    with open(store_path, "wb") as file:
+        file.write(data)
+    with ImageStore(store_path) as store:
+        assert store.verify() == [hashlib.sha256(ETHANOL).hexdigest()]
+
+
+def test_invalid_stores(tmp_path):
+    path = tmp_path / "images.pack"
+    path.write_bytes(b"CHEMIMGS")
+    with pytest.raises(ValueError):
+        ImageStore(str(path))
+    path.write_bytes(b"NOTASTORE" + b"\0" * 32)
+    with pytest.raises(ValueError):
+        ImageStore(str(path))
+
+
+def test_image_directory_entries(tmp_path):
+    (tmp_path / "64-17-5.png").write_bytes(ETHANOL)
+    (tmp_path / "C6H6.PNG").write_bytes(BENZENE)
+    (tmp_path / "notes.txt").write_text("not an image")
+    assert image_directory_entries(str(tmp_path)) == [
+        (str(tmp_path / "64-17-5.png"), None, "64-17-5"),
+        (str(tmp_path / "C6H6.PNG"), "C6H6", None),
+    ]
+    path = write_image_store(image_directory_entries(str(tmp_path)), str(tmp_path / "images.pack"))
+    with ImageStore(path) as store:
+        assert bytes(store.get("64-17-5")) == ETHANOL and bytes(store.get("C6H6")) == BENZENE
+
+
+def test_structure_image(store_path, tmp_path):
+    assert bytes(structure_image("71-43-2", store_path)) == BENZENE
+    assert structure_image("71-43-2", str(tmp_path / "missing.pack")) is None
+    assert structure_image("71-43-2") is None
@@ -0,0 +1,80 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from chemic.isotopes import (
+    isotopic_distribution,
+    isotopic_distributions,
+    monoisotopic_mass,
+    monoisotopic_masses,
+)
+from chemic.main import Formula
+
+CHLORINE = [(34.968852682, 0.7576), (36.965902602, 0.2424)]
+CARBON = [(12.0, 0.9893), (13.00335483507, 0.0107)]
+
+
+def test_monoisotopic_mass():
+    assert monoisotopic_mass("H2O") == pytest.approx(18.010565, abs=1e-6)
+    assert monoisotopic_mass(Formula("C6H12O6")) == pytest.approx(180.063388, abs=1e-6)
+    assert monoisotopic_mass({"C": 1, "O": 2}) == pytest.approx(43.989829, abs=1e-6)
+
+
+@pytest.mark.parametrize("formula", ["bad(", "Og", "CaSO4·0.5H2O"])
+def test_invalid_monoisotopic_mass(formula):
+    with pytest.raises(ValueError):
+        monoisotopic_mass(formula)
+
+
+def test_monoisotopic_masses():
+    masses = monoisotopic_masses(["H2O", "Og", "bad(", "CO2", "H2O"])
+    assert masses[[0, 3, 4]] == pytest.approx([18.010565, 43.989829, 18.010565], abs=1e-6)
+    assert np.isnan(masses[[1, 2]]).all()
+    assert monoisotopic_masses("H2O") == pytest.approx([18.010565], abs=1e-6)
+
+
+def _brute_force(isotopes):
+    """Combine every isotope of every atom, binned by nominal mass."""
+    peaks = {}
+    for combination in itertools.product(*isotopes):
+        mass = sum(isotope_mass for isotope_mass, _ in combination)
+        probability = math.prod(abundance for _, abundance in combination)
+        total, weighted = peaks.get(round(mass), (0, 0))
+        peaks[round(mass)] = (total + probability, weighted + probability * mass)
+    return (
+        [weighted / total for _, (total, weighted) in sorted(peaks.items())],
+        [total for _, (total, _) in sorted(peaks.items())],
+    )
+
+
+@pytest.mark.parametrize(
+    "formula, isotopes",
+    [
+        ("Cl2", [CHLORINE] * 2),
+        ("C3Cl", [CARBON] * 3 + [CHLORINE]),
+        ("C5", [CARBON] * 5),
+    ],
+)
+def test_isotopic_distribution(formula, isotopes):
+    masses, probabilities = isotopic_distribution(formula, threshold=0)
+    expected_masses, expected_probabilities = _brute_force(isotopes)
+    assert masses == pytest.approx(expected_masses)
+    assert probabilities == pytest.approx(expected_probabilities)
+
+
+def test_isotopic_distribution_prunes_small_peaks():
+    masses, probabilities = isotopic_distribution("C1000H2000")
+    assert probabilities.sum() == pytest.approx(1)
+    assert probabilities.min() >= 1e-9 * probabilities.max()
+    assert (np.diff(masses) > 0).all()
+    assert len(isotopic_distribution("C1000H2000", threshold=1e-3)[0]) < len(masses)
+
+
+def test_isotopic_distributions():
+    distributions = isotopic_distributions(["CO2", "bad(", "Og"], threshold=1e-3)
+    assert distributions[1:] == [None, None]
+    masses, probabilities = distributions[0]
+    assert masses.round(4).tolist() == [43.9898, 44.9932, 45.9941]
+    assert probabilities.round(4).tolist() == [0.9845, 0.0114, 0.0041]
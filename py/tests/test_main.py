@@ -0,0 +1,195 @@
+import pickle
+
+import pytest
+
+from chemic.data import load_table
+from chemic.main import (
+    FORMULA_CACHE,
+    Element,
+    Formula,
+    get_formula_by_cas,
+    get_formula_by_name,
+    get_formula_name,
+    iselement,
+    lookup_element,
+)
+
+
+@pytest.mark.parametrize("attribute", ["Fe", "iron", "Iron", "IRON", "fe", 26, "26", 55.84])
+def test_element_lookup(attribute):
+    assert Element(attribute) is Element("Fe")
+
+
+def test_element_attributes():
+    iron = Element("Fe")
+    assert (iron.symbol, iron.name, iron.number, iron.mass) == ("Fe", "Iron", 26, 55.84)
+    assert iron.data["AtomicNumber"] == 26
+    assert iron["Symbol"] == "Fe"
+
+
+@pytest.mark.parametrize("attribute", ["Xx", "", "0", 0, 119, None, 1.5])
+def test_unknown_element(attribute):
+    assert lookup_element(attribute) is None
+    assert not iselement(attribute)
+    with pytest.raises(ValueError):
+        Element(attribute)
+
+
+def test_element_is_immutable():
+    with pytest.raises(AttributeError):
+        Element("H").mass = 2
+    with pytest.raises(TypeError):
+        Element("H").data["AtomicMass"] = 2
+
+
+def test_element_pickles_to_the_shared_instance():
+    assert pickle.loads(pickle.dumps(Element("O"))) is Element("O")
+
+
+def test_element_order():
+    assert Element("H") < Element("He") <= Element("He") < Element("Li")
+    assert sorted([Element("O"), Element("C"), Element("H")]) == [Element("H"), Element("C"), Element("O")]
+
+
+@pytest.mark.parametrize(
+    "formula, name",
+    [
+        ("H2O", "water"),
+        ("OH2", "water"),
+        ("Ba(OH)2", "barium hydroxide"),
+        ("7732-18-5", "water"),
+        ("XyZ", None),
+        ("H2O)", None),
+        (None, None),
+    ],
+)
+def test_get_formula_name(formula, name):
+    assert get_formula_name(formula) == name
+
+
+def test_get_formula_by_name():
+    assert get_formula_by_name("water") == "H2O"
+    assert get_formula_by_name("  Baryta ") == "Ba(OH)2"
+    assert get_formula_by_name("no such compound") is None
+    assert get_formula_by_name(18) is None
+
+
+def test_get_formula_by_cas():
+    assert get_formula_by_cas("7732-18-5") == "H2O"
+    assert get_formula_by_cas("17194-00-2 ") == "Ba(OH)2"
+    assert get_formula_by_cas("64-17-5") == "CH3CH2OH"
+    assert get_formula_by_cas("50-00-0") is None
+    assert get_formula_by_cas(7732185) is None
+
+
+def test_formula_index_keeps_the_first_row():
+    formulas = load_table("common_formulas").to_dict("records")
+    first = next(record for record in formulas if record["Formula"] == "AlCl3")
+    assert get_formula_name("AlCl3") == first["Names"].split("\n")[0].strip()
+
+
+def test_formula_properties():
+    formula = Formula("C6H12O6")
+    assert formula.elements == {"C": 6, "H": 12, "O": 6}
+    assert formula.mass == pytest.approx(180.156)
+    assert formula.count == 24
+    assert formula.name == Formula("C6H12O6").name != "Unknown"
+    assert str(formula) == "C6H12O6" and len(formula) == 3 and formula["H"] == 12
+
+
+def test_formula_properties_are_lazy():
+    FORMULA_CACHE.clear()
+    formula = Formula("H2SO4")
+    assert formula._properties == [None, None, None, None]
+    formula.count
+    assert formula._properties[1:] == [None, None, 7]
+
+
+def test_formula_cache_shares_properties():
+    FORMULA_CACHE.clear()
+    Formula("NaCl").mass
+    assert Formula("NaCl")._properties[1] == pytest.approx(58.44)
+
+
+def test_changing_elements_does_not_leak_into_the_cache():
+    FORMULA_CACHE.clear()
+    changed = Formula("CO2")
+    changed.elements["C"] = 5
+    assert changed.mass == pytest.approx(5 * 12.011 + 2 * 15.999)
+    assert changed.count == 7
+    assert Formula("CO2").mass == pytest.approx(44.009)
+    assert Formula("CO2").count == 3
+    assert Formula("CO2").elements == {"C": 1, "O": 2}
+
+
+def test_arithmetic_does_not_leak_into_the_cache():
+    FORMULA_CACHE.clear()
+    formula = Formula("H2O")
+    formula.mass
+    formula += "O"
+    formula *= 2
+    assert formula.elements == {"H": 4, "O": 4}
+    assert Formula("H2O").mass == pytest.approx(18.015)
+    assert Formula("H2O").elements == {"H": 2, "O": 1}
+
+
+@pytest.mark.parametrize("value", ["bad(", "", "123", "Xx2", None, 5, ["H"]])
+def test_invalid_formula(value):
+    with pytest.raises(ValueError):
+        Formula(value)
+
+
+def test_formula_arithmetic():
+    assert (Formula("CH2") * 3 + "H2O").elements == {"C": 3, "H": 8, "O": 1}
+    assert (2 * Formula("H2O")).elements == {"H": 4, "O": 2}
+    assert ("H2" + Formula("O")).elements == {"O": 1, "H": 2}
+    assert (Formula("H2O") + Element("O")).elements == {"H": 2, "O": 2}
+    assert (Formula("H2O2") - "O").elements == {"H": 2, "O": 1}
+    assert (Formula("H2O") - "H2O").elements == {}
+    assert (Formula("H2O") * 0).elements == {}
+    assert (Element("H") + Element("O")).elements == {"H": 1, "O": 1}
+
+
+def test_formula_arithmetic_returns_new_formulas():
+    water = Formula("H2O")
+    peroxide = water + "O"
+    assert water.elements == {"H": 2, "O": 1} and peroxide.elements == {"H": 2, "O": 2}
+
+
+def test_in_place_arithmetic_updates_properties():
+    formula = Formula("CH4")
+    formula.mass, formula.count
+    formula += "O2"
+    assert formula.mass == pytest.approx(Formula("CH4O2").mass)
+    assert formula.count == 7
+    formula -= "H2"
+    formula *= 3
+    assert formula.elements == {"C": 3, "H": 6, "O": 6}
+    assert formula.mass == pytest.approx(Formula("C3H6O6").mass)
+    assert formula.count == 15
+    assert formula.name == Formula("C3H6O6").name
+
+
+def test_augmented_arithmetic_keeps_hashed_formulas_intact():
+    formula = Formula("H2O")
+    formulas = {formula}
+    formula += "O"
+    assert formula.elements == {"H": 2, "O": 2}
+    assert Formula("H2O") in formulas and formula not in formulas
+    formulas.add(formula)
+    formula *= 2
+    formula -= "H2"
+    assert formulas == {Formula("H2O"), Formula("H2O2")}
+
+
+def test_invalid_formula_arithmetic():
+    with pytest.raises(ValueError):
+        Formula("H2O") - "O2"
+    with pytest.raises(ValueError):
+        Formula("H2O") * -1
+    with pytest.raises(TypeError):
+        Formula("H2O") + 1
+    with pytest.raises(TypeError):
+        Formula("H2O") * "2"
+    with pytest.raises(TypeError):
+        Formula("H2O") * True
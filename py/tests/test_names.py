@@ -0,0 +1,110 @@
+import json
+
+from chemic.names import NameIndex, normalize_name, trigrams
+
+ENTRIES = [
+    ("Water", "H2O"),
+    ("water ", "H2O"),
+    ("glucose", "C6H12O6"),
+    ("sodium chloride", "NaCl"),
+    ("sodium chlorate", "NaClO3"),
+    ("sodium", "Na"),
+    ("", "X"),
+    ("nameless", None),
+]
+
+
+def test_normalize_name():
+    assert normalize_name("  Sodium \t  Chloride\n") == "sodium chloride"
+
+
+def test_trigrams():
+    assert sorted(trigrams("co2")) == ["  c", " co", "co2", "o2 "]
+    assert trigrams("so") <= trigrams("sodium") | {"so "}
+
+
+def test_add_skips_duplicates_and_blanks():
+    index = NameIndex(ENTRIES)
+    assert len(index) == 5
+    index.add("WATER", "H2O")
+    index.add("water", "D2O")
+    assert len(index) == 6
+
+
+def test_search_tolerates_typos():
+    index = NameIndex(ENTRIES)
+    assert index.search("glucsoe") == [("glucose", "C6H12O6", 0.667)]
+    assert index.search("watr")[0][:2] == ("Water", "H2O")
+    assert index.search("sodium chloirde", limit=1)[0][1] == "NaCl"
+    assert index.search("zzzz") == []
+    assert index.search("  ") == []
+    assert NameIndex().search("water") == []
+
+
+def test_search_scores_are_ordered():
+    results = NameIndex(ENTRIES).search("sodium chlor", threshold=0.1)
+    scores = [score for _, _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 < score <= 1 for score in scores)
+
+
+def test_complete():
+    index = NameIndex(ENTRIES)
+    assert index.complete("sodium") == [
+        ("sodium", "Na"),
+        ("sodium chlorate", "NaClO3"),
+        ("sodium chloride", "NaCl"),
+    ]
+    assert index.complete("SODIUM CHL", limit=1) == [("sodium chlorate", "NaClO3")]
+    assert index.complete("sodim chl", limit=2) == [("sodium chloride", "NaCl"), ("sodium chlorate", "NaClO3")]
+    assert index.complete("") == []
+
+
+def test_lookup():
+    index = NameIndex(ENTRIES)
+    assert index.lookup("sodium chloirde") == "NaCl"
+    assert index.lookup("Glucose") == "C6H12O6"
+    assert index.lookup("zzzz") is None
+
+
+def test_exact_lookup():
+    index = NameIndex(ENTRIES)
+    assert index.lookup("  WATER ", exact=True) == "H2O"
+    assert index.lookup("sodium  chloride", exact=True) == "NaCl"
+    assert index.lookup("sodium chloirde", exact=True) is None
+    assert index.lookup("sodium chlor", exact=True) is None
+    assert index.lookup("", exact=True) is None
+    assert NameIndex().lookup("water", exact=True) is None
+
+
+def test_index_stays_current_after_adding():
+    index = NameIndex(ENTRIES)
+    assert index.lookup("ethanol") is None
+    index.add("ethanol", "C2H5OH")
+    assert index.lookup("ethanl") == "C2H5OH"
+    assert index.complete("eth") == [("ethanol", "C2H5OH")]
+
+
+def test_from_file(tmp_path):
+    table = tmp_path / "formulae.csv"
+    table.write_text('Formula,Names\nH2O,"water\noxidane"\n', encoding="utf-8")
+    species = tmp_path / "species.txt"
+    species.write_text("methane\tCH4\t74-82-8\nbroken\n", encoding="utf-8")
+    records = tmp_path / "records.jsonl"
+    records.write_text(
+        json.dumps({"formula": "C2H6", "name": "ethane", "other_names": ["bimethyl"]})
+        + "\n\n"
+        + json.dumps({"formula": None, "name": "unknown"})
+        + "\n",
+        encoding="utf-8",
+    )
+    assert NameIndex.from_file(table).lookup("oxidane") == "H2O"
+    assert len(NameIndex.from_file(species)) == 1
+    index = NameIndex.from_file(records)
+    assert len(index) == 2 and index.lookup("bimethyl") == "C2H6"
+
+
+def test_from_table():
+    index = NameIndex.from_table()
+    assert index.search("glucsoe", limit=1)[0][:2] == ("glucose", "C6H12O6")
+    assert index.complete("sodium chl", limit=2) == [("sodium chlorate", "NaClO3"), ("sodium chloride", "NaCl")]
@@ -0,0 +1,104 @@
+import pytest
+
+from chemic.reaction import (
+    Reaction,
+    balance,
+    balance_many,
+    composition_matrix,
+    nullspace,
+    parse_reaction,
+    parse_species,
+)
+
+
+@pytest.mark.parametrize(
+    "species, expected",
+    [
+        ("Fe2O3", ({"Fe": 2, "O": 3}, 0)),
+        ("2H2O(l)", ({"H": 2, "O": 1}, 0)),
+        ("MnO4-", ({"Mn": 1, "O": 4}, -1)),
+        ("Cu 2+", ({"Cu": 1}, 2)),
+        ("Fe+3", ({"Fe": 1}, 3)),
+        ("Fe3+", ({"Fe": 1}, 3)),
+        ("Fe3+(aq)", ({"Fe": 1}, 3)),
+        ("O2-", ({"O": 1}, -2)),
+        ("[Fe(CN)6]4-", ({"Fe": 1, "C": 6, "N": 6}, -4)),
+        ("NH4+", ({"N": 1, "H": 4}, 1)),
+        ("e-", ({}, -1)),
+    ],
+)
+def test_parse_species(species, expected):
+    assert parse_species(species) == expected
+
+
+@pytest.mark.parametrize("species", ["Xx", "H2O)", "CaSO4·0.5H2O", ""])
+def test_invalid_species(species):
+    with pytest.raises(ValueError):
+        parse_species(species)
+
+
+def test_parse_reaction():
+    assert parse_reaction("2Fe + O2 -> Fe2O3") == (("Fe", "O2"), ("Fe2O3",))
+    assert parse_reaction("Fe3+ + e- = Fe2+") == (("Fe3+", "e-"), ("Fe2+",))
+    assert parse_reaction("H2 + Cl2 ⇌ HCl") == (("H2", "Cl2"), ("HCl",))
+    for equation in ["H2 + O2", "-> H2O", "H2 -> H2O -> O2"]:
+        with pytest.raises(ValueError):
+            parse_reaction(equation)
+
+
+def test_composition_matrix():
+    assert composition_matrix(["H2", "O2"], ["H2O"]) == [[2, 0, -2], [0, 2, -1]]
+    assert composition_matrix(["Fe3+", "e-"], ["Fe2+"]) == [[1, 0, -1], [3, -1, -2]]
+
+
+@pytest.mark.parametrize(
+    "equation, balanced",
+    [
+        ("Fe + O2 -> Fe2O3", "4Fe + 3O2 -> 2Fe2O3"),
+        ("C3H8 + O2 -> CO2 + H2O", "C3H8 + 5O2 -> 3CO2 + 4H2O"),
+        ("KMnO4 + HCl -> KCl + MnCl2 + H2O + Cl2", "2KMnO4 + 16HCl -> 2KCl + 2MnCl2 + 8H2O + 5Cl2"),
+        ("Fe3+ + e- -> Fe2+", "Fe3+ + e- -> Fe2+"),
+        ("Cu + Ag+ -> Cu2+ + Ag", "Cu + 2Ag+ -> Cu2+ + 2Ag"),
+        (
+            "MnO4- + Fe 2+ + H+ -> Mn 2+ + Fe 3+ + H2O",
+            "MnO4- + 5Fe 2+ + 8H+ -> Mn 2+ + 5Fe 3+ + 4H2O",
+        ),
+    ],
+)
+def test_balance(equation, balanced):
+    reaction = balance(equation)
+    assert str(reaction) == balanced
+    assert reaction.is_balanced()
+
+
+def test_reaction_coefficients():
+    reaction = Reaction("H2 + O2 -> H2O")
+    assert not reaction.is_balanced()
+    balanced = reaction.balance()
+    assert balanced.coefficients == (2, 1, 2)
+    assert balanced.reactant_coefficients == (2, 1) and balanced.product_coefficients == (2,)
+    assert balanced == Reaction(["H2", "O2"], ["H2O"], [2, 1, 2])
+    with pytest.raises(ValueError):
+        Reaction(["H2", "O2"], ["H2O"], [2, 1])
+
+
+def test_independent_solutions():
+    reaction = Reaction("H2 + O2 -> H2O + H2O2")
+    assert len(reaction.solutions()) == 2
+    assert reaction.balance().is_balanced()
+
+
+@pytest.mark.parametrize("equation", ["H2 -> O2", "Fe3+ -> Fe2+", "NaCl -> Na + Cl + O"])
+def test_unbalanceable(equation):
+    with pytest.raises(ValueError):
+        balance(equation)
+
+
+def test_balance_many():
+    balanced = balance_many(["H2 + O2 -> H2O", "H2 -> O2", "Xx -> Yy"])
+    assert [str(reaction) if reaction else None for reaction in balanced] == ["2H2 + O2 -> 2H2O", None, None]
+
+
+def test_nullspace():
+    assert nullspace([[2, 0, -2], [0, 2, -1]], 3) == [[2, 1, 2]]
+    assert nullspace([[1, 0], [0, 1]], 2) == []
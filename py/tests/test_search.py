@@ -0,0 +1,153 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from chemic.main import ELEMENTS_BY_SYMBOL, Element, Formula, reconstruct_formula
+from chemic.search import CompositionIndex, MassIndex, enumerate_formulas, read_formula_file
+from chemic.utils import parse_formula
+
+FORMULAS = ["H2O", "CO2", "bad(", "NH3", "D2O", "N2", "CO"]
+NAMES = ["water", "carbon dioxide", "bad", "ammonia", "heavy water", "nitrogen", "carbon monoxide"]
+
+
+def test_mass_index_skips_invalid_formulas():
+    index = MassIndex(FORMULAS, NAMES)
+    assert len(index) == 5
+    assert index.formulas.tolist() == ["NH3", "H2O", "CO", "N2", "CO2"]
+    assert (np.diff(index.masses) >= 0).all()
+    with pytest.raises(ValueError):
+        MassIndex(FORMULAS, NAMES[:2])
+
+
+def test_mass_index_search():
+    index = MassIndex(FORMULAS, NAMES)
+    assert index.search(18.015, tolerance=0.001) == [("H2O", "water", 18.015)]
+    assert [formula for formula, _, _ in index.search(28.0, tolerance=0.05)] == ["CO", "N2"]
+    assert index.search(44.0, ppm=300) == [("CO2", "carbon dioxide", 44.009)]
+    assert index.search(100) == []
+    assert index.range(17, 19) == [("NH3", "ammonia", 17.031), ("H2O", "water", 18.015)]
+
+
+def test_mass_index_search_many():
+    index = MassIndex(FORMULAS, NAMES)
+    masses = [18.015, 28.0, 100, 17.03]
+    assert index.search_many(masses, tolerance=0.05) == [index.search(mass, tolerance=0.05) for mass in masses]
+    assert index.search_many(masses, ppm=2000) == [index.search(mass, ppm=2000) for mass in masses]
+
+
+def test_monoisotopic_mass_index():
+    index = MassIndex(["H2O", "CO2"], monoisotopic=True)
+    assert index.masses == pytest.approx([18.010565, 43.989829], abs=1e-6)
+    assert index.names.tolist() == [None, None]
+
+
+def test_mass_index_from_table():
+    assert MassIndex.from_table().search(18.015, tolerance=0.001) == [("H2O", "water", 18.015)]
+
+
+def test_read_formula_file(tmp_path):
+    table = tmp_path / "formulae.csv"
+    table.write_text('Formula,Names\nH2O,"water\nice"\nCO2,\n', encoding="utf-8")
+    species = tmp_path / "species.txt"
+    species.write_text("water\tH2O\t7732-18-5\nmethane\tCH4\t\nbroken\n", encoding="utf-8")
+    assert read_formula_file(table) == [("H2O", "water"), ("CO2", "")]
+    assert read_formula_file(species) == [("H2O", "water"), ("CH4", "methane")]
+    assert MassIndex.from_file(species).search(16.04, tolerance=0.01) == [("CH4", "methane", 16.043)]
+
+
+def test_enumerate_formulas():
+    assert enumerate_formulas(18.015, tolerance=0.001, elements="HO") == [("H2O", 18.015)]
+    glucose = enumerate_formulas(180.063388, tolerance=0.001, monoisotopic=True)
+    assert glucose[0][0] == "C6H12O6"
+    assert enumerate_formulas(16.04, elements=["C", "H"], limits={"H": 3}) == []
+    assert enumerate_formulas(-5) == []
+    with pytest.raises(ValueError):
+        enumerate_formulas(18, elements="")
+
+
+@pytest.mark.parametrize("mass", [30.0, 46.05, 60.1])
+def test_enumerate_formulas_finds_every_composition(mass):
+    limits = {"C": 4, "H": 10, "O": 3}
+    expected = set()
+    for counts in itertools.product(*(range(limit + 1) for limit in limits.values())):
+        composition = {symbol: count for symbol, count in zip(limits, counts) if count}
+        total = sum(Element(symbol).mass * count for symbol, count in composition.items())
+        if composition and abs(total - mass) <= 0.1:
+            expected.add(reconstruct_formula(composition))
+    found = enumerate_formulas(mass, tolerance=0.1, elements="CHO", limits=limits, chemical=False)
+    assert {formula for formula, _ in found} == expected
+    assert [abs(total - mass) for _, total in found] == sorted(abs(total - mass) for _, total in found)
+
+
+def test_enumerate_formulas_checks_ring_double_bonds():
+    chemical = {formula for formula, _ in enumerate_formulas(16.04, elements="CH")}
+    every = {formula for formula, _ in enumerate_formulas(16.04, elements="CH", chemical=False)}
+    assert chemical == {"CH4"}
+    assert every >= chemical
+    assert enumerate_formulas(15.035, elements="CH") == []
+    assert enumerate_formulas(15.035, elements="CH", chemical=False)[0][0] == "CH3"
+
+
+COMPOUNDS = ["H2O", "H2O2", "CH3Cl", "CCl4", "C2H5OH", "HClO4", "bad(", "NaCl", "C6H12O6", "Xx2"]
+
+
+def _brute_force(contains=(), excludes=(), counts=None, only=None, mass=None):
+    """Filter the compounds one by one, parsing each formula."""
+    matches = []
+    for formula in COMPOUNDS:
+        elements = parse_formula(formula)
+        if not elements or not all(symbol in ELEMENTS_BY_SYMBOL for symbol in elements):
+            continue
+        if any(symbol not in elements for symbol in contains) or any(symbol in elements for symbol in excludes):
+            continue
+        bounded = True
+        for symbol, bounds in (counts or {}).items():
+            low, high = bounds if isinstance(bounds, tuple) else (bounds, bounds)
+            count = elements.get(symbol, 0)
+            bounded &= (low is None or count >= low) and (high is None or count <= high)
+        if not bounded or (only is not None and not set(elements) <= set(only)):
+            continue
+        if mass is not None and not mass[0] <= Formula(elements).mass <= mass[1]:
+            continue
+        matches.append(formula)
+    return matches
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {},
+        {"contains": ["Cl"]},
+        {"contains": ["Cl"], "counts": {"O": (2, None)}},
+        {"excludes": ["C", "Na"]},
+        {"counts": {"H": 2}},
+        {"counts": {"C": (1, 2), "H": (None, 5)}},
+        {"counts": {"O": 0}},
+        {"only": ["H", "O"]},
+        {"only": ["C", "H", "O"], "mass": (40, 200)},
+        {"contains": ["Og"]},
+        {"counts": {"Og": (None, 3)}},
+    ],
+)
+def test_composition_index_query(query):
+    index = CompositionIndex(COMPOUNDS)
+    matches = index.query(**query)
+    assert [formula for formula, _, _ in matches] == _brute_force(**query)
+    query.pop("mass", None)
+    assert index.count(**query) == len(_brute_force(**query))
+
+
+def test_composition_index_rows():
+    index = CompositionIndex(COMPOUNDS, [formula.lower() for formula in COMPOUNDS])
+    assert len(index) == len(COMPOUNDS)
+    assert np.isnan(index.masses[[6, 9]]).all()
+    assert index.query(only=["Na", "Cl"]) == [("NaCl", "nacl", pytest.approx(58.44))]
+    with pytest.raises(ValueError):
+        CompositionIndex(COMPOUNDS, ["water"])
+
+
+def test_composition_index_from_table():
+    index = CompositionIndex.from_table()
+    assert ("H2O", "water", 18.015) in index.query(only=["H", "O"], counts={"O": 1})
+    assert index.count(contains=["Cl"], counts={"O": (2, None)}) > 0
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from chemic import data, snapshot
+
+
+@pytest.fixture
+def extra_csv(tmp_path):
+    path = tmp_path / "extra.csv"
+    path.write_text("Formula,Count\nH2O,3\nCO2,\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, extra_csv):
+    return snapshot.write_snapshot(str(tmp_path / "tables.snapshot"), {"extra": str(extra_csv)})
+
+
+def _rows(table):
+    return [
+        {key: (None if value != value else value) for key, value in row.items()}
+        for row in table.to_dict("records")
+    ]
+
+
+@pytest.mark.parametrize("name", snapshot.BUNDLED_TABLES)
+def test_snapshot_matches_the_csv(snapshot_path, name):
+    loaded = snapshot.Snapshot(snapshot_path).load(name)
+    with snapshot._bundled_csv(name).open(encoding="utf-8", newline="") as file:
+        parsed = data.CompactTable.from_csv(file)
+    assert loaded.columns == parsed.columns
+    assert _rows(loaded) == _rows(parsed)
+
+
+def test_extra_table(snapshot_path):
+    table = snapshot.Snapshot(snapshot_path).load("extra")
+    assert table["Formula"][:] == ("H2O", "CO2")
+    assert _rows(table) == [{"Formula": "H2O", "Count": 3.0}, {"Formula": "CO2", "Count": None}]
+
+
+def test_freshness(snapshot_path, extra_csv):
+    opened = snapshot.Snapshot(snapshot_path)
+    assert all(opened.is_fresh(name) for name in opened.tables)
+    # A new modification time alone does not make a table stale.
+    os.utime(extra_csv, ns=(0, 0))
+    assert opened.is_fresh("extra")
+    # Same size, different contents.
+    extra_csv.write_text("Formula,Count\nH2O,4\nCO2,\n", encoding="utf-8")
+    assert not opened.is_fresh("extra")
+    extra_csv.write_text("Formula,Count\nH2O,3\n", encoding="utf-8")
+    assert not opened.is_fresh("extra")
+
+
+def test_checksum_is_opt_in(snapshot_path):
+    with open(snapshot_path, "r+b") as file:
+        file.seek(-1, os.SEEK_END)
+        last = file.read(1)
+        file.seek(-1, os.SEEK_END)
+        file.write(bytes([last[0] ^ 0xFF]))
+    assert not snapshot.Snapshot(snapshot_path).verify()
+    with pytest.raises(ValueError):
+        snapshot.Snapshot(snapshot_path, verify=True)
+
+
+def test_invalid_snapshot(tmp_path):
+    path = tmp_path / "bad.snapshot"
+    path.write_bytes(b"NOTASNAPSHOT" + b"\x00" * 16)
+    with pytest.raises(ValueError):
+        snapshot.Snapshot(str(path))
+    assert snapshot.load_snapshot_table("periodic_table", str(path)) is None
+
+
+def test_compact_backend_uses_the_snapshot(snapshot_path, monkeypatch):
+    monkeypatch.setenv("CHEMIC_SNAPSHOT", snapshot_path)
+    assert isinstance(
+        snapshot.load_snapshot_table("periodic_table")["Symbol"], snapshot._StringColumn
+    )
+    backend = data.get_backend()
+    data.set_backend("compact")
+    try:
+        assert isinstance(data.load_table("periodic_table")["Symbol"], snapshot._StringColumn)
+    finally:
+        data.set_backend(backend)
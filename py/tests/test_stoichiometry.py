@@ -0,0 +1,82 @@
+import pytest
+
+from chemic.main import Formula
+from chemic.reaction import Reaction
+from chemic.stoichiometry import (
+    balanced_reaction,
+    get_yields,
+    limiting_reagent,
+    species_formula,
+)
+
+
+def test_balanced_reaction():
+    assert balanced_reaction("H2 + O2 -> H2O").coefficients == (2, 1, 2)
+    balanced = Reaction(["H2", "O2"], ["H2O"], [2, 1, 2])
+    assert balanced_reaction(balanced) is balanced
+    with pytest.raises(ValueError):
+        balanced_reaction(["H2", "O2"])
+    with pytest.raises(ValueError):
+        balanced_reaction("H2 -> O2")
+
+
+def test_species_formula():
+    assert species_formula("2Fe2O3(s)") == Formula("Fe2O3")
+    assert species_formula("Cu 2+") == Formula("Cu")
+    assert species_formula("Fe3+") == Formula("Fe")
+    with pytest.raises(ValueError):
+        species_formula("e-")
+
+
+def test_get_yields_from_masses():
+    yields = get_yields("Fe + O2 -> Fe2O3", masses={"Fe": 10, "O2": 10})
+    assert str(yields["reaction"]) == "4Fe + 3O2 -> 2Fe2O3"
+    assert yields["limiting"] == "Fe"
+    iron = 10 / Formula("Fe").mass
+    assert yields["extent"] == pytest.approx(iron / 4)
+    assert yields["products"]["Fe2O3"]["moles"] == pytest.approx(iron / 2)
+    assert yields["products"]["Fe2O3"]["mass"] == pytest.approx(14.3, abs=0.01)
+    assert yields["excess"]["Fe"]["moles"] == 0
+    oxygen = 10 / Formula("O2").mass - 3 * iron / 4
+    assert yields["excess"]["O2"]["mass"] == pytest.approx(oxygen * Formula("O2").mass)
+
+
+def test_get_yields_from_moles():
+    yields = get_yields("2H2 + O2 -> 2H2O", moles={"H2": 3, "O2": 1})
+    assert yields["limiting"] == "O2"
+    assert yields["products"]["H2O"]["moles"] == pytest.approx(2)
+    assert yields["excess"]["H2"]["moles"] == pytest.approx(1)
+
+
+def test_unlisted_reactants_are_in_excess():
+    yields = get_yields("H2 + O2 -> H2O", moles={"H2": 4})
+    assert yields["limiting"] == "H2"
+    assert yields["products"]["H2O"]["moles"] == pytest.approx(4)
+    assert "O2" not in yields["excess"]
+
+
+def test_electrons_have_no_mass():
+    yields = get_yields("Fe3+ + e- -> Fe2+", moles={"Fe3+": 2, "e-": 1})
+    assert yields["limiting"] == "e-"
+    assert yields["products"]["Fe2+"]["moles"] == pytest.approx(1)
+    assert yields["excess"]["e-"] == {"moles": 0, "mass": None}
+
+
+def test_limiting_reagent():
+    assert limiting_reagent("C3H8 + O2 -> CO2 + H2O", moles={"C3H8": 1, "O2": 4}) == "O2"
+    assert limiting_reagent("C3H8 + O2 -> CO2 + H2O", masses={"C3H8": 10, "O2": 100}) == "C3H8"
+
+
+@pytest.mark.parametrize(
+    "masses, moles",
+    [
+        (None, None),
+        ({"H2": 1}, {"H2": 1}),
+        ({}, None),
+        ({"H2O": 1}, None),
+        (None, {"H2": -1}),
+    ],
+)
+def test_invalid_amounts(masses, moles):
+    with pytest.raises(ValueError):
+        get_yields("H2 + O2 -> H2O", masses=masses, moles=moles)
@@ -0,0 +1,212 @@
+import random
+
+import pytest
+
+from chemic.main import ELEMENTS_BY_SYMBOL
+from chemic.utils import (
+    CAS_FORMAT_ERROR,
+    cas_number_error,
+    is_cas_number,
+    parse_charge,
+    parse_formula,
+    validate_cas_number,
+)
+
+SYMBOLS = list(ELEMENTS_BY_SYMBOL)
+BRACKETS = ["()", "[]", "{}"]
+SEPARATORS = ["·", "•", "⋅", "*", ".", " · "]
+
+
+@pytest.mark.parametrize(
+    "formula, expected",
+    [
+        ("H2O", {"H": 2, "O": 1}),
+        ("C60", {"C": 60}),
+        ("CH3CH2OH", {"C": 2, "H": 6, "O": 1}),
+        ("Ca3(PO4)2", {"Ca": 3, "P": 2, "O": 8}),
+        ("(CH3)3COH", {"C": 4, "H": 10, "O": 1}),
+        ("K4[Fe(CN)6]", {"K": 4, "Fe": 1, "C": 6, "N": 6}),
+        ("[Co(NH3)6]Cl3", {"Co": 1, "N": 6, "H": 18, "Cl": 3}),
+        ("{[(H)2]3}4", {"H": 24}),
+        ("Al2(SO4)3", {"Al": 2, "S": 3, "O": 12}),
+        ("h2o", {"H": 2, "O": 1}),
+    ],
+)
+def test_parse_formula(formula, expected):
+    assert parse_formula(formula) == expected
+
+
+def test_parse_formula_keeps_order_of_first_appearance():
+    assert list(parse_formula("OH(CH2)2C")) == ["O", "H", "C"]
+
+
+@pytest.mark.parametrize(
+    "formula, expected",
+    [
+        ("CuSO4·5H2O", {"Cu": 1, "S": 1, "O": 9, "H": 10}),
+        ("CuSO4.5H2O", {"Cu": 1, "S": 1, "O": 9, "H": 10}),
+        ("Na2CO3*10H2O", {"Na": 2, "C": 1, "O": 13, "H": 20}),
+        ("CaSO4 · 0.5H2O", {"Ca": 1, "S": 1, "O": 4.5, "H": 1.0}),
+        ("5H2O", {"H": 10, "O": 5}),
+        ("[Cu(H2O)4]SO4·H2O", {"Cu": 1, "H": 10, "O": 9, "S": 1}),
+    ],
+)
+def test_parse_formula_hydrates(formula, expected):
+    assert parse_formula(formula) == expected
+
+
+@pytest.mark.parametrize(
+    "formula, expected",
+    [
+        ("SO4 2-", ("SO4", -2)),
+        ("SO4^2-", ("SO4", -2)),
+        ("AlF4-", ("AlF4", -1)),
+        ("Fe+3", ("Fe", 3)),
+        ("NH4+", ("NH4", 1)),
+        ("O--", ("O", -2)),
+        ("PO4 3−", ("PO4", -3)),
+        ("H2O", ("H2O", 0)),
+        ("H2O+-", ("H2O+-", 0)),
+    ],
+)
+def test_parse_charge(formula, expected):
+    assert parse_charge(formula) == expected
+
+
+def test_parse_formula_charge():
+    assert parse_formula("SO4 2-", charge=True) == ({"S": 1, "O": 4}, -2)
+    assert parse_formula("[Fe(CN)6]^3-", charge=True) == ({"Fe": 1, "C": 6, "N": 6}, -3)
+    assert parse_formula("H2O", charge=True) == ({"H": 2, "O": 1}, 0)
+    assert parse_formula("SO4 2-") == {"S": 1, "O": 4}
+
+
+def test_parse_formula_count_before_charge():
+    # A count written directly before the sign is a count, not a charge.
+    assert parse_formula("Fe3+", charge=True) == ({"Fe": 3}, 1)
+    assert parse_formula("O2−", charge=True) == ({"O": 2}, -1)
+
+
+@pytest.mark.parametrize(
+    "formula, expected",
+    [
+        ("Fe3+", ("Fe", 3)),
+        ("O2−", ("O", -2)),
+        ("[Fe(CN)6]4-", ("[Fe(CN)6]", -4)),
+        ("MnO4-", ("MnO4", -1)),
+        ("NH4+", ("NH4", 1)),
+        ("Fe 3+", ("Fe", 3)),
+        ("Fe+3", ("Fe", 3)),
+        ("Fe", ("Fe", 0)),
+    ],
+)
+def test_parse_charge_strict_ion(formula, expected):
+    assert parse_charge(formula, strict_ion=True) == expected
+    elements, charge = parse_formula(formula, charge=True, strict_ion=True)
+    assert (elements, charge) == (parse_formula(expected[0]), expected[1])
+
+
+@pytest.mark.parametrize(
+    "formula",
+    [
+        "",
+        "   ",
+        "2",
+        "()",
+        ")",
+        "(H2O",
+        "H2O)",
+        "(H2]",
+        "H2O$",
+        "H2 O",
+        "H2·(O",
+        "Ca(OH·)2",
+        "H2O+-",
+        None,
+        5,
+        ["H2O"],
+    ],
+)
+def test_parse_formula_invalid(formula):
+    assert parse_formula(formula) is None
+    assert parse_formula(formula, charge=True) is None
+
+
+def _random_group(rng, depth):
+    """Write a random group of elements and nested groups with its element counts."""
+    text = []
+    counts = {}
+    for _ in range(rng.randint(1, 4)):
+        if depth and rng.random() < 0.3:
+            inner, inner_counts = _random_group(rng, depth - 1)
+            opening, closing = rng.choice(BRACKETS)
+            multiplier = rng.choice([1, rng.randint(2, 9), rng.randint(10, 120)])
+            text.append(f"{opening}{inner}{closing}{multiplier if multiplier > 1 else ''}")
+        else:
+            inner_counts = {rng.choice(SYMBOLS): 1}
+            multiplier = rng.choice([1, 1, rng.randint(2, 9), rng.randint(10, 999)])
+            symbol = next(iter(inner_counts))
+            text.append(f"{symbol}{multiplier if multiplier > 1 else ''}")
+        for symbol, count in inner_counts.items():
+            counts[symbol] = counts.get(symbol, 0) + count * multiplier
+    return "".join(text), counts
+
+
+def _random_formula(rng):
+    """Write a random formula, maybe a hydrate and charged, with its counts and charge."""
+    formula, counts = _random_group(rng, depth=3)
+    if rng.random() < 0.3:
+        hydrate, hydrate_counts = _random_group(rng, depth=1)
+        coefficient = rng.choice([1, rng.randint(2, 12)])
+        formula += f"{rng.choice(SEPARATORS)}{coefficient if coefficient > 1 else ''}{hydrate}"
+        for symbol, count in hydrate_counts.items():
+            counts[symbol] = counts.get(symbol, 0) + count * coefficient
+    charge = 0
+    if rng.random() < 0.3:
+        charge = rng.choice([-3, -2, -1, 1, 2, 3])
+        sign = "+" if charge > 0 else "-"
+        formula += rng.choice(
+            [f" {abs(charge)}{sign}", f"^{abs(charge)}{sign}", f"{sign}{abs(charge)}", sign * abs(charge)]
+        )
+    return formula, counts, charge
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_parse_formula_random(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        formula, counts, charge = _random_formula(rng)
+        assert parse_formula(formula, charge=True) == (counts, charge), formula
+
+
+@pytest.mark.parametrize("cas_number", ["7732-18-5", "50-00-0", "64-17-5", "7440-44-0", "1333-74-0", "9003-07-0"])
+def test_valid_cas_numbers(cas_number):
+    assert cas_number_error(cas_number) is None
+    assert is_cas_number(cas_number)
+
+
+@pytest.mark.parametrize(
+    "cas_number, reason",
+    [
+        ("7732-18-4", "Check sum does not match check digit [5 != 4]"),
+        ("7732185", CAS_FORMAT_ERROR),
+        ("7732-1-85", CAS_FORMAT_ERROR),
+        ("1-00-0", CAS_FORMAT_ERROR),
+        ("77a2-18-5", CAS_FORMAT_ERROR),
+        ("7732-18-x", CAS_FORMAT_ERROR),
+        ("12345678-18-5", "CAS number is too long"),
+        ("", CAS_FORMAT_ERROR),
+        (7732185, "CAS number is not a string"),
+        (None, "CAS number is not a string"),
+    ],
+)
+def test_invalid_cas_numbers(cas_number, reason):
+    assert cas_number_error(cas_number) == reason
+    assert not is_cas_number(cas_number)
+
+
+def test_validate_cas_number_prints_only_when_verbose(capsys):
+    assert validate_cas_number("7732-18-5", verbose=False)
+    assert not validate_cas_number("7732-18-4", verbose=False)
+    assert capsys.readouterr().out == ""
+    validate_cas_number("7732-18-4")
+    assert "Check sum" in capsys.readouterr().out
@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from chemic import main, vectorized
+from chemic.main import Element, Formula
+from chemic.utils import cas_number_error
+
+
+def test_molar_masses():
+    masses = vectorized.molar_masses(["H2O", "NaCl", "H2O", "Ca3(PO4)2"])
+    expected = [Formula(formula).mass for formula in ["H2O", "NaCl", "H2O", "Ca3(PO4)2"]]
+    np.testing.assert_allclose(masses, expected)
+
+
+def test_molar_masses_of_formula_and_element_objects():
+    formulas = [Formula("H2O"), Formula("OH2"), "H2O", Element("O"), Formula("CO2")]
+    np.testing.assert_allclose(
+        vectorized.molar_masses(formulas), [18.015, 18.015, 18.015, 15.999, 44.009]
+    )
+
+
+def test_molar_masses_of_a_mutated_formula():
+    formula = Formula("H2O")
+    first = vectorized.molar_masses([formula])
+    formula += "O"
+    np.testing.assert_allclose(np.concatenate([first, vectorized.molar_masses([formula])]), [18.015, 34.014])
+
+
+def test_invalid_formulas_give_nan():
+    masses = vectorized.molar_masses(["H2O", "Xx2", "H2O)", "", None, 5])
+    assert masses[0] == pytest.approx(18.015)
+    assert np.isnan(masses[1:]).all()
+
+
+def test_single_formula_and_series():
+    assert vectorized.molar_masses("H2O").shape == (1,)
+    series = pd.Series(["H2O", "CO2"])
+    np.testing.assert_allclose(vectorized.molar_masses(series), [18.015, 44.009])
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "mass_to_moles",
+        "moles_to_mass",
+        "mass_to_atoms",
+        "atoms_to_mass",
+        "mass_to_particles",
+        "particles_to_mass",
+        "moles_to_atoms",
+        "atoms_to_moles",
+    ],
+)
+def test_conversions_match_the_scalar_helpers(name):
+    formulas = ["H2O", "CO2", "C6H12O6", "H2O"]
+    amounts = [1.5, 2.0, 0.25, 10.0]
+    expected = [getattr(main, name)(formula, amount) for formula, amount in zip(formulas, amounts)]
+    np.testing.assert_allclose(getattr(vectorized, name)(formulas, amounts), expected)
+    # One formula broadcasts against many amounts.
+    np.testing.assert_allclose(
+        getattr(vectorized, name)("H2O", amounts),
+        [getattr(main, name)("H2O", amount) for amount in amounts],
+    )
+
+
+def test_atomic_masses():
+    assert math.isnan(vectorized.ATOMIC_MASSES[0])
+    assert vectorized.ATOMIC_MASSES[8] == Element("O").mass
+
+
+def test_validate_cas_numbers_matches_the_scalar_check():
+    cas_numbers = [
+        "7732-18-5",
+        "7732-18-4",
+        "7732185",
+        "12345678-18-5",
+        "1-00-0",
+        "77a2-18-5",
+        "9003-07-0",
+        "",
+        None,
+        7732185,
+    ]
+    valid, reasons = vectorized.validate_cas_numbers(cas_numbers)
+    for cas_number, is_valid, reason in zip(cas_numbers, valid, reasons):
+        expected = cas_number_error(cas_number)
+        assert is_valid == (expected is None), cas_number
+        assert (reason is None) == (expected is None) and (reason is None or expected.startswith(reason)), cas_number
+
+
+def test_validate_cas_numbers_of_a_series():
+    valid, _ = vectorized.validate_cas_numbers(pd.Series(["7732-18-5", "50-00-0", "50-00-1"]))
+    assert valid.tolist() == [True, True, False]
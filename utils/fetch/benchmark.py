@@ -0,0 +1,95 @@
+"""
+Benchmark the fetcher against the fake WebBook, offline.
+
+Fetches a sample of species one at a time and then concurrently, with a fixed
+latency per response standing in for the network, checks every record against
+species.txt, and times resuming a finished run.
+
+    python benchmark.py [--species 200] [--latency 0.05] [--failure-rate 0.05]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from os.path import join
+
+import fetch
+from fake_webbook import STATS, fake_webbook, load_species
+
+
+async def timed_run(root, species_path, directory, concurrency):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        counts = await fetch.run(
+            species_path,
+            join(directory, "images"),
+            join(directory, "checkpoint.sqlite"),
+            root,
+            concurrency=concurrency,
+            rate=10_000,
+            failed_path=None,
+        )
+    return time.perf_counter() - start, counts
+
+
+def check(directory, expected):
+    checkpoint = fetch.Checkpoint(join(directory, "checkpoint.sqlite"))
+    path = join(directory, "records.jsonl")
+    checkpoint.export(path)
+    checkpoint.close()
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == len(expected), (len(records), len(expected))
+    for record in records:
+        name, formula = expected[record["cas_number"]]
+        assert (record["name"], record["formula"]) == (name, formula), record
+    # Images are named by CAS number, so isomers do not overwrite each other.
+    images = set(os.listdir(join(directory, "images")))
+    assert images == {f"{record['cas_number']}.png" for record in records if record["structure"]}
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--species", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    species = dict(list(load_species().items())[: args.species])
+    async with fake_webbook(
+        species=species, latency=args.latency, failure_rate=args.failure_rate
+    ) as (root, app):
+        with tempfile.TemporaryDirectory() as directory:
+            species_path = join(directory, "species.txt")
+            with open(species_path, "w") as f:
+                for cas, (name, formula) in species.items():
+                    f.write(f"{name}\t{formula}\t{cas}\n")
+
+            results = {}
+            for label, concurrency in (("sequential", 1), ("concurrent", 32)):
+                run_directory = join(directory, label)
+                app[STATS]["requests"] = 0
+                seconds, counts = await timed_run(root, species_path, run_directory, concurrency)
+                check(run_directory, species)
+                results[label] = seconds
+                print(
+                    f"{label:>10}: {seconds:7.2f} s, {counts['success']} species, "
+                    f"{app[STATS]['requests']} requests ({len(species) / seconds:.1f} species/s)"
+                )
+            print(f"   speedup: {results['sequential'] / results['concurrent']:.1f}x")
+
+            app[STATS]["requests"] = 0
+            seconds, counts = await timed_run(root, species_path, join(directory, "concurrent"), 32)
+            print(
+                f"    resume: {seconds * 1000:7.1f} ms, {counts['skipped']} skipped, "
+                f"{app[STATS]['requests']} requests"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""
+Check the WebBook page extractor against the saved pages in corpus/ and time
+it against the regular expressions the fetcher used before, on pages rendered
+for every species in species.txt by the fake WebBook.
+
+    python benchmark_extract.py [--pages 20000]
+"""
+
+import argparse
+import json
+import re
+import time
+from os.path import dirname, join
+
+from extract import extract
+from fake_webbook import SAMPLE_PAGE, load_species, render_page
+
+try:
+    import minify_html
+except ImportError:
+    minify_html = None
+
+CORPUS = join(dirname(__file__), "corpus")
+
+# The extractor the fetcher used before, kept as a baseline.
+regex_data = {
+    "name": "<h1 id=Top>(.*)</h1>",
+    "formula": '<li><strong><a title="IUPAC definition of empirical formula"href=http://goldbook.iupac.org/E02063.html>Formula</a>:</strong>(.*)<li><strong><a title="IUPAC definition of relative molecular mass',
+    "molar_mass": '<li><strong><a title="IUPAC definition of relative molecular mass \\(molecular weight\\)"href=http://goldbook.iupac.org/R05271.html>Molecular weight</a>:</strong>(.*)<li><div',
+    "inchi": "<div class=left-float><strong>IUPAC Standard InChI:</strong><span clss=inchi-text>InChI=([^<]*)</span>",
+    "inchi_key": "<strong>IUPAC Standard InChIKey:</strong> <span class=inchi-text>([^<]*)</span>",
+    "cas_number": "<strong>CAS Registry Number:</strong>\\s([^<]+)",
+    "structure": "<strong>Chemical structure:</strong> <img alt=(.*) class=struct src=([^<>]*)",
+    "other_names": "<strong>Other names:</strong>\\s([^<]+)",
+}
+
+
+def legacy_extract(text):
+    if minify_html is not None:
+        text = minify_html.minify(text)
+    data = {key: re.findall(pattern, text) for key, pattern in regex_data.items()}
+    first = lambda key: data[key][0].strip() if data[key] else None
+    return {
+        "name": first("name"),
+        "formula": data["structure"][0][0] if data["structure"] else None,
+        "inchi_key": first("inchi_key"),
+        "cas_number": first("cas_number"),
+        "structure": data["structure"][0][1] if data["structure"] else None,
+        "other_names": data["other_names"][0].split("; ") if data["other_names"] else [],
+    }
+
+
+def check_corpus():
+    with open(join(CORPUS, "expected.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    for filename, record in expected.items():
+        with open(join(CORPUS, filename), "rb") as f:
+            found = extract(f.read()).to_dict()
+        assert found == record, (filename, found, record)
+    print(f"corpus: {len(expected)} pages match")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=20000)
+    args = parser.parse_args()
+    check_corpus()
+
+    with open(SAMPLE_PAGE, encoding="utf-8") as f:
+        template = f.read()
+    species = list(load_species().items())[: args.pages]
+    pages = [render_page(template, name, formula, cas) for cas, (name, formula) in species]
+    encoded = [page.encode("utf-8") for page in pages]
+
+    start = time.perf_counter()
+    legacy = [legacy_extract(page) for page in pages]
+    legacy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    records = [extract(page) for page in encoded]
+    new_time = time.perf_counter() - start
+
+    for (cas, (name, formula)), old, new in zip(species, legacy, records):
+        assert (new.cas_number, new.name, new.formula) == (cas, name, formula), new
+        assert new.other_names[0] == name, new
+        # The previous extractor cut the other names off at the first tag, so
+        # a name marked up with <sup> or <sub> lost everything after it.
+        keys = [key for key in old if key != "other_names" or "<" not in name]
+        assert all(old[key] == getattr(new, key) for key in keys), (old, new)
+    print(f"agreement: {len(pages)} rendered pages match the previous extractor")
+    print(f"previous: {legacy_time:.2f} s ({len(pages) / legacy_time:,.0f} pages/s)")
+    print(f"     new: {new_time:.2f} s ({len(pages) / new_time:,.0f} pages/s)")
+    print(f" speedup: {legacy_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import html
+import re
+from dataclasses import asdict, dataclass, field
+
+# The name is the title, and every other field follows a "<strong>Label:</strong>"
+# (or "<strong><a ...>Label</a>:</strong>") further down. The page is read
+# forward once: up to the title, then from label to label, each label found
+# being dispatched to its reader.
+_TITLE = re.compile(rb"""<h1[^>]*?\bid=["']?Top\b[^>]*>""")
+_LABEL = re.compile(rb":\s*</strong>")
+_ATTRIBUTE = re.compile(rb"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_TAG = re.compile(rb"<[^>]*>")
+_SPACE = re.compile(r"\s+")
+
+
+@dataclass
+class Species:
+    """
+    The data scraped from the WebBook page of a species.
+
+    `formula` is the formula of the structure image when there is one,
+    otherwise the formula as written on the page. `name` and `other_names` are
+    kept as written, markup and entities included (like the names in
+    species.txt), since stripping them would run superscripts into the text
+    around them: "[4.2.2.2<sup>2,5</sup>]" would read "[4.2.2.22,5]".
+    """
+
+    name: str = None
+    formula: str = None
+    molar_mass: float = None
+    inchi: str = None
+    inchi_key: str = None
+    cas_number: str = None
+    structure: str = None
+    other_names: list = field(default_factory=list)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _text(value):
+    return _SPACE.sub(" ", html.unescape(value.decode("utf-8", errors="replace"))).strip()
+
+
+def _markup(value):
+    return _SPACE.sub(" ", value.decode("utf-8", errors="replace")).strip()
+
+
+def _until_tag(page, start):
+    stop = page.find(b"<", start)
+    return page[start : len(page) if stop == -1 else stop]
+
+
+def _read_formula(page, start, species):
+    stop = page.find(b"<li", start)
+    formula = _TAG.sub(b"", page[start : len(page) if stop == -1 else stop])
+    species.formula = _text(formula).replace(" ", "") or None
+
+
+def _read_molar_mass(page, start, species):
+    try:
+        species.molar_mass = float(_text(_until_tag(page, start)))
+    except ValueError:
+        pass
+
+
+def _read_span(page, start):
+    """
+    Read the text of the `<span>` right after a label.
+    """
+    open_tag = page.find(b"<span", start)
+    if open_tag == -1:
+        return None
+    return _text(_until_tag(page, page.find(b">", open_tag) + 1))
+
+
+def _read_inchi(page, start, species):
+    inchi = _read_span(page, start)
+    if inchi is not None:
+        species.inchi = inchi.removeprefix("InChI=")
+
+
+def _read_inchi_key(page, start, species):
+    species.inchi_key = _read_span(page, start)
+
+
+def _read_cas_number(page, start, species):
+    species.cas_number = _text(_until_tag(page, start)) or None
+
+
+def _read_structure(page, start, species):
+    open_tag = page.find(b"<img", start)
+    if open_tag == -1:
+        return
+    attributes = {
+        match[1].lower(): match[2] or match[3] or match[4]
+        for match in _ATTRIBUTE.finditer(page, open_tag + 4, page.find(b">", open_tag))
+    }
+    if b"src" in attributes:
+        species.structure = _text(attributes[b"src"])
+        if b"alt" in attributes:
+            # The formula of the structure wins over the one written out.
+            species.formula = _text(attributes[b"alt"]) or species.formula
+
+
+def _until_item(page, start):
+    """
+    Get the rest of a list item, up to the next item or the end of the list.
+    """
+    stops = [page.find(tag, start) for tag in (b"<li", b"</li", b"</ul")]
+    stop = min((stop for stop in stops if stop != -1), default=len(page))
+    return page[start:stop]
+
+
+def _read_other_names(page, start, species):
+    # Names are separated by "; ", but may contain ";" themselves.
+    names = _markup(_until_item(page, start))
+    species.other_names = [name.strip() for name in names.split("; ") if name.strip()]
+
+
+_READERS = {
+    b"Formula": _read_formula,
+    b"Molecular weight": _read_molar_mass,
+    b"IUPAC Standard InChI": _read_inchi,
+    b"IUPAC Standard InChIKey": _read_inchi_key,
+    b"CAS Registry Number": _read_cas_number,
+    b"Chemical structure": _read_structure,
+    b"Other names": _read_other_names,
+}
+
+
+def extract(page):
+    """
+    Scrape a WebBook species page in one pass, minified or not.
+
+    Args:
+        page (bytes, str): The page.
+
+    Returns:
+        Species: The data found. Fields missing from the page are None (or an empty list of other names).
+    """
+    if isinstance(page, str):
+        page = page.encode("utf-8")
+    species = Species()
+    start = 0
+    title = _TITLE.search(page)
+    if title is not None:
+        start = title.end()
+        species.name = _markup(page[start : page.find(b"</h1>", start)]) or None
+    pending = set(_READERS)
+    for match in _LABEL.finditer(page, start):
+        label_end = match.start()
+        if page.endswith(b"</a>", 0, label_end):
+            label_end -= 4
+        label = b" ".join(page[page.rfind(b">", 0, label_end) + 1 : label_end].split())
+        if label in pending:
+            pending.discard(label)
+            _READERS[label](page, match.end(), species)
+            # Everything of interest is at the top of the page; skip the rest.
+            if not pending:
+                break
+    return species
@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+import base64
+import csv
+import random
+import re
+from contextlib import asynccontextmanager
+from os.path import dirname, join
+
+from aiohttp import web
+
+SAMPLE_PAGE = join(dirname(__file__), "..", "lib", "data", "sample_response_text.html")
+SPECIES_FILE = join(dirname(__file__), "species.txt")
+
+# A 1x1 transparent PNG, served for every structure image.
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+# The values in the sample page that are replaced for each species.
+SAMPLE_NAME = "Benzene, 1-chloro-4-nitro-"
+SAMPLE_CAS = "100-00-5"
+SAMPLE_ID = "C100005"
+SAMPLE_FORMULA = "C6H4ClNO2"
+SAMPLE_FORMULA_HTML = "C<sub>6</sub>H<sub>4</sub>ClNO<sub>2</sub>"
+SAMPLE_OTHER_NAMES = re.compile(r"(<strong>Other names:</strong> )[^<]*")
+
+NOT_FOUND_PAGE = "<html><body><h1>Registry Number Not Found</h1></body></html>"
+
+# The application's request counters, e.g. `app[STATS]["requests"]`.
+STATS = web.AppKey("stats", dict)
+
+
+def load_species(path=SPECIES_FILE):
+    """
+    Read the species the fake server knows about, keyed by CAS number.
+    """
+    species = {}
+    with open(path, "r") as f:
+        for row in csv.reader(f, delimiter="\t"):
+            if len(row) == 3 and row[0] and row[1] and row[2] != "N/A":
+                species[row[2]] = (row[0], row[1])
+    return species
+
+
+def render_page(template, name, formula, cas):
+    """
+    Fill the sample WebBook page in with another species.
+    """
+    page = template.replace(SAMPLE_NAME, name)
+    page = page.replace(SAMPLE_CAS, cas)
+    page = page.replace(SAMPLE_ID, "C" + cas.replace("-", ""))
+    page = page.replace(SAMPLE_FORMULA_HTML, re.sub(r"(\d+)", r"<sub>\1</sub>", formula))
+    page = page.replace(SAMPLE_FORMULA, formula)
+    return SAMPLE_OTHER_NAMES.sub(rf"\g<1>{name}; {formula}", page)
+
+
+def create_app(species=None, latency=0.0, failure_rate=0.0, seed=0):
+    """
+    Create a stand-in for the NIST WebBook species pages and structure images.
+
+    Args:
+        species (dict, optional): (name, formula) keyed by CAS number. Defaults to `species.txt`.
+        latency (float, optional): Seconds to wait before every response.
+        failure_rate (float, optional): The fraction of requests answered with a 503, to exercise retries.
+        seed (int, optional): Seed for choosing which requests fail.
+
+    Returns:
+        aiohttp.web.Application: The application. `app[STATS]["requests"]` counts the requests served.
+    """
+    species = load_species() if species is None else species
+    with open(SAMPLE_PAGE, "r", encoding="utf-8") as f:
+        template = f.read()
+    failures = random.Random(seed)
+
+    async def cbook(request):
+        request.app[STATS]["requests"] += 1
+        if latency:
+            await asyncio.sleep(latency)
+        if failure_rate and failures.random() < failure_rate:
+            raise web.HTTPServiceUnavailable()
+        if "Struct" in request.query:
+            return web.Response(body=PNG, content_type="image/png")
+        cas = request.query.get("ID", "")
+        if cas not in species:
+            return web.Response(text=NOT_FOUND_PAGE, content_type="text/html")
+        name, formula = species[cas]
+        return web.Response(
+            text=render_page(template, name, formula, cas), content_type="text/html"
+        )
+
+    app = web.Application()
+    app[STATS] = {"requests": 0}
+    app.router.add_get("/cgi/cbook.cgi", cbook)
+    return app
+
+
+@asynccontextmanager
+async def fake_webbook(port=0, **options):
+    """
+    Serve a fake WebBook on localhost for the duration of a `with` block.
+
+    Args:
+        port (int, optional): The port, or 0 for any free port.
+        **options: Passed to `create_app`.
+
+    Yields:
+        tuple: The root URL (to pass as the fetcher's root) and the application.
+    """
+    app = create_app(**options)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}", app
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a fake NIST WebBook locally.")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of 503s")
+    args = parser.parse_args()
+    web.run_app(
+        create_app(latency=args.latency, failure_rate=args.failure_rate),
+        host="127.0.0.1",
+        port=args.port,
+    )
@@ -1,152 +1,291 @@
-import requests
-import re
-import minify_html
+import argparse
+import asyncio
 import csv
+import json
+import os
+import random
+import sqlite3
+import time
+from os.path import dirname, exists, isfile, join
 
+import aiohttp
 from commoner import Shout
-from ratelimit import limits, RateLimitException, sleep_and_retry
-from os import listdir
-from os.path import isfile, join
 
-ONE_MINUTE = 60
+from extract import extract
+
 MAX_CALLS_PER_MINUTE = 300
+CONCURRENCY = 16
+RETRIES = 4
+BACKOFF = 0.5
+TIMEOUT = 30
+
+# Responses worth retrying; anything else is a real answer.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 WEBHOOK_ROOT = "https://webbook.nist.gov"
 WEBHOOK_QUERY = "/cgi/cbook.cgi?ID={}&Units=SI"
 WEBHOOK_URL = WEBHOOK_ROOT + WEBHOOK_QUERY
 
-SUCCESS = 0
-SKIP = 0
-FAIL = 0
-
-TOTAL_IMAGES_TO_FETCH = 0
-with open("species.txt", "r") as f:
-    SPECIES = f.read().splitlines()
-    for entry in SPECIES:
-        if entry[2] != "N/A":
-            TOTAL_IMAGES_TO_FETCH += 1
-
-regex_data = {
-    "name": "<h1 id=Top>(.*)</h1>",
-    "formula": '<li><strong><a title="IUPAC definition of empirical formula"href=http://goldbook.iupac.org/E02063.html>Formula</a>:</strong>(.*)<li><strong><a title="IUPAC definition of relative molecular mass',
-    "molar_mass": '<li><strong><a title="IUPAC definition of relative molecular mass \(molecular weight\)"href=http://goldbook.iupac.org/R05271.html>Molecular weight</a>:</strong>(.*)<li><div',
-    "inchi": "<div class=left-float><strong>IUPAC Standard InChI:</strong><span clss=inchi-text>InChI=([^<]*)</span>",
-    "inchi_key": "<strong>IUPAC Standard InChIKey:</strong> <span class=inchi-text>([^<]*)</span>",
-    "cas_number": "<strong>CAS Registry Number:</strong>\s([^<]+)",
-    "structure": "<strong>Chemical structure:</strong> <img alt=(.*) class=struct src=([^<>]*)",
-    "other_names": "<strong>Other names:</strong>\s([^<]+)",
-}
-
-
-def fetch_text(url):
-    response = requests.get(url)
-    return response.text
-
-
-def extract_data(text):
-    text = minify_html.minify(text)
-    data = {}
-    for key in regex_data:
-        data[key] = re.findall(regex_data[key], text)
-    return data
-
-
-def filter_data(data):
-    for key in data:
-        if type(data[key]) == str:
-            data[key] = data[key].strip()
-        elif type(data[key]) == list and len(data[key]) == 1:
-            if type(data[key][0]) == str:
-                data[key] = data[key][0].strip()
-        if key == "formula":
-            if data["structure"] != []:
-                data[key] = data["structure"][0][0]
-        elif key == "other_names":
-            if type(data[key]) == str:
-                data[key] = data[key].split("; ")
-            elif type(data[key]) == list:
-                if len(data[key]) != 0:
-                    data[key] = data[key][0].split("; ")
-            else:
-                Shout.error(
-                    f"Unknown type for other_names: {type(data[key])}, {data[key]}"
+HERE = dirname(__file__)
+
+
+class TokenBucket:
+    """
+    An asyncio rate limiter allowing `rate` requests per second on average,
+    with bursts of up to `capacity` requests.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
                 )
-        elif data[key] == "structure":
-            data[key] = data[key][0][1]
-    return data
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
 
 
-def download_image(url, filename="image.png"):
-    try:
-        data = requests.get(url)
-    except requests.exceptions.ConnectionError:
-        Shout.error(f"Connection error for {url}")
-        return None
-    with open(filename, "wb") as f:
-        f.write(data.content)
-    return None
+class Checkpoint:
+    """
+    The outcome of every CAS number fetched so far, in a SQLite database, so an
+    interrupted run picks up where it stopped.
 
+    Each CAS number is stored once with a status of "success" (with the scraped
+    record as JSON) or "failed" (the page had no structure or formula). CAS
+    numbers that could not be fetched at all are not stored, so they are tried
+    again on the next run.
+    """
 
-@sleep_and_retry
-@limits(calls=MAX_CALLS_PER_MINUTE, period=ONE_MINUTE)
-def get(cas_number, ROOT_PATH=""):
-    global SUCCESS, SKIP, FAIL
-    data = filter_data(extract_data(fetch_text(WEBHOOK_URL.format(cas_number))))
-    if data["structure"] == [] or data["formula"] == []:
-        Shout.warning(
-            f"Failed to download image for {data['name']} ({cas_number}), moving on (formula not found)"
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS species (cas TEXT PRIMARY KEY, status TEXT NOT NULL, record TEXT)"
         )
-        with open("failed.txt", "a") as f:
-            f.write(cas_number + "\n")
-        FAIL += 1
-        return data
-    try:
-        IMG_URL = data["structure"][0][1]
-        IMG_NAME = f"{data['formula']}.png"
-        download_image(WEBHOOK_ROOT + IMG_URL, join(ROOT_PATH, IMG_NAME))
-        Shout.success(
-            f"Downloaded image for {data['name']}/{cas_number} to {join(ROOT_PATH, IMG_NAME)}"
+        self._pending = 0
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM species").fetchone()[0]
+
+    def done(self):
+        return {cas for (cas,) in self.connection.execute("SELECT cas FROM species")}
+
+    def record(self, cas, status, data=None):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO species VALUES (?, ?, ?)",
+            (cas, status, None if data is None else json.dumps(data)),
         )
-    except FileNotFoundError:
+        # Committing in batches keeps the writes cheap; at most one batch is
+        # fetched again after a crash.
+        self._pending += 1
+        if self._pending >= 100:
+            self.commit()
+
+    def commit(self):
+        self.connection.commit()
+        self._pending = 0
+
+    def import_failed(self, path):
+        """
+        Mark the CAS numbers in a `failed.txt` from the old fetcher as failed.
+        """
+        with open(path, "r") as f:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO species VALUES (?, 'failed', NULL)",
+                ((line.strip(),) for line in f if line.strip()),
+            )
+        self.commit()
+
+    def export(self, path):
+        """
+        Write the scraped records to a JSON Lines file, returning how many were written.
+        """
+        count = 0
+        with open(path, "w", encoding="utf-8") as f:
+            for (record,) in self.connection.execute(
+                "SELECT record FROM species WHERE status = 'success' ORDER BY cas"
+            ):
+                f.write(record + "\n")
+                count += 1
+        return count
+
+    def close(self):
+        self.commit()
+        self.connection.close()
+
+
+class RetryableStatus(Exception):
+    pass
+
+
+async def request(session, bucket, url, retries=RETRIES):
+    """
+    GET a URL through the rate limiter, retrying rate limiting, server errors
+    and connection errors with exponential backoff and jitter.
+
+    Returns:
+        bytes: The response body.
+    """
+    for attempt in range(retries + 1):
+        await bucket.acquire()
+        try:
+            async with session.get(url) as response:
+                if response.status in RETRY_STATUSES:
+                    raise RetryableStatus(f"{response.status} for {url}")
+                response.raise_for_status()
+                return await response.read()
+        except (RetryableStatus, aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+            await asyncio.sleep(BACKOFF * 2**attempt * (1 + random.random()))
+
+
+async def get(session, bucket, cas_number, root=WEBHOOK_ROOT, image_path="", retries=RETRIES):
+    """
+    Scrape the WebBook page of a CAS number and download its structure image.
+
+    Returns:
+        tuple: The status ("success" or "failed") and the scraped data.
+    """
+    page = await request(session, bucket, root + WEBHOOK_QUERY.format(cas_number), retries)
+    species = extract(page)
+    if species.structure is None or species.formula is None:
         Shout.warning(
-            f"Failed to download image for {data['name']} ({cas_number}), proceeding anyway (image not found)"
+            f"Failed to download image for {species.name} ({cas_number}), moving on (formula not found)"
         )
-        with open("failed.txt", "a") as f:
-            f.write(cas_number + "\n")
-        FAIL += 1
-    return data
+        return "failed", species.to_dict()
+    image = await request(session, bucket, root + species.structure, retries)
+    # Named by CAS number, so isomers sharing a formula keep their own images.
+    filename = join(image_path, f"{cas_number}.png")
+    with open(filename, "wb") as f:
+        f.write(image)
+    Shout.success(f"Downloaded image for {species.name}/{cas_number} to {filename}")
+    return "success", species.to_dict()
+
+
+def pending_species(species_path, image_path, done):
+    """
+    Get the CAS numbers still to fetch: those with neither an image nor a
+    checkpointed outcome.
+    """
+    images = {f for f in os.listdir(image_path) if isfile(join(image_path, f))}
+    pending, skipped = [], 0
+    with open(species_path, "r") as f:
+        for row in csv.reader(f, delimiter="\t"):
+            if len(row) != 3 or row[2] == "N/A":
+                continue
+            if f"{row[2]}.png" in images or row[2] in done:
+                skipped += 1
+            else:
+                pending.append(row[2])
+    return pending, skipped
+
+
+async def run(
+    species_path=join(HERE, "species.txt"),
+    image_path=join(HERE, "images"),
+    checkpoint_path=join(HERE, "checkpoint.sqlite"),
+    root=WEBHOOK_ROOT,
+    concurrency=CONCURRENCY,
+    rate=MAX_CALLS_PER_MINUTE / 60,
+    retries=RETRIES,
+    failed_path=join(HERE, "failed.txt"),
+):
+    """
+    Fetch every species that has not been fetched yet.
 
+    A new checkpoint starts out with the CAS numbers in `failed_path` (the list
+    of failures kept by the old fetcher) marked as failed, if it exists.
 
-def run():
-    global SUCCESS, SKIP, FAIL
-    IMAGE_PATH = "./images"
-    IMAGES_IN_FOLDER = [f for f in listdir(IMAGE_PATH) if isfile(join(IMAGE_PATH, f))]
-    FAILED_IMAGES = open("failed.txt", "r").read().splitlines()
+    Returns:
+        dict: How many species succeeded, failed, errored and were skipped.
+    """
+    os.makedirs(image_path, exist_ok=True)
+    fresh = not exists(checkpoint_path)
+    checkpoint = Checkpoint(checkpoint_path)
+    if fresh and failed_path and exists(failed_path):
+        checkpoint.import_failed(failed_path)
+    pending, skipped = pending_species(species_path, image_path, checkpoint.done())
+    counts = {"success": 0, "failed": 0, "error": 0, "skipped": skipped}
+    Shout.info(f"{len(pending)} species to fetch, skipping {skipped} already fetched")
+
+    queue = asyncio.Queue()
+    for cas_number in pending:
+        queue.put_nowait(cas_number)
+    bucket = TokenBucket(rate, capacity=concurrency)
+
+    async def worker(session):
+        while True:
+            try:
+                cas_number = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                status, data = await get(
+                    session, bucket, cas_number, root, image_path, retries
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError, RetryableStatus) as error:
+                Shout.error(f"Failed to fetch {cas_number}: {error}")
+                counts["error"] += 1
+                continue
+            checkpoint.record(cas_number, status, data)
+            counts[status] += 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+    finally:
+        checkpoint.close()
     Shout.info(
-        f"Found {len(IMAGES_IN_FOLDER)} images in folder ({len(IMAGES_IN_FOLDER) + len(FAILED_IMAGES)}/{TOTAL_IMAGES_TO_FETCH}, including {len(FAILED_IMAGES)} failed images)"
+        f"Downloaded {counts['success']} images, skipped {counts['skipped']} (already fetched), images missing for {counts['failed']}, errors for {counts['error']}"
     )
-    with open("species.txt", "r") as f:
-        data = csv.reader(f, delimiter="\t")
-        for row in data:
-            ROW_NAME = row[0]
-            ROW_FORMULA = row[1]
-            ROW_CAS = row[2]
-            if ROW_CAS != "N/A":
-                if (
-                    f"{ROW_FORMULA}.png" not in IMAGES_IN_FOLDER
-                    and ROW_CAS not in FAILED_IMAGES
-                ):
-                    try:
-                        get(ROW_CAS, ROOT_PATH=IMAGE_PATH)
-                        SUCCESS += 1
-                    except RateLimitException:
-                        Shout.warning("Rate limit exceeded")
-                else:
-                    SKIP += 1
-                    print(f"Skipping {ROW_FORMULA}, already downloaded")
-        Shout.info(
-            f"Downloaded {SUCCESS} images, skipped {SKIP-FAIL} images (already downloaded), images missing for {FAIL} images"
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fetch species data and structure images from the NIST Chemistry WebBook."
+    )
+    parser.add_argument("--species", default=join(HERE, "species.txt"))
+    parser.add_argument("--images", default=join(HERE, "images"))
+    parser.add_argument("--checkpoint", default=join(HERE, "checkpoint.sqlite"))
+    parser.add_argument("--root", default=WEBHOOK_ROOT, help="WebBook root URL")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument(
+        "--rate", type=float, default=MAX_CALLS_PER_MINUTE / 60, help="requests per second"
+    )
+    parser.add_argument("--retries", type=int, default=RETRIES)
+    parser.add_argument("--export", help="write the scraped records to a JSON Lines file")
+    args = parser.parse_args()
+    asyncio.run(
+        run(
+            args.species,
+            args.images,
+            args.checkpoint,
+            args.root,
+            args.concurrency,
+            args.rate,
+            args.retries,
         )
+    )
+    if args.export:
+        checkpoint = Checkpoint(args.checkpoint)
+        Shout.info(f"Exported {checkpoint.export(args.export)} records to {args.export}")
+        checkpoint.close()
 
 
-run()
+if __name__ == "__main__":
+    main()